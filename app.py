@@ -1,10 +1,15 @@
+import os
 import streamlit as st
 from datetime import datetime
 from src.helper import extract_text_from_pdf, ask_openai
-from src.job_api import fetch_rapidapi_jobs
-from src.pdf_generator import generate_analysis_pdf
+from src.job_api import iter_recommended_jobs, is_source_available
+from src.job_corpus import get_corpus
+from src.job_dedupe import JobDeduper
+from src.job_ranking import rank_jobs
+from src.report_cache import REPORT_PRERENDER, get_cached_report, get_report_pdf, prerender_report
 from src.improvement_suggestions import get_improvement_suggestions, get_formatted_issues_html, get_formatted_improvements_html
-from src.analytics_manager import save_analysis  
+from src.analytics_writer import save_analysis_async
+from src.analytics_shards import start_background_exporter
 
 
 
@@ -15,6 +20,9 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+# Publish this node's analytics shard for multi-node dashboards (no-op unless ANALYTICS_SHARD_INTERVAL is set)
+start_background_exporter()
+
 # Custom CSS matching the screenshot design
 st.markdown("""
 <style>
@@ -331,6 +339,28 @@ st.markdown("""
 #st.markdown('<div class="white-container">', unsafe_allow_html=True)
 #st.markdown('<span class="section-label">Upload Your Resume</span>', unsafe_allow_html=True)
 
+# Jobs collected and ranked against the resume before the top 10 are shown. Harvested and indexed
+# postings come first; each further 10 candidates can cost one more paid RapidAPI page.
+JOB_CANDIDATES = int(os.getenv("JOB_CANDIDATES", 10))
+
+
+def job_card_html(job, score=None, terms=None):
+    """Build the HTML card for a job, with its resume match when ranked."""
+    match = ""
+    if score is not None:
+        match = f'<div class="job-location">🎯 Match: {round(score * 100)}%'
+        match += f' · {", ".join(terms)}</div>' if terms else '</div>'
+    return f"""
+    <div class="job-card">
+        <div class="job-title">{job.title}</div>
+        <div class="job-company">{job.company}</div>
+        <div class="job-location">📍 {job.location}</div>
+        {match}
+        <a href="{job.apply_link}" target="_blank" class="linkedin-button">View Job →</a>
+    </div>
+    """
+
+
 uploaded_file = st.file_uploader("", type=["pdf"], label_visibility="collapsed")
 #st.markdown('</div>', unsafe_allow_html=True)
 
@@ -449,8 +479,8 @@ if uploaded_file:
     st.markdown('<hr class="custom-divider">', unsafe_allow_html=True)
     st.markdown('<h2 class="section-header">📥 Export Analysis</h2>', unsafe_allow_html=True)
     
-    # Generate PDF
-    pdf_buffer = generate_analysis_pdf(
+    # PDF is rendered on demand (or in the background) and cached by its inputs
+    report = dict(
         summary=summary,
         ats_score=ats_score,
         ats_analysis=ats_analysis,
@@ -460,15 +490,22 @@ if uploaded_file:
         jobs=st.session_state.get('jobs_list', []),
         improvements=st.session_state.get('improvements', None)
     )
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    st.download_button(
-        label="📥 Download Analysis as PDF",
-        data=pdf_buffer,
-        file_name=f"resume_analysis_{timestamp}.pdf",
-        mime="application/pdf",
-        use_container_width=True
-    )
+    if REPORT_PRERENDER:
+        prerender_report(**report)
+    pdf_bytes = get_cached_report(**report)
+    if pdf_bytes is None and st.button("📄 Prepare PDF Report", use_container_width=True):
+        with st.spinner("📄 Building PDF report..."):
+            pdf_bytes = get_report_pdf(**report)
+    
+    if pdf_bytes is not None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        st.download_button(
+            label="📥 Download Analysis as PDF",
+            data=pdf_bytes,
+            file_name=f"resume_analysis_{timestamp}.pdf",
+            mime="application/pdf",
+            use_container_width=True
+        )
     
     st.markdown('<hr class="custom-divider">', unsafe_allow_html=True)
     
@@ -487,10 +524,41 @@ if uploaded_file:
         
         # Fetch from BOTH sources
         # with st.spinner("🔍 Fetching jobs from LinkedIn and other websites..."):
+        st.markdown('<hr class="custom-divider">', unsafe_allow_html=True)
+        st.markdown('<h2 class="section-header">🌐 Jobs Recommendation </h2>', unsafe_allow_html=True)
+        
+        if not is_source_available("rapidapi"):
+            st.warning("⚠️ The job search service is currently degraded. Showing cached results only.")
+        
+        rapidapi_jobs = []
+        deduper = JobDeduper()
+        job_cards = st.empty()
         with st.spinner("🔍 Fetching jobs from Jobs websites..."):
             # In your app.py, when calling the functions:
             #linkedin_jobs = fetch_linkedin_jobs(search_keywords_clean, location="Saudi Arabia", rows=10)
-            rapidapi_jobs = fetch_rapidapi_jobs(search_keywords_clean, location="Saudi Arabia", rows=10)
+            # Render each job as soon as it arrives; harvested postings fitting the resume and the
+            # local index are used first and RapidAPI pages are only requested to fill the remaining slots
+            for job in iter_recommended_jobs(search_keywords_clean, location="Saudi Arabia", resume_text=resume_text):
+                if len(rapidapi_jobs) >= JOB_CANDIDATES:
+                    break
+                if not deduper.add(job):
+                    continue
+                rapidapi_jobs.append(job)
+                job_cards.markdown("".join(job_card_html(j) for j in rapidapi_jobs[:10]), unsafe_allow_html=True)
+            
+            # Re-order the candidates by fit with the resume and keep the top 10; term weights come
+            # from the harvested corpus when it is larger than the candidate list
+            corpus = get_corpus()
+            idf = corpus.idf if corpus is not None and len(corpus) > len(rapidapi_jobs) else None
+            ranked_jobs = rank_jobs(resume_text, rapidapi_jobs, idf=idf)[:10]
+            rapidapi_jobs = [job for job, _, _ in ranked_jobs]
+            job_cards.markdown(
+                "".join(job_card_html(job, score, terms) for job, score, terms in ranked_jobs),
+                unsafe_allow_html=True
+            )
+            
+            if deduper.collapsed:
+                print(f" Removed {deduper.collapsed} duplicate jobs")
             st.session_state.jobs_list = rapidapi_jobs
             
             # Save to analytics
@@ -499,7 +567,8 @@ if uploaded_file:
             keyword_list = search_keywords_clean.split(',')[:10]
             
             try:
-                save_analysis(
+                # Queued for the background writer so the page does not wait on the database
+                save_analysis_async(
                     ats_score=int(ats_score) if ats_score and str(ats_score).isdigit() else 0,
                     skill_gaps=gap_lines[:10],
                     keywords=keyword_list,
@@ -507,6 +576,9 @@ if uploaded_file:
                 )
             except Exception as e:
                 print(f"Error saving analytics: {e}")
+        
+        if not rapidapi_jobs:
+            st.info("ℹ️ No RapidAPI jobs found.")
 
         
         # Display LinkedIn Jobs
@@ -541,28 +613,6 @@ if uploaded_file:
         #     st.info("ℹ️ No LinkedIn jobs found.")
         
         
-        # Display RapidAPI Jobs
-        st.markdown('<hr class="custom-divider">', unsafe_allow_html=True)
-        st.markdown('<h2 class="section-header">🌐 Jobs Recommendation </h2>', unsafe_allow_html=True)
-  
-        
-        if rapidapi_jobs:
-            for job in rapidapi_jobs:
-                job_title = job.get('job_title', 'No Title')
-                job_company = job.get('employer_name', 'Unknown Company')
-                job_location = f"{job.get('job_city') or ''}, {job.get('job_country') or ''}".strip(', ') or "Location not specified"
-                job_link = job.get('job_apply_link', '#')
-                
-                st.markdown(f"""
-                <div class="job-card">
-                    <div class="job-title">{job_title}</div>
-                    <div class="job-company">{job_company}</div>
-                    <div class="job-location">📍 {job_location}</div>
-                    <a href="{job_link}" target="_blank" class="linkedin-button">View Job →</a>
-                </div>
-                """, unsafe_allow_html=True)
-        else:
-            st.info("ℹ️ No RapidAPI jobs found.")
 
 else:
     # Show placeholder message when no file uploaded
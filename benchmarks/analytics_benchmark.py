@@ -0,0 +1,111 @@
+"""
+Benchmark the analytics store at a large number of analyses.
+
+Builds a synthetic legacy `analytics.json`, times the old load-everything
+getters and a JSON rewrite, then migrates it into SQLite and times the
+same operations there.
+
+Usage:
+    python benchmarks/analytics_benchmark.py --analyses 1000000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import src.analytics_manager as analytics  # noqa: E402
+
+SKILLS = [f"skill {i}" for i in range(300)]
+KEYWORDS = [f"role {i}" for i in range(150)]
+GETTERS = ["get_total_count", "get_average_ats", "get_top_skill_gaps", "get_top_keywords", "get_score_distribution"]
+
+
+def make_json(path: str, count: int) -> None:
+    """Write a legacy analytics file with `count` random analyses."""
+    start = datetime(2025, 1, 1)
+    rng = random.Random(42)
+    analyses = [
+        {
+            "timestamp": (start + timedelta(minutes=i)).isoformat(),
+            "ats_score": rng.randint(0, 100),
+            "skill_gaps": rng.sample(SKILLS, rng.randint(1, 6)),
+            "keywords": rng.sample(KEYWORDS, rng.randint(1, 4)),
+            "job_count": rng.randint(0, 10)
+        }
+        for i in range(count)
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"analyses": analyses, "created_at": start.isoformat(), "version": "1.0"}, f, indent=2)
+
+
+def legacy_dashboard(path: str) -> None:
+    """The five dashboard getters as the JSON store ran them: one full parse each."""
+    for _ in GETTERS:
+        with open(path, "r", encoding="utf-8") as f:
+            analyses = json.load(f)["analyses"]
+        counts = {}
+        for analysis in analyses:
+            for gap in analysis["skill_gaps"]:
+                counts[gap.lower().strip()] = counts.get(gap.lower().strip(), 0) + 1
+
+
+def legacy_save(path: str) -> None:
+    """One save_analysis as the JSON store ran it: load, append, rewrite."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    data["analyses"].append({"timestamp": datetime.now().isoformat(), "ats_score": 70,
+                             "skill_gaps": ["docker"], "keywords": ["data engineer"], "job_count": 5})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def timed(label: str, func, repeat: int = 1) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    seconds = (time.perf_counter() - started) / repeat
+    print(f"  {label:<32} {seconds * 1000:>12.2f} ms")
+    return seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--analyses", type=int, default=1_000_000)
+    parser.add_argument("--saves", type=int, default=200, help="save_analysis calls timed against SQLite")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "analytics.json")
+        analytics.ANALYTICS_FILE = json_path
+        analytics.ANALYTICS_DB = os.path.join(tmp, "analytics.db")
+
+        print(f"Generating {args.analyses:,} analyses...")
+        make_json(json_path, args.analyses)
+        print(f"  JSON file size: {os.path.getsize(json_path) / 1e6:.1f} MB")
+
+        print("JSON store")
+        timed("dashboard (5 getters)", lambda: legacy_dashboard(json_path))
+        timed("save_analysis", lambda: legacy_save(json_path))
+
+        print("SQLite store")
+        timed("one-shot migration", lambda: analytics._connect().close())
+        print(f"  migrated analyses: {analytics.get_total_count():,}")
+        timed("dashboard (5 getters)", lambda: [getattr(analytics, name)() for name in GETTERS], repeat=3)
+        for name in GETTERS:
+            timed(name, getattr(analytics, name), repeat=3)
+        timed("save_analysis", lambda: analytics.save_analysis(70, ["Docker"], ["Data Engineer"], 5),
+              repeat=args.saves)
+        timed("rebuild_aggregates", analytics.rebuild_aggregates)
+        timed("get_range_stats (one week)",
+              lambda: analytics.get_range_stats("2025-01-03T10:15", "2025-01-10T16:45"), repeat=3)
+        timed("get_range_stats (all time)", analytics.get_range_stats, repeat=3)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark ranking fetched jobs against a resume, cold and warm.
+
+Builds synthetic postings of realistic length (English stopwords, mixed
+case, punctuation and tech terms such as C++ and C#). "Cold" ranks jobs
+whose term counts are not cached yet, as for freshly fetched postings,
+and is broken down into decoding the compressed descriptions, tokenizing
+and hashing them, and scoring. "Warm" ranks the same jobs again.
+
+Usage:
+    python benchmarks/ranking_benchmark.py --jobs 1000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import src.job_ranking as job_ranking  # noqa: E402
+from src.job_api import Job  # noqa: E402
+
+STOPWORDS = sorted(job_ranking._STOPWORDS)
+TECH_TERMS = ["Python", "SQL", "C++", "C#", "Node.js", "Power BI", "AWS", "ETL", "Tableau", "Excel", "R", "Spark"]
+
+
+def make_jobs(count: int, rng: random.Random):
+    """Synthetic JSearch postings with descriptions of 2,000-6,000 characters."""
+    vocabulary = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 11)))
+                  for _ in range(30000)]
+    common = vocabulary[:3000]
+
+    def text(words: int) -> str:
+        out = []
+        for _ in range(words):
+            roll = rng.random()
+            word = (rng.choice(STOPWORDS) if roll < 0.3 else rng.choice(TECH_TERMS) if roll < 0.33 else
+                    rng.choice(common) if roll < 0.9 else rng.choice(vocabulary))
+            out.append(word.capitalize() if rng.random() < 0.08 else word)
+            if rng.random() < 0.07:
+                out[-1] += rng.choice([",", ".", ";", ":"])
+        return " ".join(out)
+
+    resume = text(600)
+    jobs = [Job.from_rapidapi({"job_id": str(i), "job_title": text(rng.randint(2, 6)), "employer_name": "Company",
+                               "job_description": text(rng.randint(300, 900))}) for i in range(count)]
+    return resume, jobs
+
+
+def timed(label: str, func, repeat: int, setup=None) -> float:
+    runs = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - started)
+    print(f"  {label:<36} {min(runs) * 1000:>9.1f} ms min {statistics.median(runs) * 1000:>9.1f} ms median")
+    return min(runs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=1000, help="jobs ranked per call")
+    parser.add_argument("--repeat", type=int, default=10, help="timed runs per case")
+    args = parser.parse_args()
+
+    resume, jobs = make_jobs(args.jobs, random.Random(42))
+    texts = [(job.title, job.description) for job in jobs]
+    print(f"{len(jobs)} jobs, {sum(len(d) for _, d in texts) / len(jobs):,.0f} description characters on average")
+
+    print("cold (term counts not cached)")
+    clear = job_ranking._job_features.clear
+    timed("rank_jobs", lambda: job_ranking.rank_jobs(resume, jobs), args.repeat, setup=clear)
+    timed("  decode descriptions", lambda: [job.description for job in jobs], args.repeat)
+    timed("  tokenize and hash", lambda: job_ranking.batch_term_counts(texts), args.repeat)
+    print("warm (term counts cached)")
+    job_ranking.rank_jobs(resume, jobs)
+    timed("rank_jobs", lambda: job_ranking.rank_jobs(resume, jobs), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark PDF report generation with the shared report template.
+
+Times building the report styles (ReportTemplate), which the shared
+template saves on every report after the first, against building the
+report story and the full PDF.
+
+Usage:
+    python benchmarks/report_benchmark.py --reports 200
+"""
+import argparse
+import os
+import sys
+import time
+from collections import namedtuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import src.pdf_generator as pdf_generator  # noqa: E402
+from src.report_templates import ReportTemplate  # noqa: E402
+
+Job = namedtuple("Job", "title company location")
+
+SHORT_REPORT = {
+    "summary": "Data analyst with five years of experience in SQL, Python and dashboarding. " * 4,
+    "ats_score": "72",
+    "ats_analysis": "The resume is well structured but misses several keywords from the target roles. " * 5,
+    "gaps": "\n".join(f"- Lack of experience with tool {i}" for i in range(8)),
+    "roadmap": "\n".join(f"{i}. Complete a certification or project in area {i}" for i in range(1, 9)),
+}
+FULL_REPORT = {
+    **SHORT_REPORT,
+    "keywords": "data analyst, business intelligence analyst, sql developer, reporting analyst",
+    "jobs": [Job(f"Data Analyst {i}", f"Company {i}", "Dubai, UAE") for i in range(10)],
+    "improvements": {"current_issues": "- Vague bullet points without metrics\n" * 6,
+                     "suggested_improvements": "- Quantify the impact of each project\n" * 6},
+}
+
+
+def timed(label: str, func, repeat: int = 1) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    seconds = (time.perf_counter() - started) / repeat
+    print(f"  {label:<36} {seconds * 1000:>10.3f} ms")
+    return seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reports", type=int, default=200, help="reports timed per case")
+    args = parser.parse_args()
+
+    template = timed("ReportTemplate()", ReportTemplate, repeat=args.reports)
+    for name, report in (("short report", SHORT_REPORT), ("full report", FULL_REPORT)):
+        print(name)
+        timed("story", lambda: pdf_generator._build_story(**report), repeat=args.reports)
+        full = timed("generate_analysis_pdf", lambda: pdf_generator.generate_analysis_pdf(**report),
+                     repeat=args.reports)
+        print(f"  shared styles save {template / (full + template):.0%} of a report")
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
+import asyncio
 from mcp.server.fastmcp import FastMCP
-from src.job_api import fetch_rapidapi_jobs, fetch_linkedin_jobs
+from src.job_api import fetch_rapidapi_jobs, start_linkedin_run, get_source_health, is_source_available
+from src.job_dedupe import dedupe_jobs
+from src.job_index import search_index
 from src.helper import extract_text_from_pdf, ask_openai
 import os
 
@@ -102,32 +105,94 @@ Resume: {resume_text}""",
 @mcp.tool()
 async def fetch_jobs(keywords: str, location: str = "Saudi Arabia") -> dict:
     """
-    Fetches job listings from RapidAPI and LinkedIn.
+    Fetches job listings from the local job index, or live from RapidAPI and LinkedIn.
     
     Args:
         keywords: Job search keywords (e.g., "Data Scientist, Machine Learning")
         location: Job location (default: "Saudi Arabia")
         
     Returns:
-        Dictionary with job listings from both sources
+        Dictionary with de-duplicated job listings from both sources
     """
     try:
-        rapidapi_jobs = fetch_rapidapi_jobs(keywords, location=location, rows=10)
-        linkedin_jobs = fetch_linkedin_jobs(keywords, location=location, rows=10)
+        # Serve from the local job index when it already has enough recent postings
+        main_keyword = keywords.split(',')[0].strip()
+        indexed_jobs = await asyncio.to_thread(search_index, main_keyword, location=location, limit=20)
+        if len(indexed_jobs) >= 10:
+            unique_jobs, duplicates_removed = dedupe_jobs(indexed_jobs)
+            return {
+                "rapidapi_jobs": {
+                    "total": sum(1 for job in unique_jobs if job.source == "rapidapi"),
+                    "jobs": [job.to_dict() for job in unique_jobs if job.source == "rapidapi"]
+                },
+                "linkedin_jobs": {
+                    "total": sum(1 for job in unique_jobs if job.source == "linkedin"),
+                    "jobs": [job.to_dict() for job in unique_jobs if job.source == "linkedin"]
+                },
+                "duplicates_removed": duplicates_removed,
+                "skipped_sources": [],
+                "from_index": True
+            }
+        
+        # Degraded sources (circuit breaker open) are skipped instead of waited on
+        skipped_sources = [source for source in ("rapidapi", "linkedin") if not is_source_available(source)]
+        
+        # Both sources block on network I/O (LinkedIn polls its scrape for up to
+        # LINKEDIN_TIME_BUDGET), so they run in worker threads, concurrently,
+        # and the event loop keeps serving other requests
+        async def rapidapi() -> list:
+            if "rapidapi" in skipped_sources:
+                return []
+            return await asyncio.to_thread(fetch_rapidapi_jobs, keywords, location=location, rows=10)
+        
+        async def linkedin() -> list:
+            if "linkedin" in skipped_sources:
+                return []
+            try:
+                linkedin_run = await asyncio.to_thread(start_linkedin_run, keywords, location=location, rows=10)
+                if not linkedin_run:
+                    return []
+                # Leaving the block (e.g. the request was cancelled) aborts the run
+                with linkedin_run:
+                    return await asyncio.to_thread(lambda: list(linkedin_run.iter_jobs(max_items=10)))
+            except Exception as e:
+                print(f" LinkedIn error: {str(e)}")
+                return []
+        
+        rapidapi_jobs, linkedin_jobs = await asyncio.gather(rapidapi(), linkedin())
+        
+        # Drop postings returned by both sources (RapidAPI copy is kept)
+        unique_jobs, duplicates_removed = dedupe_jobs(rapidapi_jobs + linkedin_jobs)
+        kept = {id(job) for job in unique_jobs}
+        rapidapi_jobs = [job for job in rapidapi_jobs if id(job) in kept]
+        linkedin_jobs = [job for job in linkedin_jobs if id(job) in kept]
         
         return {
             "rapidapi_jobs": {
                 "total": len(rapidapi_jobs),
-                "jobs": rapidapi_jobs
+                "jobs": [job.to_dict() for job in rapidapi_jobs]
             },
             "linkedin_jobs": {
                 "total": len(linkedin_jobs),
-                "jobs": linkedin_jobs
-            }
+                "jobs": [job.to_dict() for job in linkedin_jobs]
+            },
+            "duplicates_removed": duplicates_removed,
+            "skipped_sources": skipped_sources,
+            "from_index": False
         }
     except Exception as e:
         return {"error": str(e)}
     
+@mcp.tool()
+async def job_source_health() -> dict:
+    """
+    Reports the health of each job source (circuit breaker state, error rate, latency).
+    
+    Returns:
+        Dictionary keyed by source name
+    """
+    return get_source_health()
+    
 @mcp.prompt()
 def system_prompt() -> str: 
     """
@@ -146,7 +211,7 @@ if __name__ == "__main__":
     import os
     
     print(f"🚀 Starting MCP Server")
-    print(f"📡 Available tools: analyze_resume, analyze_resume_from_file, fetch_jobs")
+    print(f"📡 Available tools: analyze_resume, analyze_resume_from_file, fetch_jobs, job_source_health")
     print(f"⚠️  Keep this terminal running!")
     
     # Run MCP server with HTTP transport
@@ -6,13 +6,12 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.analytics_manager import (
-    get_total_count,
-    get_average_ats,
-    get_top_skill_gaps,
-    get_top_keywords,
-    get_score_distribution,
+    get_dashboard_snapshot,
     clear_analytics
 )
+from src.analytics_columns import get_score_percentiles, get_trend
+from src.analytics_writer import get_writer_stats
+from src.analytics_shards import count_shards, get_merged_view, shard_percentiles, shard_snapshot, shard_trend
 
 # Page configuration
 st.set_page_config(
@@ -86,12 +85,24 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# Get analytics data
-total_resumes = get_total_count()
-avg_ats = get_average_ats()
-top_gaps = get_top_skill_gaps(5)
-top_keywords = get_top_keywords(10)
-score_dist = get_score_distribution()
+# Several app/MCP nodes publish analytics shards; offer the merged view of all of them
+merged = None
+if count_shards() > 1:
+    scope = st.radio("Scope", ["This node", "All nodes"], horizontal=True)
+    if scope == "All nodes":
+        merged = get_merged_view()
+        st.caption(f"Merged from {len(merged['nodes'])} nodes: {', '.join(sorted(merged['nodes']))}")
+
+# Get analytics data (one consistent read, cached until new analyses are saved)
+if merged is not None:
+    snapshot = shard_snapshot(merged, top_gaps=5, top_keywords=10)
+else:
+    snapshot = get_dashboard_snapshot(top_gaps=5, top_keywords=10)
+total_resumes = snapshot.total_count
+avg_ats = snapshot.average_ats
+top_gaps = snapshot.top_skill_gaps
+top_keywords = snapshot.top_keywords
+score_dist = snapshot.score_distribution
 
 # Check if there's data
 if total_resumes == 0:
@@ -228,6 +239,40 @@ else:
 
 st.divider()
 
+# Trends
+st.markdown("### 📅 Trends")
+
+period = st.radio("Group by", ["day", "week"], horizontal=True, format_func=str.title)
+trend = shard_trend(merged, period) if merged is not None else get_trend(period)
+
+if trend:
+    if merged is not None:
+        percentiles = shard_percentiles(merged, (25, 50, 75, 90))
+    else:
+        percentiles = get_score_percentiles((25, 50, 75, 90))
+    pcols = st.columns(len(percentiles))
+    for col, (p, value) in zip(pcols, percentiles.items()):
+        with col:
+            st.metric(f"ATS P{p}", value)
+    
+    tcol1, tcol2 = st.columns(2)
+    with tcol1:
+        st.markdown(f"**Analyses per {period}**")
+        st.line_chart({
+            "Period": [point["period"] for point in trend],
+            "Analyses": [point["count"] for point in trend]
+        }, x="Period", y="Analyses", color="#6b7fd7")
+    with tcol2:
+        st.markdown(f"**Average ATS score per {period}**")
+        st.line_chart({
+            "Period": [point["period"] for point in trend],
+            "Average ATS": [point["average_ats"] for point in trend]
+        }, x="Period", y="Average ATS", color="#8b5fbf")
+else:
+    st.info("No trend data available yet.")
+
+st.divider()
+
 # Admin Section
 with st.expander("⚙️ Admin Actions"):
     st.warning("**Caution:** These actions cannot be undone!")
@@ -246,10 +291,17 @@ with st.expander("⚙️ Admin Actions"):
             st.success("✅ Analytics data cleared!")
             st.rerun()
 
+    writer = get_writer_stats()
+    st.caption(
+        f"Write queue: {writer['queue_depth']} pending (max {writer['max_queue_depth']}) · "
+        f"{writer['written']} saved in {writer['batches']} batches · "
+        f"last batch {writer['last_batch_size']} in {writer['last_flush_ms']} ms"
+    )
+
 # Footer
 st.markdown("""
 <div style="text-align: center; color: #7f8c8d; font-size: 0.9rem; margin-top: 2rem;">
     <p>Analytics are updated in real-time as new resumes are analyzed.</p>
-    <p>Data is stored locally in <code>data/analytics.json</code></p>
+    <p>Data is stored locally in <code>data/analytics.db</code></p>
 </div>
 """, unsafe_allow_html=True)
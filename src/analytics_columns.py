@@ -0,0 +1,241 @@
+import threading
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src import analytics_manager
+
+
+DAY_SECONDS = 86400
+# Day 4 of the epoch (1970-01-05) is a Monday; weeks start on Mondays
+_WEEK_ORIGIN_DAYS = 4
+
+DateLike = Union[datetime, date, str, None]
+
+
+def _to_epoch(value: DateLike) -> Optional[int]:
+    """Convert a datetime, date or ISO string to epoch seconds (naive times as stored)."""
+    if value is None:
+        return None
+    return int(np.datetime64(value, "s").astype(np.int64))
+
+
+class AnalyticsColumns:
+    """
+    Analyses held as parallel NumPy arrays (timestamp, ATS score, job count).
+
+    Arrays are loaded once and extended with new rows as analyses are
+    saved, so every query below is a vectorized operation over columns.
+    """
+
+    def __init__(self):
+        self.last_id = 0
+        self.timestamps = np.zeros(0, dtype=np.int64)  # epoch seconds
+        self.scores = np.zeros(0, dtype=np.int16)
+        self.job_counts = np.zeros(0, dtype=np.int32)
+        self.ordered = True  # timestamps non-decreasing, so ranges can be found by bisection
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def extend(self, ids: Sequence[int], timestamps: Sequence[str], scores: Sequence[int],
+               job_counts: Sequence[int]) -> None:
+        """Append rows read from the analytics store (in id order)."""
+        if not len(ids):
+            return
+        new_times = np.array(timestamps, dtype="datetime64[us]").astype("datetime64[s]").astype(np.int64)
+        if self.ordered:
+            joined = np.concatenate((self.timestamps[-1:], new_times))
+            self.ordered = bool(np.all(joined[1:] >= joined[:-1]))
+        self.timestamps = np.concatenate((self.timestamps, new_times))
+        self.scores = np.concatenate((self.scores, np.asarray(scores, dtype=np.int16)))
+        self.job_counts = np.concatenate((self.job_counts, np.asarray(job_counts, dtype=np.int32)))
+        self.last_id = int(ids[-1])
+
+    def select(self, start: DateLike = None, end: DateLike = None) -> Union[slice, np.ndarray]:
+        """
+        Index selecting analyses with start <= timestamp < end.
+
+        Returns:
+            A slice when timestamps are ordered, otherwise a boolean mask
+        """
+        start_ts, end_ts = _to_epoch(start), _to_epoch(end)
+        if self.ordered:
+            lo = 0 if start_ts is None else int(np.searchsorted(self.timestamps, start_ts, side="left"))
+            hi = len(self) if end_ts is None else int(np.searchsorted(self.timestamps, end_ts, side="left"))
+            return slice(lo, max(lo, hi))
+        mask = np.ones(len(self), dtype=bool)
+        if start_ts is not None:
+            mask &= self.timestamps >= start_ts
+        if end_ts is not None:
+            mask &= self.timestamps < end_ts
+        return mask
+
+    def summary(self, start: DateLike = None, end: DateLike = None) -> Dict[str, Any]:
+        """Count, average ATS (scored analyses only), min/max score and jobs recommended in a date range."""
+        index = self.select(start, end)
+        scores = self.scores[index]
+        scored = scores[scores > 0]
+        return {
+            "count": int(scores.size),
+            "average_ats": round(float(scored.mean()), 1) if scored.size else 0.0,
+            "min_ats": int(scored.min()) if scored.size else 0,
+            "max_ats": int(scored.max()) if scored.size else 0,
+            "job_count": int(self.job_counts[index].sum(dtype=np.int64))
+        }
+
+    def histogram(self, bins: Union[int, Sequence[float]] = 10, start: DateLike = None,
+                  end: DateLike = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Histogram of ATS scores.
+
+        Args:
+            bins: Number of equal-width bins over 0-100, or explicit bin edges
+            start, end: Optional date range (end exclusive)
+
+        Returns:
+            Tuple of (counts, bin edges)
+        """
+        scores = self.scores[self.select(start, end)]
+        if isinstance(bins, int):
+            return np.histogram(scores, bins=bins, range=(0, 100))
+        return np.histogram(scores, bins=np.asarray(bins, dtype=np.float64))
+
+    def percentiles(self, q: Sequence[float] = (25, 50, 75, 90), start: DateLike = None,
+                    end: DateLike = None) -> Dict[float, float]:
+        """ATS score percentiles of scored analyses in a date range."""
+        scores = self.scores[self.select(start, end)]
+        scores = scores[scores > 0]
+        if not scores.size:
+            return {p: 0.0 for p in q}
+        return {p: round(float(v), 1) for p, v in zip(q, np.percentile(scores, q))}
+
+    def trend(self, period: str = "day", start: DateLike = None, end: DateLike = None) -> List[Dict[str, Any]]:
+        """
+        Per-day or per-week series of analysis count, average ATS and jobs recommended.
+
+        Args:
+            period: "day" or "week" (weeks start on Monday)
+            start, end: Optional date range (end exclusive)
+
+        Returns:
+            List of {"period", "count", "average_ats", "job_count"}, oldest first;
+            periods without analyses are omitted
+        """
+        if period not in ("day", "week"):
+            raise ValueError(f"Unknown trend period: {period}")
+        index = self.select(start, end)
+        days = self.timestamps[index] // DAY_SECONDS
+        if period == "week":
+            days = days - (days - _WEEK_ORIGIN_DAYS) % 7
+        if not days.size:
+            return []
+
+        buckets, inverse = np.unique(days, return_inverse=True)
+        scores = self.scores[index].astype(np.int64)
+        counts = np.bincount(inverse)
+        scored = np.bincount(inverse, weights=scores > 0)
+        score_sums = np.bincount(inverse, weights=scores)
+        jobs = np.bincount(inverse, weights=self.job_counts[index])
+        averages = np.divide(score_sums, scored, out=np.zeros_like(score_sums), where=scored > 0)
+
+        labels = (buckets * DAY_SECONDS).astype("datetime64[s]").astype("datetime64[D]").astype(str)
+        return [
+            {"period": label, "count": int(count), "average_ats": round(float(avg), 1), "job_count": int(job)}
+            for label, count, avg, job in zip(labels.tolist(), counts.tolist(), averages.tolist(), jobs.tolist())
+        ]
+
+
+_columns = AnalyticsColumns()
+_columns_key: Tuple[str, int, int] = ("", -1, -1)
+_columns_lock = threading.Lock()
+
+
+def get_analytics_columns() -> AnalyticsColumns:
+    """
+    Get the shared columnar view of all analyses, brought up to date.
+
+    Only analyses saved since the last call are read from the store; the
+    arrays are reloaded from scratch after analyses were deleted.
+    """
+    global _columns, _columns_key
+    with _columns_lock:
+        revision, generation = analytics_manager.get_data_version()
+        key = (analytics_manager.ANALYTICS_DB, revision, generation)
+        if key == _columns_key:
+            return _columns
+
+        if key[0] != _columns_key[0] or generation != _columns_key[2]:
+            _columns = AnalyticsColumns()
+        _columns.extend(*analytics_manager.get_analysis_columns_since(_columns.last_id))
+        _columns_key = key
+        return _columns
+
+
+def _expired_history(start: DateLike, end: DateLike) -> Optional[Dict[str, List[list]]]:
+    """
+    Daily rollups and score counts for [start, end) once raw retention has deleted analyses, else None.
+
+    Expired analyses only survive in the rollups, so every query below
+    answers from them (rounded to whole days) instead of from the raw
+    columns; while all analyses are stored raw, the columns are used.
+    """
+    if analytics_manager.get_raw_cutoff() is None:
+        return None
+    return analytics_manager.get_rollup_history(start, end)
+
+
+def get_range_summary(start: DateLike = None, end: DateLike = None) -> Dict[str, Any]:
+    """Count, average/min/max ATS and jobs recommended for analyses in [start, end)."""
+    history = _expired_history(start, end)
+    if history is None:
+        return get_analytics_columns().summary(start, end)
+
+    days = history["days"]
+    scored, score_sum = sum(day[2] for day in days), sum(day[3] for day in days)
+    scored_values = [score for score, count in history["scores"] if score > 0 and count > 0]
+    return {
+        "count": sum(day[1] for day in days),
+        "average_ats": round(score_sum / scored, 1) if scored else 0.0,
+        "min_ats": min(scored_values, default=0),
+        "max_ats": max(scored_values, default=0),
+        "job_count": sum(day[4] for day in days)
+    }
+
+
+def get_score_histogram(bins: Union[int, Sequence[float]] = 10, start: DateLike = None,
+                        end: DateLike = None) -> List[tuple]:
+    """
+    Histogram of ATS scores with arbitrary bins.
+
+    Returns:
+        List of tuples (bin label like "40-50", count)
+    """
+    history = _expired_history(start, end)
+    if history is None:
+        counts, edges = get_analytics_columns().histogram(bins, start, end)
+    else:
+        scores, weights = np.array(history["scores"], dtype=np.int64).reshape(-1, 2).T
+        if isinstance(bins, int):
+            counts, edges = np.histogram(scores, bins=bins, range=(0, 100), weights=weights)
+        else:
+            counts, edges = np.histogram(scores, bins=np.asarray(bins, dtype=np.float64), weights=weights)
+    return [(f"{edges[i]:g}-{edges[i + 1]:g}", int(count)) for i, count in enumerate(counts.tolist())]
+
+
+def get_score_percentiles(q: Sequence[float] = (25, 50, 75, 90), start: DateLike = None,
+                          end: DateLike = None) -> Dict[float, float]:
+    """ATS score percentiles for analyses in [start, end)."""
+    history = _expired_history(start, end)
+    if history is None:
+        return get_analytics_columns().percentiles(q, start, end)
+    return analytics_manager.score_percentiles(history["scores"], q)
+
+
+def get_trend(period: str = "day", start: DateLike = None, end: DateLike = None) -> List[Dict[str, Any]]:
+    """Daily or weekly analysis count / average ATS series (see AnalyticsColumns.trend())."""
+    history = _expired_history(start, end)
+    if history is None:
+        return get_analytics_columns().trend(period, start, end)
+    return analytics_manager.rollup_trend(history["days"], period)
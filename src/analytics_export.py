@@ -0,0 +1,120 @@
+import argparse
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+from src.analytics_manager import iter_analysis_batches
+
+
+EXPORT_BATCH_SIZE = 20000  # analyses per row group / record batch
+FORMATS = {".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow", ".ipc": "arrow"}
+
+
+def _import_pyarrow():
+    """Import the optional `pyarrow` package needed for columnar exports."""
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+        return pyarrow
+    except ImportError:
+        raise RuntimeError("Columnar analytics export requires the 'pyarrow' package (pip install pyarrow)")
+
+
+def _schema(pa):
+    return pa.schema([
+        ("id", pa.int64()),
+        ("timestamp", pa.timestamp("us")),
+        ("ats_score", pa.int16()),
+        ("job_count", pa.int32()),
+        ("skill_gaps", pa.list_(pa.string())),
+        ("keywords", pa.list_(pa.string())),
+    ])
+
+
+def _record_batch(pa, schema, batch: Dict[str, Any]):
+    """Convert one batch from iter_analysis_batches() into an Arrow record batch."""
+    return pa.record_batch([
+        pa.array(batch["ids"], type=pa.int64()),
+        pa.array(batch["timestamps"]).cast(pa.timestamp("us")),
+        pa.array(batch["ats_scores"], type=pa.int16()),
+        pa.array(batch["job_counts"], type=pa.int32()),
+        pa.array(batch["skill_gaps"], type=pa.list_(pa.string())),
+        pa.array(batch["keywords"], type=pa.list_(pa.string())),
+    ], schema=schema)
+
+
+def export_analytics(path: str, fmt: Optional[str] = None, after_id: int = 0, since: Any = None,
+                     batch_size: int = EXPORT_BATCH_SIZE, compression: str = "zstd") -> Dict[str, Any]:
+    """
+    Export stored analyses to a Parquet or Arrow IPC file.
+
+    Analyses are streamed from the database one batch at a time and each
+    batch is written as its own Parquet row group / IPC record batch, so
+    memory stays bounded by `batch_size` however large the history is.
+    The file is written under a temporary name and renamed when complete.
+
+    Args:
+        path: Output file
+        fmt: "parquet" or "arrow" (default: from the file extension)
+        after_id: Only analyses with a larger id; pass the previous export's
+                  last_id for an incremental export
+        since: Only analyses with a later timestamp (datetime, date or ISO string)
+        batch_size: Analyses per row group
+        compression: Parquet/IPC compression codec (e.g. "zstd", "snappy", "none")
+
+    Returns:
+        Dictionary with path, format, rows, row_groups, last_id, max_timestamp,
+        seconds and rows_per_second
+    """
+    fmt = fmt or FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt not in ("parquet", "arrow"):
+        raise ValueError(f"Unknown export format for {path}; use .parquet, .arrow/.feather/.ipc or fmt=")
+    pa = _import_pyarrow()
+    schema = _schema(pa)
+    codec = None if compression == "none" else compression
+
+    started = time.monotonic()
+    stats = {"path": path, "format": fmt, "rows": 0, "row_groups": 0, "last_id": after_id, "max_timestamp": None}
+    tmp_path = f"{path}.tmp"
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if fmt == "parquet":
+        writer = pa.parquet.ParquetWriter(tmp_path, schema, compression=codec)
+    else:
+        writer = pa.ipc.new_file(tmp_path, schema, options=pa.ipc.IpcWriteOptions(compression=codec))
+    try:
+        for batch in iter_analysis_batches(after_id=after_id, since=since, batch_size=batch_size):
+            record_batch = _record_batch(pa, schema, batch)
+            if fmt == "parquet":
+                writer.write_batch(record_batch, row_group_size=len(batch["ids"]))
+            else:
+                writer.write_batch(record_batch)
+            stats["rows"] += len(batch["ids"])
+            stats["row_groups"] += 1
+            stats["last_id"] = batch["ids"][-1]
+            stats["max_timestamp"] = max(stats["max_timestamp"] or "", max(batch["timestamps"]))
+        writer.close()
+    except BaseException:
+        writer.close()
+        os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+
+    seconds = time.monotonic() - started
+    stats["seconds"] = round(seconds, 2)
+    stats["rows_per_second"] = round(stats["rows"] / seconds) if seconds else 0
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export analytics history to Parquet or Arrow IPC.")
+    parser.add_argument("path", help="output file (.parquet, .arrow, .feather or .ipc)")
+    parser.add_argument("--format", choices=["parquet", "arrow"], help="default: from the file extension")
+    parser.add_argument("--after-id", type=int, default=0, help="only analyses after this id (incremental)")
+    parser.add_argument("--since", help="only analyses after this ISO timestamp")
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE, help="analyses per row group")
+    parser.add_argument("--compression", default="zstd")
+    args = parser.parse_args()
+
+    print(json.dumps(export_analytics(args.path, args.format, args.after_id, args.since, args.batch_size,
+                                      args.compression), indent=2))
@@ -1,166 +1,1185 @@
 import json
 import os
-from datetime import datetime
-from typing import Dict, List, Any
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from array import array
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from src.skill_vocabulary import canonicalize_gaps
 
 
 ANALYTICS_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "analytics.json")
+ANALYTICS_DB = os.path.join(os.path.dirname(__file__), "..", "data", "analytics.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    ats_score INTEGER NOT NULL,
+    job_count INTEGER NOT NULL DEFAULT 0,
+    skill_gaps TEXT NOT NULL DEFAULT '[]',  -- raw gap text as submitted (JSON list)
+    keywords TEXT NOT NULL,
+    gap_ids BLOB NOT NULL DEFAULT x''  -- skill ids as packed uint32s
+);
+CREATE INDEX IF NOT EXISTS idx_analyses_timestamp ON analyses(timestamp);
+CREATE INDEX IF NOT EXISTS idx_analyses_ats_score ON analyses(ats_score);
+-- Canonical skills (see src/skill_vocabulary.py), interned to integer ids
+CREATE TABLE IF NOT EXISTS skills (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS analysis_skills (
+    analysis_id INTEGER NOT NULL REFERENCES analyses(id) ON DELETE CASCADE,
+    skill_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_analysis_skills_skill ON analysis_skills(skill_id);
+CREATE INDEX IF NOT EXISTS idx_analysis_skills_analysis ON analysis_skills(analysis_id);
+CREATE TABLE IF NOT EXISTS analysis_keywords (
+    analysis_id INTEGER NOT NULL REFERENCES analyses(id) ON DELETE CASCADE,
+    keyword TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_analysis_keywords_keyword ON analysis_keywords(keyword);
+CREATE INDEX IF NOT EXISTS idx_analysis_keywords_analysis ON analysis_keywords(analysis_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+-- Running aggregates, updated in the same transaction as each insert
+CREATE TABLE IF NOT EXISTS analytics_totals (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    analyses INTEGER NOT NULL DEFAULT 0,
+    scored INTEGER NOT NULL DEFAULT 0,
+    score_sum INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS score_counts (
+    ats_score INTEGER PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS skill_counts (
+    skill_id INTEGER PRIMARY KEY,
+    count INTEGER NOT NULL,
+    first_seen INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_skill_counts_rank ON skill_counts(count DESC, first_seen);
+CREATE TABLE IF NOT EXISTS keyword_counts (
+    keyword TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    first_seen INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_keyword_counts_rank ON keyword_counts(count DESC, first_seen);
+
+-- Space-Saving sketch replacing skill_counts/keyword_counts when ANALYTICS_TOP_K=space_saving:
+-- at most TOP_K_CAPACITY terms per kind, each count overestimated by at most `error`
+CREATE TABLE IF NOT EXISTS term_sketch (
+    kind TEXT NOT NULL,
+    term TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    error INTEGER NOT NULL,
+    first_seen INTEGER NOT NULL,
+    PRIMARY KEY (kind, term)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_term_sketch_rank ON term_sketch(kind, count DESC, first_seen);
+
+-- Hourly and daily rollups; kept after raw analyses expire. Buckets are
+-- timestamp prefixes: "2025-01-31T14" (hour) and "2025-01-31" (day).
+CREATE TABLE IF NOT EXISTS rollups (
+    granularity TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    scored INTEGER NOT NULL,
+    score_sum INTEGER NOT NULL,
+    job_count INTEGER NOT NULL,
+    PRIMARY KEY (granularity, bucket)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollup_scores (
+    granularity TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    ats_score INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (granularity, bucket, ats_score)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollup_terms (
+    granularity TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    term TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    first_id INTEGER NOT NULL,
+    PRIMARY KEY (granularity, bucket, kind, term)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_rollup_terms_term ON rollup_terms(kind, term);
+"""
+
+# Bump when the aggregate tables change shape; a mismatch triggers a rebuild
+AGGREGATES_VERSION = "3"
+
+# Top-N skill gaps/keywords from exact counters ("exact") or a fixed-size sketch ("space_saving")
+TOP_K_MODE = os.getenv("ANALYTICS_TOP_K", "exact")
+TOP_K_CAPACITY = int(os.getenv("ANALYTICS_TOP_K_CAPACITY", 1000))
+
+# Exact top-N query per kind: (term, count), ties in first-seen order
+_TOP_QUERIES = {
+    "gap": """SELECT s.name, c.count FROM skill_counts c JOIN skills s ON s.id = c.skill_id
+              ORDER BY c.count DESC, c.first_seen LIMIT ?""",
+    "keyword": "SELECT keyword, count FROM keyword_counts ORDER BY count DESC, first_seen LIMIT ?"
+}
+
+# Per-analysis (analysis_id, term) rows of each kind
+_TERM_SOURCES = {
+    "gap": "SELECT t.analysis_id, s.name AS term FROM analysis_skills t JOIN skills s ON s.id = t.skill_id",
+    "keyword": "SELECT analysis_id, keyword AS term FROM analysis_keywords"
+}
+
+# Rollup granularity -> length of the timestamp prefix naming its bucket
+ROLLUP_GRANULARITIES = {"hour": 13, "day": 10}
+
+# Raw analyses older than this many days are deleted (rollups are kept); 0 keeps them forever
+RAW_RETENTION_DAYS = int(os.getenv("ANALYTICS_RAW_RETENTION_DAYS", 0))
+RETENTION_CHECK_SECONDS = 60 * 60
+
+_schema_lock = threading.Lock()
+_schema_ready = set()
+_retention_checked: Dict[str, float] = {}
+
+
+def _connect() -> sqlite3.Connection:
+    """Open a connection to the analytics database, creating and migrating it on first use."""
+    path = ANALYTICS_DB
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys=ON")
+    if path not in _schema_ready:
+        with _schema_lock:
+            if path not in _schema_ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                with conn:
+                    conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('created_at', ?)",
+                                 (datetime.now().isoformat(),))
+                    conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('version', '2.0')")
+                _migrate_if_needed(conn)
+                version = conn.execute("SELECT value FROM meta WHERE key = 'aggregates_version'").fetchone()
+                if version is None or version[0] != _aggregates_signature():
+                    _rebuild_aggregates(conn)
+                _schema_ready.add(path)
+    return conn
+
+
+def _aggregates_signature() -> str:
+    """Aggregate layout stored in the meta table; switching top-K mode or capacity triggers a rebuild."""
+    if TOP_K_MODE == "space_saving":
+        return f"{AGGREGATES_VERSION}:space_saving:{TOP_K_CAPACITY}"
+    return AGGREGATES_VERSION
+
+
+def _sketch_add(conn: sqlite3.Connection, kind: str, terms: List[str], analysis_id: int) -> None:
+    """
+    Count terms in the Space-Saving sketch. Caller manages the transaction.
+
+    A new term evicts the term with the smallest count once the sketch is
+    full and inherits that count as its error. The evicted term's
+    per-bucket rollups are dropped too, so rollup_terms only holds terms
+    the sketch tracks.
+    """
+    for term in terms:
+        if conn.execute("UPDATE term_sketch SET count = count + 1 WHERE kind = ? AND term = ?", (kind, term)).rowcount:
+            continue
+        floor = 0
+        if conn.execute("SELECT COUNT(*) FROM term_sketch WHERE kind = ?", (kind,)).fetchone()[0] >= TOP_K_CAPACITY:
+            victim = conn.execute("""SELECT term, count FROM term_sketch WHERE kind = ?
+                                     ORDER BY count, first_seen DESC LIMIT 1""", (kind,)).fetchone()
+            conn.execute("DELETE FROM term_sketch WHERE kind = ? AND term = ?", (kind, victim["term"]))
+            conn.execute("DELETE FROM rollup_terms WHERE kind = ? AND term = ?", (kind, victim["term"]))
+            floor = victim["count"]
+        conn.execute("INSERT INTO term_sketch (kind, term, count, error, first_seen) VALUES (?, ?, ?, ?, ?)",
+                     (kind, term, floor + 1, floor, analysis_id))
+
+
+def _pack_ids(ids: List[int]) -> bytes:
+    """Skill ids as a compact array of uint32s (native byte order)."""
+    return array("I", ids).tobytes()
+
+
+def _unpack_ids(blob: bytes) -> List[int]:
+    ids = array("I")
+    ids.frombytes(blob or b"")
+    return ids.tolist()
+
+
+def _intern_skills(conn: sqlite3.Connection, names: List[str]) -> List[int]:
+    """Ids of canonical skill names, adding new names to the skills table. Caller manages the transaction."""
+    ids = []
+    for name in names:
+        row = conn.execute("SELECT id FROM skills WHERE name = ?", (name,)).fetchone()
+        ids.append(row[0] if row else conn.execute("INSERT INTO skills (name) VALUES (?)", (name,)).lastrowid)
+    return ids
+
+
+def _normalize_entry(ats_score: Any, skill_gaps: List[str], keywords: List[str], job_count: int = 0,
+                     timestamp: Optional[str] = None) -> Dict[str, Any]:
+    """Build a stored analysis entry from raw values."""
+    return {
+        "timestamp": timestamp or datetime.now().isoformat(),
+        "ats_score": int(ats_score) if ats_score and str(ats_score).isdigit() else 0,
+        "skill_gaps": list(skill_gaps or [])[:10],  # Store max 10 gaps
+        "keywords": list(keywords or [])[:10],  # Store max 10 keywords
+        "job_count": job_count or 0
+    }
+
+
+def _insert_analyses(conn: sqlite3.Connection, entries: Iterable[Dict[str, Any]],
+                     update_aggregates: bool = True) -> int:
+    """Insert analysis entries with their gap/keyword rows and update the aggregates.
+
+    Bulk loads pass update_aggregates=False and rebuild the aggregates once
+    afterwards. Caller manages the transaction.
+    """
+    count = 0
+    for entry in entries:
+        gaps = canonicalize_gaps(entry["skill_gaps"])
+        gap_ids = _intern_skills(conn, gaps)
+        cursor = conn.execute(
+            """INSERT INTO analyses (timestamp, ats_score, job_count, skill_gaps, keywords, gap_ids)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (entry["timestamp"], entry["ats_score"], entry["job_count"],
+             json.dumps(entry["skill_gaps"], ensure_ascii=False), json.dumps(entry["keywords"], ensure_ascii=False),
+             _pack_ids(gap_ids))
+        )
+        analysis_id = cursor.lastrowid
+        keywords = [k.lower().strip() for k in entry["keywords"] if k and k.strip()]
+        conn.executemany("INSERT INTO analysis_skills (analysis_id, skill_id) VALUES (?, ?)",
+                         [(analysis_id, skill_id) for skill_id in gap_ids])
+        conn.executemany("INSERT INTO analysis_keywords (analysis_id, keyword) VALUES (?, ?)",
+                         [(analysis_id, keyword) for keyword in keywords])
+        count += 1
+        if not update_aggregates:
+            continue
 
+        score = entry["ats_score"]
+        conn.execute(
+            """INSERT INTO analytics_totals (id, analyses, scored, score_sum) VALUES (1, 1, ?, ?)
+               ON CONFLICT(id) DO UPDATE SET analyses = analyses + 1, scored = scored + excluded.scored,
+                                             score_sum = score_sum + excluded.score_sum""",
+            (1 if score > 0 else 0, score if score > 0 else 0)
+        )
+        conn.execute("""INSERT INTO score_counts (ats_score, count) VALUES (?, 1)
+                        ON CONFLICT(ats_score) DO UPDATE SET count = count + 1""", (score,))
+        if TOP_K_MODE == "space_saving":
+            _sketch_add(conn, "gap", gaps, analysis_id)
+            _sketch_add(conn, "keyword", keywords, analysis_id)
+        else:
+            conn.executemany("""INSERT INTO skill_counts (skill_id, count, first_seen) VALUES (?, 1, ?)
+                                ON CONFLICT(skill_id) DO UPDATE SET count = count + 1""",
+                             [(skill_id, analysis_id) for skill_id in gap_ids])
+            conn.executemany("""INSERT INTO keyword_counts (keyword, count, first_seen) VALUES (?, 1, ?)
+                                ON CONFLICT(keyword) DO UPDATE SET count = count + 1""",
+                             [(keyword, analysis_id) for keyword in keywords])
 
-def _load_analytics() -> Dict[str, Any]:
-    """Load analytics data from JSON file."""
+        for granularity, length in ROLLUP_GRANULARITIES.items():
+            bucket = entry["timestamp"][:length]
+            conn.execute(
+                """INSERT INTO rollups (granularity, bucket, count, scored, score_sum, job_count)
+                   VALUES (?, ?, 1, ?, ?, ?)
+                   ON CONFLICT(granularity, bucket) DO UPDATE SET
+                       count = count + 1, scored = scored + excluded.scored,
+                       score_sum = score_sum + excluded.score_sum, job_count = job_count + excluded.job_count""",
+                (granularity, bucket, 1 if score > 0 else 0, score if score > 0 else 0, entry["job_count"])
+            )
+            conn.execute("""INSERT INTO rollup_scores (granularity, bucket, ats_score, count) VALUES (?, ?, ?, 1)
+                            ON CONFLICT(granularity, bucket, ats_score) DO UPDATE SET count = count + 1""",
+                         (granularity, bucket, score))
+            conn.executemany(
+                """INSERT INTO rollup_terms (granularity, bucket, kind, term, count, first_id) VALUES (?, ?, ?, ?, 1, ?)
+                   ON CONFLICT(granularity, bucket, kind, term) DO UPDATE SET count = count + 1""",
+                [(granularity, bucket, "gap", gap, analysis_id) for gap in gaps]
+                + [(granularity, bucket, "keyword", keyword, analysis_id) for keyword in keywords]
+            )
+    if count:
+        _bump_revision(conn)
+    return count
+
+
+def _rebuild_rollups(conn: sqlite3.Connection) -> None:
+    """
+    Recompute rollups from the raw analyses. Caller manages the transaction.
+
+    Only days that still have raw analyses are rebuilt; rollups of days
+    whose analyses expired are kept as they are.
+    """
+    first_day = conn.execute("SELECT substr(MIN(timestamp), 1, 10) FROM analyses").fetchone()[0]
+    if first_day is None:
+        return
+    for table in ("rollups", "rollup_scores", "rollup_terms"):
+        conn.execute(f"DELETE FROM {table} WHERE bucket >= ?", (first_day,))
+
+    for granularity, length in ROLLUP_GRANULARITIES.items():
+        conn.execute("""INSERT INTO rollups (granularity, bucket, count, scored, score_sum, job_count)
+                        SELECT ?, substr(timestamp, 1, ?), COUNT(*), SUM(ats_score > 0),
+                               SUM(CASE WHEN ats_score > 0 THEN ats_score ELSE 0 END), SUM(job_count)
+                        FROM analyses GROUP BY 2""", (granularity, length))
+        conn.execute("""INSERT INTO rollup_scores (granularity, bucket, ats_score, count)
+                        SELECT ?, substr(timestamp, 1, ?), ats_score, COUNT(*)
+                        FROM analyses GROUP BY 2, 3""", (granularity, length))
+        for kind, source in _TERM_SOURCES.items():
+            conn.execute(f"""INSERT INTO rollup_terms (granularity, bucket, kind, term, count, first_id)
+                             SELECT ?, substr(a.timestamp, 1, ?), ?, t.term, COUNT(*), MIN(a.id)
+                             FROM ({source}) t JOIN analyses a ON a.id = t.analysis_id
+                             GROUP BY 2, 4""", (granularity, length, kind))
+
+
+def _rebuild_aggregates(conn: sqlite3.Connection) -> None:
+    """
+    Recompute the rollups from the raw analyses, then the running
+    aggregates from the daily rollups (which also cover expired analyses).
+    """
+    with conn:
+        _rebuild_rollups(conn)
+        for table in ("analytics_totals", "score_counts", "skill_counts", "keyword_counts", "term_sketch"):
+            conn.execute(f"DELETE FROM {table}")
+        conn.execute("""INSERT INTO analytics_totals (id, analyses, scored, score_sum)
+                        SELECT 1, COALESCE(SUM(count), 0), COALESCE(SUM(scored), 0), COALESCE(SUM(score_sum), 0)
+                        FROM rollups WHERE granularity = 'day'""")
+        conn.execute("""INSERT INTO score_counts (ats_score, count)
+                        SELECT ats_score, SUM(count) FROM rollup_scores WHERE granularity = 'day'
+                        GROUP BY ats_score""")
+        if TOP_K_MODE == "space_saving":
+            # Counts are exact here, so the sketch starts as the true top terms with no error
+            conn.execute("""INSERT INTO term_sketch (kind, term, count, error, first_seen)
+                            SELECT kind, term, total, 0, first_seen FROM (
+                                SELECT kind, term, SUM(count) AS total, MIN(first_id) AS first_seen,
+                                       ROW_NUMBER() OVER (PARTITION BY kind ORDER BY SUM(count) DESC,
+                                                          MIN(first_id)) AS rank
+                                FROM rollup_terms WHERE granularity = 'day' GROUP BY kind, term)
+                            WHERE rank <= ?""", (TOP_K_CAPACITY,))
+            conn.execute("""DELETE FROM rollup_terms
+                            WHERE (kind, term) NOT IN (SELECT kind, term FROM term_sketch)""")
+        else:
+            # Skill names of expired history may have been dropped from the skills table
+            conn.execute("""INSERT OR IGNORE INTO skills (name)
+                            SELECT DISTINCT term FROM rollup_terms WHERE kind = 'gap'""")
+            conn.execute("""INSERT INTO skill_counts (skill_id, count, first_seen)
+                            SELECT s.id, SUM(r.count), MIN(r.first_id)
+                            FROM rollup_terms r JOIN skills s ON s.name = r.term
+                            WHERE r.granularity = 'day' AND r.kind = 'gap' GROUP BY s.id""")
+            conn.execute("""INSERT INTO keyword_counts (keyword, count, first_seen)
+                            SELECT term, SUM(count), MIN(first_id) FROM rollup_terms
+                            WHERE granularity = 'day' AND kind = 'keyword' GROUP BY term""")
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('aggregates_version', ?)",
+                     (_aggregates_signature(),))
+        _bump_revision(conn)
+
+
+def rebuild_aggregates() -> None:
+    """
+    Recompute the hourly/daily rollups from the raw analyses and the
+    running aggregates (count, score sum, score histogram, gap and keyword
+    counters) from the rollups.
+
+    Only needed if the aggregate tables were edited or lost; save_analysis
+    keeps them up to date.
+    """
     try:
-        if os.path.exists(ANALYTICS_FILE):
-            with open(ANALYTICS_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {"analyses": [], "created_at": datetime.now().isoformat(), "version": "1.0"}
+        conn = _connect()
+        _rebuild_aggregates(conn)
+        conn.close()
     except Exception as e:
-        print(f"Error loading analytics: {e}")
-        return {"analyses": [], "created_at": datetime.now().isoformat(), "version": "1.0"}
+        print(f"Error rebuilding analytics aggregates: {e}")
+
 
+def _migrate_if_needed(conn: sqlite3.Connection) -> None:
+    """Import the legacy JSON file once, the first time the database is opened."""
+    if conn.execute("SELECT 1 FROM meta WHERE key = 'migrated_from_json'").fetchone():
+        return
+    if conn.execute("SELECT 1 FROM analyses LIMIT 1").fetchone() is None and os.path.exists(ANALYTICS_FILE):
+        migrate_json_to_sqlite(conn=conn)
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from_json', ?)",
+                     (datetime.now().isoformat(),))
 
-def _save_analytics(data: Dict[str, Any]) -> None:
-    """Save analytics data to JSON file."""
+
+def migrate_json_to_sqlite(json_path: Optional[str] = None, conn: Optional[sqlite3.Connection] = None) -> int:
+    """
+    Import analyses from the legacy JSON file into the SQLite database.
+
+    Runs automatically the first time the database is created; the JSON
+    file is left untouched.
+
+    Args:
+        json_path: JSON analytics file (default ANALYTICS_FILE)
+        conn: Open database connection (default: a new connection)
+
+    Returns:
+        Number of analyses imported
+    """
+    json_path = json_path or ANALYTICS_FILE
     try:
-        os.makedirs(os.path.dirname(ANALYTICS_FILE), exist_ok=True)
-        with open(ANALYTICS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
     except Exception as e:
-        print(f"Error saving analytics: {e}")
+        print(f"Error loading analytics: {e}")
+        return 0
+
+    own_conn = conn is None
+    conn = conn or _connect()
+    try:
+        entries = (
+            _normalize_entry(a.get("ats_score", 0), a.get("skill_gaps", []), a.get("keywords", []),
+                             a.get("job_count", 0), timestamp=a.get("timestamp"))
+            for a in data.get("analyses", [])
+        )
+        with conn:
+            count = _insert_analyses(conn, entries, update_aggregates=False)
+            if data.get("created_at"):
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('created_at', ?)",
+                             (data["created_at"],))
+        _rebuild_aggregates(conn)
+        if count:
+            print(f"Migrated {count} analyses from {json_path}")
+        return count
+    except Exception as e:
+        print(f"Error migrating analytics: {e}")
+        return 0
+    finally:
+        if own_conn:
+            conn.close()
 
 
 def save_analysis(ats_score: int, skill_gaps: List[str], keywords: List[str], job_count: int = 0) -> None:
     """
     Save a new analysis to the analytics database.
-    
+
     Args:
         ats_score: ATS score (0-100)
         skill_gaps: List of identified skill gaps
         keywords: List of job keywords
         job_count: Number of jobs recommended
     """
-    data = _load_analytics()
-    
-    analysis_entry = {
-        "timestamp": datetime.now().isoformat(),
-        "ats_score": int(ats_score) if ats_score and str(ats_score).isdigit() else 0,
-        "skill_gaps": skill_gaps[:10],  # Store max 10 gaps
-        "keywords": keywords[:10],  # Store max 10 keywords
-        "job_count": job_count
+    save_analyses([{"ats_score": ats_score, "skill_gaps": skill_gaps, "keywords": keywords, "job_count": job_count}])
+
+
+def save_analyses(analyses: List[Dict[str, Any]]) -> int:
+    """
+    Save several analyses in one transaction (group commit).
+
+    Args:
+        analyses: Dictionaries with ats_score, skill_gaps, keywords, job_count
+                  and optionally timestamp (default: now)
+
+    Returns:
+        Number of analyses saved (0 if the write failed)
+    """
+    try:
+        conn = _connect()
+        try:
+            entries = [
+                _normalize_entry(a.get("ats_score", 0), a.get("skill_gaps", []), a.get("keywords", []),
+                                 a.get("job_count", 0), timestamp=a.get("timestamp"))
+                for a in analyses
+            ]
+            with conn:
+                count = _insert_analyses(conn, entries)
+            now = time.monotonic()
+            last_check = _retention_checked.get(ANALYTICS_DB)
+            if RAW_RETENTION_DAYS > 0 and (last_check is None or now - last_check > RETENTION_CHECK_SECONDS):
+                _retention_checked[ANALYTICS_DB] = now
+                _apply_retention(conn, RAW_RETENTION_DAYS)
+            return count
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"Error saving analytics: {e}")
+        return 0
+
+
+def _apply_retention(conn: sqlite3.Connection, days: int) -> int:
+    """
+    Delete raw analyses from before the day `days` days ago; rollups and totals are untouched.
+
+    With the Space-Saving sketch, interned skills no retained analysis
+    refers to are deleted too (exact counters keep every skill id).
+    """
+    cutoff = (date.today() - timedelta(days=days)).isoformat()
+    with conn:
+        # Gap and keyword rows go with their analyses (ON DELETE CASCADE)
+        deleted = conn.execute("DELETE FROM analyses WHERE timestamp < ?", (cutoff,)).rowcount
+        if deleted and TOP_K_MODE == "space_saving":
+            conn.execute("DELETE FROM skills WHERE id NOT IN (SELECT skill_id FROM analysis_skills)")
+        if deleted:
+            conn.execute("""INSERT INTO meta (key, value) VALUES ('raw_cutoff', ?)
+                            ON CONFLICT(key) DO UPDATE SET value = MAX(value, excluded.value)""", (cutoff,))
+            _bump_revision(conn)
+            _bump_revision(conn, "generation")
+    return deleted
+
+
+def apply_retention(days: Optional[int] = None) -> int:
+    """
+    Delete raw analyses older than the retention window.
+
+    Their hourly/daily rollups are kept, so totals, top gaps/keywords and
+    range statistics still cover them. Runs automatically from
+    save_analysis (at most hourly) when ANALYTICS_RAW_RETENTION_DAYS is set.
+
+    Args:
+        days: Whole days of raw analyses kept besides today (default RAW_RETENTION_DAYS; 0 keeps everything)
+
+    Returns:
+        Number of analyses deleted
+    """
+    days = RAW_RETENTION_DAYS if days is None else days
+    if days <= 0:
+        return 0
+    try:
+        conn = _connect()
+        try:
+            return _apply_retention(conn, days)
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"Error applying analytics retention: {e}")
+        return 0
+
+
+def _read(reader: Callable[..., Any], default: Any, *args) -> Any:
+    """Run a reader function on a fresh connection, returning `default` on database errors."""
+    try:
+        conn = _connect()
+        try:
+            return reader(conn, *args)
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"Error loading analytics: {e}")
+        return default
+
+
+def _read_totals(conn: sqlite3.Connection) -> Tuple[int, float]:
+    """Total analyses and average ATS score (of scored analyses) from the running totals."""
+    row = conn.execute("SELECT analyses, scored, score_sum FROM analytics_totals WHERE id = 1").fetchone()
+    if row is None:
+        return 0, 0.0
+    average = round(row["score_sum"] / row["scored"], 1) if row["scored"] else 0.0
+    return row["analyses"], average
+
+
+def _read_top(conn: sqlite3.Connection, kind: str, n: int) -> List[tuple]:
+    """Top-n (term, count) pairs of a kind ("gap" or "keyword") from its counters or sketch."""
+    return [(term, count) for term, count, _ in _read_top_estimates(conn, kind, n)]
+
+
+def _read_top_estimates(conn: sqlite3.Connection, kind: str, n: int) -> List[tuple]:
+    """Top-n (term, count, error) triples; the error is always 0 for exact counters."""
+    if TOP_K_MODE == "space_saving":
+        rows = conn.execute("""SELECT term, count, error FROM term_sketch WHERE kind = ?
+                               ORDER BY count DESC, first_seen LIMIT ?""", (kind, n))
+        return [(row["term"], row["count"], row["error"]) for row in rows]
+    return [(term, count, 0) for term, count in conn.execute(_TOP_QUERIES[kind], (n,))]
+
+
+def score_ranges(score_counts: Iterable[Tuple[int, int]]) -> Dict[str, int]:
+    """Bucket (score, count) pairs into the dashboard's ATS score ranges."""
+    distribution = {
+        "0-40": 0,
+        "41-60": 0,
+        "61-80": 0,
+        "81-100": 0
     }
-    
-    data["analyses"].append(analysis_entry)
-    _save_analytics(data)
+
+    for score, count in score_counts:
+        if 0 <= score <= 40:
+            distribution["0-40"] += count
+        elif 41 <= score <= 60:
+            distribution["41-60"] += count
+        elif 61 <= score <= 80:
+            distribution["61-80"] += count
+        elif 81 <= score <= 100:
+            distribution["81-100"] += count
+
+    return distribution
+
+
+def score_percentiles(score_counts: Iterable[Tuple[int, int]],
+                      q: Sequence[float] = (25, 50, 75, 90)) -> Dict[float, float]:
+    """
+    ATS score percentiles of scored analyses from (score, count) pairs.
+
+    Scores are integers 0-100, so the histogram is an exact summary: the
+    results equal linearly interpolated percentiles over the raw scores.
+    """
+    scored = sorted((score, count) for score, count in score_counts if score > 0 and count > 0)
+    total = sum(count for _, count in scored)
+    if not total:
+        return {p: 0.0 for p in q}
+
+    def value_at(rank: int) -> int:
+        seen = 0
+        for score, count in scored:
+            seen += count
+            if rank < seen:
+                return score
+        return scored[-1][0]
+
+    result = {}
+    for p in q:
+        position = p / 100 * (total - 1)
+        lower = int(position)
+        low_value, high_value = value_at(lower), value_at(min(lower + 1, total - 1))
+        result[p] = round(low_value + (high_value - low_value) * (position - lower), 1)
+    return result
+
+
+def rollup_trend(days: Iterable[Sequence[Any]], period: str = "day") -> List[Dict[str, Any]]:
+    """
+    Per-day or per-week series from daily rollup rows.
+
+    Args:
+        days: [day, count, scored, score_sum, job_count] rows
+        period: "day" or "week" (weeks start on Monday)
+
+    Returns:
+        List of {"period", "count", "average_ats", "job_count"}, oldest first
+    """
+    if period not in ("day", "week"):
+        raise ValueError(f"Unknown trend period: {period}")
+    buckets: Dict[str, List[int]] = {}
+    for day, count, scored, score_sum, job_count in days:
+        if period == "week":
+            start = date.fromisoformat(day)
+            day = (start - timedelta(days=start.weekday())).isoformat()
+        buckets[day] = [a + b for a, b in zip(buckets.get(day, [0, 0, 0, 0]), (count, scored, score_sum, job_count))]
+    return [
+        {"period": label, "count": count, "average_ats": round(score_sum / scored, 1) if scored else 0.0,
+         "job_count": job_count}
+        for label, (count, scored, score_sum, job_count) in sorted(buckets.items())
+    ]
+
+
+def _read_score_distribution(conn: sqlite3.Connection) -> Dict[str, int]:
+    """ATS score range counts from the per-score counters."""
+    return score_ranges(conn.execute("SELECT ats_score, count FROM score_counts"))
+
+
+def _read_revision(conn: sqlite3.Connection) -> int:
+    """Counter bumped by every write to the analytics data."""
+    row = conn.execute("SELECT value FROM meta WHERE key = 'revision'").fetchone()
+    return int(row[0]) if row else 0
+
+
+def _bump_revision(conn: sqlite3.Connection, counter: str = "revision") -> None:
+    """Mark the analytics data as changed. Caller manages the transaction."""
+    conn.execute("""INSERT INTO meta (key, value) VALUES (?, '1')
+                    ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1""", (counter,))
+
+
+def _read_data_version(conn: sqlite3.Connection) -> Tuple[int, int]:
+    """Revision and generation counters from the meta table."""
+    rows = dict(conn.execute("SELECT key, value FROM meta WHERE key IN ('revision', 'generation')").fetchall())
+    return int(rows.get("revision", 0)), int(rows.get("generation", 0))
+
+
+def get_data_version() -> Tuple[int, int]:
+    """
+    Get the change counters of the analytics data.
+
+    Returns:
+        Tuple of (revision, bumped by every write; generation, bumped
+        whenever analyses are deleted)
+    """
+    return _read(_read_data_version, (0, 0))
+
+
+def get_raw_cutoff() -> Optional[str]:
+    """
+    Get the day before which raw analyses were deleted by retention.
+
+    Returns:
+        ISO date, or None while every analysis is still stored raw
+    """
+    row = _read(lambda conn: conn.execute("SELECT value FROM meta WHERE key = 'raw_cutoff'").fetchone(), None)
+    return row[0] if row else None
+
+
+def _read_rollup_history(conn: sqlite3.Connection, start: Optional[datetime],
+                         end: Optional[datetime]) -> Dict[str, List[list]]:
+    """Daily rollup rows and per-score counts of the days in the range, in one read transaction."""
+    where, params = _range_filter("bucket", _floor(start, "day") if start else None,
+                                  _floor(end, "day") if end else None, ROLLUP_GRANULARITIES["day"])
+    conn.execute("BEGIN")
+    try:
+        days = conn.execute(f"""SELECT bucket, count, scored, score_sum, job_count FROM rollups
+                                WHERE granularity = 'day' AND {where} ORDER BY bucket""", params)
+        if start is None and end is None:
+            scores = conn.execute("SELECT ats_score, count FROM score_counts ORDER BY ats_score")
+        else:
+            scores = conn.execute(f"""SELECT ats_score, SUM(count) FROM rollup_scores
+                                      WHERE granularity = 'day' AND {where}
+                                      GROUP BY ats_score ORDER BY ats_score""", params)
+        return {"days": [list(row) for row in days], "scores": [list(row) for row in scores]}
+    finally:
+        conn.rollback()
+
+
+def get_rollup_history(start: Any = None, end: Any = None) -> Dict[str, List[list]]:
+    """
+    Get the daily rollups and ATS score counts of the days in [start, end).
+
+    Rollups outlive raw retention, so this covers expired history too;
+    `start` and `end` are rounded down to whole days.
+
+    Returns:
+        Dictionary with days ([day, count, scored, score_sum, job_count]
+        rows, oldest first) and scores ([score, count] pairs)
+    """
+    return _read(_read_rollup_history, {"days": [], "scores": []}, _to_datetime(start), _to_datetime(end))
+
+
+def get_analysis_columns_since(after_id: int = 0) -> Tuple[List[int], List[str], List[int], List[int]]:
+    """
+    Read the numeric columns of analyses newer than `after_id`, for columnar loading.
+
+    Returns:
+        Tuple of (ids, timestamps, ATS scores, job counts) lists in id order
+    """
+    def read(conn: sqlite3.Connection):
+        rows = conn.execute("SELECT id, timestamp, ats_score, job_count FROM analyses WHERE id > ? ORDER BY id",
+                            (after_id,)).fetchall()
+        return tuple(map(list, zip(*rows))) if rows else ([], [], [], [])
+
+    return _read(read, ([], [], [], []))
+
+
+def iter_analysis_batches(after_id: int = 0, since: Any = None,
+                          batch_size: int = 50000) -> Iterator[Dict[str, List[Any]]]:
+    """
+    Stream stored analyses in id order as column batches, e.g. for exports.
+
+    Each batch is read by its own short query, so memory is bounded by
+    `batch_size` and concurrent saves are never blocked for long. Database
+    errors are raised rather than cut the stream short.
+
+    Args:
+        after_id: Only analyses with a larger id (ids grow in commit order, so
+                  the last id of one export makes the next one incremental)
+        since: Only analyses with a later timestamp (datetime, date or ISO string)
+        batch_size: Analyses per batch
+
+    Yields:
+        Dictionaries of equal-length lists: ids, timestamps, ats_scores,
+        job_counts, skill_gaps (canonical names) and keywords
+    """
+    since = _to_datetime(since)
+    conn = _connect()
+    try:
+        skills: Dict[int, str] = {}
+        while True:
+            query = "SELECT id, timestamp, ats_score, job_count, gap_ids, keywords FROM analyses WHERE id > ?"
+            params: List[Any] = [after_id]
+            if since is not None:
+                query += " AND timestamp > ?"
+                params.append(since.isoformat())
+            rows = conn.execute(query + " ORDER BY id LIMIT ?", params + [batch_size]).fetchall()
+            if not rows:
+                return
+
+            gap_ids = [_unpack_ids(row["gap_ids"]) for row in rows]
+            if any(skill_id not in skills for ids in gap_ids for skill_id in ids):
+                skills = dict(conn.execute("SELECT id, name FROM skills").fetchall())
+            yield {
+                "ids": [row["id"] for row in rows],
+                "timestamps": [row["timestamp"] for row in rows],
+                "ats_scores": [row["ats_score"] for row in rows],
+                "job_counts": [row["job_count"] for row in rows],
+                "skill_gaps": [[skills[skill_id] for skill_id in ids] for ids in gap_ids],
+                "keywords": [json.loads(row["keywords"]) for row in rows]
+            }
+            after_id = rows[-1]["id"]
+    finally:
+        conn.close()
 
 
 def get_total_count() -> int:
     """Get total number of resumes analyzed."""
-    data = _load_analytics()
-    return len(data.get("analyses", []))
+    return _read(_read_totals, (0, 0.0))[0]
 
 
 def get_average_ats() -> float:
     """Get average ATS score across all analyses."""
-    data = _load_analytics()
-    analyses = data.get("analyses", [])
-    
-    if not analyses:
-        return 0.0
-    
-    scores = [a["ats_score"] for a in analyses if a.get("ats_score", 0) > 0]
-    return round(sum(scores) / len(scores), 1) if scores else 0.0
+    return _read(_read_totals, (0, 0.0))[1]
 
 
 def get_top_skill_gaps(n: int = 5) -> List[tuple]:
     """
     Get most common skill gaps.
-    
+
     Args:
         n: Number of top gaps to return
-        
+
     Returns:
         List of tuples (skill_name, count)
     """
-    data = _load_analytics()
-    analyses = data.get("analyses", [])
-    
-    gap_counts = {}
-    for analysis in analyses:
-        for gap in analysis.get("skill_gaps", []):
-            gap_lower = gap.lower().strip()
-            if gap_lower:
-                gap_counts[gap_lower] = gap_counts.get(gap_lower, 0) + 1
-    
-    sorted_gaps = sorted(gap_counts.items(), key=lambda x: x[1], reverse=True)
-    return sorted_gaps[:n]
+    return _read(_read_top, [], "gap", n)
 
 
 def get_top_keywords(n: int = 10) -> List[tuple]:
     """
     Get most frequent job keywords.
-    
+
     Args:
         n: Number of top keywords to return
-        
+
     Returns:
         List of tuples (keyword, count)
     """
-    data = _load_analytics()
-    analyses = data.get("analyses", [])
-    
-    keyword_counts = {}
-    for analysis in analyses:
-        for keyword in analysis.get("keywords", []):
-            keyword_lower = keyword.lower().strip()
-            if keyword_lower:
-                keyword_counts[keyword_lower] = keyword_counts.get(keyword_lower, 0) + 1
-    
-    sorted_keywords = sorted(keyword_counts.items(), key=lambda x: x[1], reverse=True)
-    return sorted_keywords[:n]
+    return _read(_read_top, [], "keyword", n)
+
+
+def get_top_estimates(kind: str = "gap", n: int = 10) -> List[tuple]:
+    """
+    Get top skill gaps or keywords with their error bounds.
+
+    With ANALYTICS_TOP_K=space_saving counts come from a sketch holding at
+    most ANALYTICS_TOP_K_CAPACITY terms: each count overestimates the true
+    count by at most its error (true count lies in [count - error, count]),
+    and any error is at most total terms counted / capacity. In exact mode
+    every error is 0.
+
+    Args:
+        kind: "gap" or "keyword"
+        n: Number of terms to return
+
+    Returns:
+        List of tuples (term, count, error)
+    """
+    return _read(_read_top_estimates, [], kind, n)
 
 
 def get_score_distribution() -> Dict[str, int]:
     """
     Get distribution of ATS scores across ranges.
-    
+
     Returns:
         Dictionary with score ranges and counts
     """
-    data = _load_analytics()
-    analyses = data.get("analyses", [])
-    
-    distribution = {
-        "0-40": 0,
-        "41-60": 0,
-        "61-80": 0,
-        "81-100": 0
+    return _read(_read_score_distribution, {"0-40": 0, "41-60": 0, "61-80": 0, "81-100": 0})
+
+
+def _to_datetime(value: Any) -> Optional[datetime]:
+    """Convert a datetime, date or ISO string to a naive datetime (as stored)."""
+    if value is None or isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time())
+    return datetime.fromisoformat(value)
+
+
+def _ceil(value: datetime, granularity: str) -> datetime:
+    """Round a time up to the next hour or day boundary."""
+    floor = _floor(value, granularity)
+    if floor == value:
+        return value
+    return floor + (timedelta(hours=1) if granularity == "hour" else timedelta(days=1))
+
+
+def _floor(value: datetime, granularity: str) -> datetime:
+    """Round a time down to an hour or day boundary."""
+    if granularity == "hour":
+        return value.replace(minute=0, second=0, microsecond=0)
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _plan_range(start: Optional[datetime], end: Optional[datetime]) -> List[Tuple[str, Optional[datetime],
+                                                                               Optional[datetime]]]:
+    """
+    Split [start, end) into segments answered by the coarsest source:
+    whole days from daily rollups, remaining whole hours from hourly
+    rollups and sub-hour edges from the raw analyses.
+
+    Returns:
+        List of (source "day" | "hour" | "raw", segment start, segment end); None is unbounded
+    """
+    hour_lo = _ceil(start, "hour") if start else None
+    hour_hi = _floor(end, "hour") if end else None
+    day_lo = _ceil(start, "day") if start else None
+    day_hi = _floor(end, "day") if end else None
+
+    if day_lo is None or day_hi is None or day_lo < day_hi:
+        segments = [("raw", start, hour_lo), ("hour", hour_lo, day_lo), ("day", day_lo, day_hi),
+                    ("hour", day_hi, hour_hi), ("raw", hour_hi, end)]
+    elif hour_lo < hour_hi:
+        segments = [("raw", start, hour_lo), ("hour", hour_lo, hour_hi), ("raw", hour_hi, end)]
+    else:
+        return [("raw", start, end)] if start < end else []
+    # Edge segments are empty when the range is unbounded or already aligned on that side
+    return [(source, lo, hi) for source, lo, hi in segments
+            if source == "day" or (lo is not None and hi is not None and lo < hi)]
+
+
+def _range_filter(column: str, lo: Optional[datetime], hi: Optional[datetime],
+                  length: Optional[int] = None) -> Tuple[str, List[str]]:
+    """SQL condition for lo <= column < hi, comparing bucket prefixes when `length` is given."""
+    conditions, params = ["1"], []
+    for bound, operator in ((lo, ">="), (hi, "<")):
+        if bound is not None:
+            conditions.append(f"{column} {operator} ?")
+            params.append(bound.isoformat()[:length] if length else bound.isoformat())
+    return " AND ".join(conditions), params
+
+
+def _read_range_stats(conn: sqlite3.Connection, start: Optional[datetime], end: Optional[datetime],
+                      top_n: int) -> Dict[str, Any]:
+    """Combine rollup and raw statistics for every segment of the range plan."""
+    plan = _plan_range(start, end)
+    totals = {"count": 0, "scored": 0, "score_sum": 0, "job_count": 0}
+    scores: Dict[int, int] = {}
+    terms: Dict[str, Dict[str, List[int]]] = {"gap": {}, "keyword": {}}
+
+    conn.execute("BEGIN")
+    try:
+        for source, lo, hi in plan:
+            if source == "raw":
+                where, params = _range_filter("timestamp", lo, hi)
+                rows = conn.execute(f"""SELECT COUNT(*), SUM(ats_score > 0),
+                                               SUM(CASE WHEN ats_score > 0 THEN ats_score ELSE 0 END), SUM(job_count)
+                                        FROM analyses WHERE {where}""", params).fetchone()
+                score_rows = conn.execute(f"SELECT ats_score, COUNT(*) FROM analyses WHERE {where} GROUP BY ats_score",
+                                          params)
+                joined_where, _ = _range_filter("a.timestamp", lo, hi)
+                term_rows = [
+                    (kind, row[0], row[1], row[2])
+                    for kind, source in _TERM_SOURCES.items()
+                    for row in conn.execute(f"""SELECT t.term, COUNT(*), MIN(a.id)
+                                                FROM ({source}) t JOIN analyses a ON a.id = t.analysis_id
+                                                WHERE {joined_where} GROUP BY t.term""", params)
+                ]
+            else:
+                where, params = _range_filter("bucket", lo, hi, ROLLUP_GRANULARITIES[source])
+                where, params = f"granularity = ? AND {where}", [source] + params
+                rows = conn.execute(f"SELECT SUM(count), SUM(scored), SUM(score_sum), SUM(job_count) FROM rollups "
+                                    f"WHERE {where}", params).fetchone()
+                score_rows = conn.execute(f"SELECT ats_score, SUM(count) FROM rollup_scores WHERE {where} "
+                                          f"GROUP BY ats_score", params)
+                term_rows = conn.execute(f"SELECT kind, term, SUM(count), MIN(first_id) FROM rollup_terms "
+                                         f"WHERE {where} GROUP BY kind, term", params).fetchall()
+
+            for name, value in zip(("count", "scored", "score_sum", "job_count"), rows):
+                totals[name] += value or 0
+            for score, count in score_rows:
+                scores[score] = scores.get(score, 0) + count
+            for kind, term, count, first_id in term_rows:
+                counter = terms[kind].setdefault(term, [0, first_id])
+                counter[0] += count
+                counter[1] = min(counter[1], first_id)
+    finally:
+        conn.rollback()
+
+    def top(kind: str) -> List[tuple]:
+        ranked = sorted(terms[kind].items(), key=lambda item: (-item[1][0], item[1][1]))
+        return [(term, count) for term, (count, _) in ranked[:top_n]]
+
+    return {
+        "count": totals["count"],
+        "average_ats": round(totals["score_sum"] / totals["scored"], 1) if totals["scored"] else 0.0,
+        "job_count": totals["job_count"],
+        "score_distribution": score_ranges(sorted(scores.items())),
+        "top_skill_gaps": top("gap"),
+        "top_keywords": top("keyword"),
+        "plan": [(source, lo.isoformat() if lo else None, hi.isoformat() if hi else None)
+                 for source, lo, hi in plan]
     }
-    
-    for analysis in analyses:
-        score = analysis.get("ats_score", 0)
-        if 0 <= score <= 40:
-            distribution["0-40"] += 1
-        elif 41 <= score <= 60:
-            distribution["41-60"] += 1
-        elif 61 <= score <= 80:
-            distribution["61-80"] += 1
-        elif 81 <= score <= 100:
-            distribution["81-100"] += 1
-    
-    return distribution
+
+
+def get_range_stats(start: Any = None, end: Any = None, top_n: int = 10) -> Dict[str, Any]:
+    """
+    Get analytics for analyses saved in [start, end).
+
+    Whole days are read from the daily rollups and whole hours from the
+    hourly rollups, so the cost grows with the length of the range rather
+    than the number of analyses in it; only sub-hour edges touch raw rows.
+    Edges older than the raw retention window count as empty.
+
+    Args:
+        start: Range start (datetime, date or ISO string; None for the beginning)
+        end: Range end, exclusive (None for now)
+        top_n: Number of top skill gaps and keywords returned
+
+    Returns:
+        Dictionary with count, average_ats, job_count, score_distribution,
+        top_skill_gaps, top_keywords and the plan of (source, start, end) segments read
+    """
+    empty = {"count": 0, "average_ats": 0.0, "job_count": 0,
+             "score_distribution": score_ranges([]), "top_skill_gaps": [], "top_keywords": [], "plan": []}
+    return _read(_read_range_stats, empty, _to_datetime(start), _to_datetime(end), top_n)
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    """Every metric shown on the Analytics page, read at one point in time."""
+    total_count: int
+    average_ats: float
+    top_skill_gaps: List[tuple]
+    top_keywords: List[tuple]
+    score_distribution: Dict[str, int]
+    revision: int
+
+
+_snapshot_cache: Dict[tuple, DashboardSnapshot] = {}
+_snapshot_lock = threading.Lock()
+
+
+def _read_snapshot(conn: sqlite3.Connection, top_gaps: int, top_keywords: int) -> DashboardSnapshot:
+    """Read every dashboard metric inside one read transaction."""
+    conn.execute("BEGIN")
+    try:
+        revision = _read_revision(conn)
+        key = (ANALYTICS_DB, top_gaps, top_keywords)
+        with _snapshot_lock:
+            cached = _snapshot_cache.get(key)
+        if cached is not None and cached.revision == revision:
+            return cached
+
+        total_count, average_ats = _read_totals(conn)
+        snapshot = DashboardSnapshot(
+            total_count=total_count,
+            average_ats=average_ats,
+            top_skill_gaps=_read_top(conn, "gap", top_gaps),
+            top_keywords=_read_top(conn, "keyword", top_keywords),
+            score_distribution=_read_score_distribution(conn),
+            revision=revision
+        )
+        with _snapshot_lock:
+            _snapshot_cache[key] = snapshot
+        return snapshot
+    finally:
+        conn.rollback()
+
+
+def get_dashboard_snapshot(top_gaps: int = 5, top_keywords: int = 10) -> DashboardSnapshot:
+    """
+    Get every Analytics page metric in one consistent read.
+
+    Snapshots are cached per data revision: while nothing has been saved
+    or cleared, repeated calls cost one small query.
+
+    Args:
+        top_gaps: Number of top skill gaps included
+        top_keywords: Number of top keywords included
+
+    Returns:
+        DashboardSnapshot
+    """
+    empty = DashboardSnapshot(0, 0.0, [], [], {"0-40": 0, "41-60": 0, "61-80": 0, "81-100": 0}, 0)
+    return _read(_read_snapshot, empty, top_gaps, top_keywords)
+
+
+def _read_term_summary(conn: sqlite3.Connection, kind: str, top_k: int) -> Dict[str, Any]:
+    """Top-k (term, count, error) list plus `floor`, an upper bound on the count of any unlisted term."""
+    rows = _read_top_estimates(conn, kind, top_k + 1)
+    floor = rows[top_k][1] if len(rows) > top_k else 0
+    if TOP_K_MODE == "space_saving":
+        size, smallest = conn.execute("SELECT COUNT(*), MIN(count) FROM term_sketch WHERE kind = ?",
+                                      (kind,)).fetchone()
+        if size >= TOP_K_CAPACITY:
+            # A term the full sketch does not hold was counted at most as often as its smallest entry
+            floor = max(floor, smallest)
+    return {"terms": [list(row) for row in rows[:top_k]], "floor": floor}
+
+
+def _read_mergeable_summary(conn: sqlite3.Connection, top_k: int) -> Dict[str, Any]:
+    """Read every mergeable aggregate inside one read transaction."""
+    conn.execute("BEGIN")
+    try:
+        revision, generation = _read_data_version(conn)
+        totals = conn.execute("SELECT analyses, scored, score_sum FROM analytics_totals WHERE id = 1").fetchone()
+        days = conn.execute("""SELECT bucket, count, scored, score_sum, job_count FROM rollups
+                               WHERE granularity = 'day' ORDER BY bucket""").fetchall()
+        return {
+            "revision": revision,
+            "generation": generation,
+            "totals": {
+                "count": totals["analyses"] if totals else 0,
+                "scored": totals["scored"] if totals else 0,
+                "score_sum": totals["score_sum"] if totals else 0,
+                "job_count": sum(row["job_count"] for row in days)
+            },
+            "scores": [list(row) for row in conn.execute("SELECT ats_score, count FROM score_counts "
+                                                          "ORDER BY ats_score")],
+            "days": [list(row) for row in days],
+            "top": {kind: _read_term_summary(conn, kind, top_k) for kind in ("gap", "keyword")}
+        }
+    finally:
+        conn.rollback()
+
+
+def get_mergeable_summary(top_k: int = 200) -> Dict[str, Any]:
+    """
+    Get the analytics as summaries that can be added up across databases.
+
+    Used for multi-node deployments (see src/analytics_shards.py): no raw
+    analyses are included, only counters.
+
+    Args:
+        top_k: Number of top skill gaps and keywords included
+
+    Returns:
+        Dictionary with revision, generation, totals (count, scored,
+        score_sum, job_count), scores ([score, count] pairs), days
+        ([day, count, scored, score_sum, job_count] rows) and top
+        ({"gap"/"keyword": {"terms": [[term, count, error]], "floor"}})
+    """
+    empty = {"revision": 0, "generation": 0, "totals": {"count": 0, "scored": 0, "score_sum": 0, "job_count": 0},
+             "scores": [], "days": [], "top": {kind: {"terms": [], "floor": 0} for kind in ("gap", "keyword")}}
+    return _read(_read_mergeable_summary, empty, top_k)
 
 
 def get_all_analyses() -> List[Dict[str, Any]]:
-    """Get all analyses (for advanced features)."""
-    data = _load_analytics()
-    return data.get("analyses", [])
+    """
+    Get all analyses (for advanced features).
+
+    Each analysis has its raw skill_gaps text and the canonical skills they
+    were counted as; analyses whose raw text was not kept report the
+    canonical skills as skill_gaps.
+    """
+    def read(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+        skills = dict(conn.execute("SELECT id, name FROM skills").fetchall())
+        rows = conn.execute("""SELECT timestamp, ats_score, skill_gaps, gap_ids, keywords, job_count
+                               FROM analyses ORDER BY id""")
+        analyses = []
+        for row in rows:
+            names = [skills[skill_id] for skill_id in _unpack_ids(row["gap_ids"])]
+            analyses.append({
+                "timestamp": row["timestamp"],
+                "ats_score": row["ats_score"],
+                "skill_gaps": json.loads(row["skill_gaps"]) or names,
+                "skills": names,
+                "keywords": json.loads(row["keywords"]),
+                "job_count": row["job_count"]
+            })
+        return analyses
+
+    return _read(read, [])
 
 
 def clear_analytics() -> None:
     """Clear all analytics data (admin function)."""
-    data = {
-        "analyses": [],
-        "created_at": datetime.now().isoformat(),
-        "version": "1.0"
-    }
-    _save_analytics(data)
+    try:
+        conn = _connect()
+        with conn:
+            conn.execute("DELETE FROM analysis_skills")
+            conn.execute("DELETE FROM analysis_keywords")
+            conn.execute("DELETE FROM analyses")
+            for table in ("analytics_totals", "score_counts", "skill_counts", "keyword_counts", "term_sketch",
+                          "rollups", "rollup_scores", "rollup_terms"):
+                conn.execute(f"DELETE FROM {table}")
+            conn.execute("DELETE FROM meta WHERE key = 'raw_cutoff'")
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('created_at', ?)",
+                         (datetime.now().isoformat(),))
+            _bump_revision(conn)
+            _bump_revision(conn, "generation")
+        conn.close()
+    except Exception as e:
+        print(f"Error clearing analytics: {e}")
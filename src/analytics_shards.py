@@ -0,0 +1,268 @@
+import argparse
+import json
+import os
+import socket
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+
+from src import analytics_manager
+from src.analytics_manager import DashboardSnapshot, rollup_trend, score_percentiles, score_ranges
+
+load_dotenv()
+
+
+# Directory shared by all nodes (e.g. a network mount); each node writes <node id>.json there
+SHARD_DIR = os.getenv(
+    "ANALYTICS_SHARD_DIR", os.path.join(os.path.dirname(__file__), "..", "data", "analytics_shards")
+)
+NODE_ID = os.getenv("ANALYTICS_NODE_ID") or socket.gethostname()
+SHARD_TOP_K = int(os.getenv("ANALYTICS_SHARD_TOP_K", 200))
+SHARD_INTERVAL = int(os.getenv("ANALYTICS_SHARD_INTERVAL", 0))  # seconds between exports; 0 disables
+SHARD_VERSION = 1
+
+_cache_lock = threading.Lock()
+_merged_cache: Dict[str, Tuple[tuple, Dict[str, Any]]] = {}
+_exporter: Optional[threading.Thread] = None
+
+
+def build_shard(top_k: int = SHARD_TOP_K) -> Dict[str, Any]:
+    """
+    Summarize the local analytics database as a shard.
+
+    A shard holds counters only (totals, per-score histogram, daily rollups
+    and top-k term summaries), so it stays small however many analyses the
+    node has and shards of any number of nodes can be merged.
+
+    Returns:
+        Shard dictionary (see merge_shards())
+    """
+    built_at = datetime.now().isoformat()
+    return {"version": SHARD_VERSION, "nodes": {NODE_ID: built_at}, "built_at": built_at,
+            **analytics_manager.get_mergeable_summary(top_k)}
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def write_shard(directory: str = SHARD_DIR, top_k: int = SHARD_TOP_K) -> str:
+    """
+    Write this node's shard to the shared shard directory (atomically).
+
+    Returns:
+        Path of the shard file
+    """
+    path = os.path.join(directory, f"{NODE_ID}.json")
+    _write_json(path, build_shard(top_k))
+    return path
+
+
+def _shard_paths(directory: str) -> List[str]:
+    if not os.path.isdir(directory):
+        return []
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".json"))
+
+
+def load_shards(paths: Optional[Sequence[str]] = None, directory: str = SHARD_DIR) -> List[Dict[str, Any]]:
+    """Load shard files (default: every shard in the shard directory); unreadable files are skipped."""
+    shards = []
+    for path in paths if paths is not None else _shard_paths(directory):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                shard = json.load(f)
+            if shard.get("version") != SHARD_VERSION:
+                print(f"Skipping analytics shard {path}: unsupported version {shard.get('version')}")
+                continue
+            shards.append(shard)
+        except Exception as e:
+            print(f"Error loading analytics shard {path}: {e}")
+    return shards
+
+
+def _merge_terms(summaries: List[Dict[str, Any]], top_k: int) -> Dict[str, Any]:
+    """
+    Merge top-k term summaries.
+
+    A term missing from a summary may still have been counted there up to
+    that summary's floor, so the floor is added to both its count and its
+    error; (count - error, count) stays a valid bound after merging.
+    """
+    listed = [{term: (count, error) for term, count, error in summary["terms"]} for summary in summaries]
+    merged = []
+    for term in set().union(*listed) if listed else ():
+        count = error = 0
+        for summary, terms in zip(summaries, listed):
+            term_count, term_error = terms.get(term, (summary["floor"], summary["floor"]))
+            count += term_count
+            error += term_error
+        merged.append([term, count, error])
+    merged.sort(key=lambda item: (-item[1], item[2], item[0]))
+
+    floor = sum(summary["floor"] for summary in summaries)
+    if len(merged) > top_k:
+        floor = max(floor, merged[top_k][1])
+    return {"terms": merged[:top_k], "floor": floor}
+
+
+def merge_shards(shards: Sequence[Dict[str, Any]], top_k: int = SHARD_TOP_K) -> Dict[str, Any]:
+    """
+    Combine shards into one global shard.
+
+    Counters and histograms are added up and top-k summaries merged with
+    error bounds; the result is itself a shard, so merged views can be
+    merged again. When shards cover the same node (e.g. an old merged file
+    and a fresh node shard) only the most recently built one is used.
+
+    Args:
+        shards: Shards from build_shard(), load_shards() or earlier merges
+        top_k: Number of top skill gaps and keywords kept
+
+    Returns:
+        Shard dictionary with version, nodes ({node id: built_at}), built_at,
+        totals, scores, days and top
+    """
+    used, nodes = [], {}
+    for shard in sorted(shards, key=lambda s: s.get("built_at", ""), reverse=True):
+        if nodes.keys() & shard["nodes"].keys():
+            print(f"Skipping analytics shard for {', '.join(sorted(shard['nodes']))}: nodes already merged")
+            continue
+        used.append(shard)
+        nodes.update(shard["nodes"])
+
+    totals = {"count": 0, "scored": 0, "score_sum": 0, "job_count": 0}
+    scores: Dict[int, int] = {}
+    days: Dict[str, List[int]] = {}
+    for shard in used:
+        for name in totals:
+            totals[name] += shard["totals"][name]
+        for score, count in shard["scores"]:
+            scores[score] = scores.get(score, 0) + count
+        for day, *values in shard["days"]:
+            days[day] = [a + b for a, b in zip(days.get(day, [0] * len(values)), values)]
+
+    return {
+        "version": SHARD_VERSION,
+        "nodes": nodes,
+        "built_at": max(nodes.values()) if nodes else datetime.now().isoformat(),
+        "totals": totals,
+        "scores": sorted([score, count] for score, count in scores.items()),
+        "days": [[day] + values for day, values in sorted(days.items())],
+        "top": {kind: _merge_terms([shard["top"][kind] for shard in used], top_k) for kind in ("gap", "keyword")}
+    }
+
+
+def shard_snapshot(shard: Dict[str, Any], top_gaps: int = 5, top_keywords: int = 10) -> DashboardSnapshot:
+    """Dashboard metrics of a (merged) shard, in the same shape as get_dashboard_snapshot()."""
+    totals = shard["totals"]
+    return DashboardSnapshot(
+        total_count=totals["count"],
+        average_ats=round(totals["score_sum"] / totals["scored"], 1) if totals["scored"] else 0.0,
+        top_skill_gaps=[(term, count) for term, count, _ in shard["top"]["gap"]["terms"][:top_gaps]],
+        top_keywords=[(term, count) for term, count, _ in shard["top"]["keyword"]["terms"][:top_keywords]],
+        score_distribution=score_ranges(shard["scores"]),
+        revision=0
+    )
+
+
+def shard_percentiles(shard: Dict[str, Any], q: Sequence[float] = (25, 50, 75, 90)) -> Dict[float, float]:
+    """ATS score percentiles of scored analyses from a shard's per-score histogram (see score_percentiles())."""
+    return score_percentiles(shard["scores"], q)
+
+
+def shard_trend(shard: Dict[str, Any], period: str = "day") -> List[Dict[str, Any]]:
+    """Per-day or per-week series from a shard's daily rollups (same shape as get_trend())."""
+    return rollup_trend(shard["days"], period)
+
+
+def get_merged_view(directory: str = SHARD_DIR, top_k: int = SHARD_TOP_K) -> Dict[str, Any]:
+    """
+    Get the global analytics of every node with a shard in the shard directory.
+
+    This node's shard is rewritten first if its data changed since it was
+    last written, and the merge is cached until any shard file changes.
+
+    Returns:
+        Merged shard (see merge_shards())
+    """
+    with _cache_lock:
+        local_path = os.path.join(directory, f"{NODE_ID}.json")
+        revision, generation = analytics_manager.get_data_version()
+        local = load_shards([local_path]) if os.path.exists(local_path) else []
+        if not local or (local[0].get("revision"), local[0].get("generation")) != (revision, generation):
+            try:
+                write_shard(directory, top_k)
+            except Exception as e:
+                print(f"Error writing analytics shard: {e}")
+
+        paths = _shard_paths(directory)
+        key = tuple((path, os.path.getmtime(path)) for path in paths) + (top_k,)
+        cached = _merged_cache.get(directory)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        merged = merge_shards(load_shards(paths), top_k)
+        _merged_cache[directory] = (key, merged)
+        return merged
+
+
+def count_shards(directory: str = SHARD_DIR) -> int:
+    """Number of shard files in the shard directory."""
+    return len(_shard_paths(directory))
+
+
+def run_exporter(interval: int = SHARD_INTERVAL, directory: str = SHARD_DIR) -> None:
+    """Rewrite this node's shard every `interval` seconds when its data changed."""
+    written = None
+    while True:
+        try:
+            version = analytics_manager.get_data_version()
+            if version != written:
+                write_shard(directory)
+                written = version
+        except Exception as e:
+            print(f"Error writing analytics shard: {e}")
+        time.sleep(interval)
+
+
+def start_background_exporter(interval: int = SHARD_INTERVAL,
+                              directory: str = SHARD_DIR) -> Optional[threading.Thread]:
+    """Start run_exporter() in a daemon thread once per process (no-op when interval is 0)."""
+    global _exporter
+    with _cache_lock:
+        if interval <= 0 or (_exporter is not None and _exporter.is_alive()):
+            return _exporter
+        _exporter = threading.Thread(target=run_exporter, args=(interval, directory), daemon=True)
+        _exporter.start()
+        return _exporter
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export and merge analytics shards of several nodes.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="write this node's shard")
+    export_parser.add_argument("--dir", default=SHARD_DIR, help="shard directory")
+    merge_parser = subparsers.add_parser("merge", help="merge shards into a global view")
+    merge_parser.add_argument("shards", nargs="*", help="shard files (default: every shard in --dir)")
+    merge_parser.add_argument("--dir", default=SHARD_DIR, help="shard directory")
+    merge_parser.add_argument("--output", help="write the merged shard to this file")
+    merge_parser.add_argument("--top-k", type=int, default=SHARD_TOP_K)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        print(write_shard(args.dir))
+    else:
+        merged = merge_shards(load_shards(args.shards or None, args.dir), args.top_k)
+        if args.output:
+            _write_json(args.output, merged)
+        snapshot = shard_snapshot(merged)
+        print(json.dumps({"nodes": sorted(merged["nodes"]), "total_count": snapshot.total_count,
+                          "average_ats": snapshot.average_ats, "percentiles": shard_percentiles(merged),
+                          "top_skill_gaps": snapshot.top_skill_gaps, "top_keywords": snapshot.top_keywords},
+                         indent=2, ensure_ascii=False))
@@ -0,0 +1,139 @@
+import atexit
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from src.analytics_manager import save_analyses
+
+load_dotenv()
+
+
+ANALYTICS_FLUSH_SIZE = int(os.getenv("ANALYTICS_FLUSH_SIZE", 50))
+ANALYTICS_FLUSH_MS = int(os.getenv("ANALYTICS_FLUSH_MS", 500))
+ANALYTICS_QUEUE_MAX = int(os.getenv("ANALYTICS_QUEUE_MAX", 10000))
+
+
+class AnalyticsWriter:
+    """
+    Buffers analyses in memory and writes them in batches from a background thread.
+
+    A batch is committed once `flush_size` analyses are waiting or the
+    oldest one has waited `flush_ms` milliseconds, so callers never wait on
+    the database. When the queue is full, submit() blocks until the writer
+    catches up rather than dropping analyses.
+    """
+
+    def __init__(self, flush_size: int = ANALYTICS_FLUSH_SIZE, flush_ms: int = ANALYTICS_FLUSH_MS,
+                 max_queue: int = ANALYTICS_QUEUE_MAX):
+        self.flush_size = max(1, flush_size)
+        self.flush_seconds = max(0, flush_ms) / 1000
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._stats = {"submitted": 0, "written": 0, "failed": 0, "batches": 0, "max_queue_depth": 0,
+                       "last_batch_size": 0, "last_flush_ms": 0.0}
+        self._thread = threading.Thread(target=self._run, name="analytics-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, ats_score: Any, skill_gaps: List[str], keywords: List[str], job_count: int = 0) -> None:
+        """Queue an analysis for saving; it is timestamped now, not when written."""
+        if self._stop.is_set():
+            raise RuntimeError("Analytics writer is closed")
+        self._queue.put({"ats_score": ats_score, "skill_gaps": list(skill_gaps or []),
+                         "keywords": list(keywords or []), "job_count": job_count,
+                         "timestamp": datetime.now().isoformat()})
+        with self._stats_lock:
+            self._stats["submitted"] += 1
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], self._queue.qsize())
+
+    def _next_batch(self) -> List[Dict[str, Any]]:
+        """Wait for the first analysis, then collect more until the batch is full or its deadline passes."""
+        try:
+            batch = [self._queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_seconds
+        while len(batch) < self.flush_size:
+            remaining = deadline - time.monotonic()
+            try:
+                # After close() only what is already queued is drained
+                batch.append(self._queue.get_nowait() if remaining <= 0 or self._stop.is_set()
+                             else self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if not batch:
+                continue
+            started = time.perf_counter()
+            written = save_analyses(batch)
+            with self._stats_lock:
+                self._stats["batches"] += 1
+                self._stats["written"] += written
+                self._stats["failed"] += len(batch) - written
+                self._stats["last_batch_size"] = len(batch)
+                self._stats["last_flush_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            for _ in batch:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """Block until every analysis submitted so far has been written."""
+        self._queue.join()
+
+    def close(self, timeout: Optional[float] = 30) -> None:
+        """Write everything still queued and stop the background thread."""
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Queue and write metrics.
+
+        Returns:
+            Dictionary with queue_depth, max_queue_depth, submitted, written,
+            failed, batches, last_batch_size and last_flush_ms
+        """
+        with self._stats_lock:
+            return {"queue_depth": self._queue.qsize(), **self._stats}
+
+
+_writer: Optional[AnalyticsWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_analytics_writer() -> AnalyticsWriter:
+    """Get the process-wide analytics writer, starting it on first use (it is flushed at exit)."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = AnalyticsWriter()
+            atexit.register(_writer.close)
+        return _writer
+
+
+def save_analysis_async(ats_score: Any, skill_gaps: List[str], keywords: List[str], job_count: int = 0) -> None:
+    """
+    Queue an analysis for the background writer (same arguments as save_analysis).
+
+    Returns immediately; the analysis shows up in the analytics within
+    ANALYTICS_FLUSH_MS milliseconds.
+    """
+    get_analytics_writer().submit(ats_score, skill_gaps, keywords, job_count)
+
+
+def get_writer_stats() -> Dict[str, Any]:
+    """Queue-depth and batch metrics of the background writer (zeros before the first write)."""
+    with _writer_lock:
+        writer = _writer
+    if writer is None:
+        return {"queue_depth": 0, "max_queue_depth": 0, "submitted": 0, "written": 0, "failed": 0,
+                "batches": 0, "last_batch_size": 0, "last_flush_ms": 0.0}
+    return writer.stats()
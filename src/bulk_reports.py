@@ -0,0 +1,174 @@
+import argparse
+import json
+import os
+import re
+import time
+import zipfile
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from src.pdf_generator import generate_analysis_pdf
+from src.report_templates import get_report_template
+
+load_dotenv()
+
+
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", 0)) or os.cpu_count() or 1
+REPORT_ARGS = ("summary", "ats_score", "ats_analysis", "gaps", "roadmap", "keywords", "jobs", "improvements")
+
+# The job fields a report shows; workers get these instead of full Job records and their raw payloads
+ReportJob = namedtuple("ReportJob", "title company location")
+
+
+def _report_job(job: Any) -> ReportJob:
+    if isinstance(job, dict):
+        return ReportJob(job.get("title", ""), job.get("company", ""), job.get("location", ""))
+    return ReportJob(job.title, job.company, job.location)
+
+
+def _file_name(name: str) -> str:
+    """A safe PDF file name for a report name."""
+    name = re.sub(r"[^\w.-]+", "_", str(name)).strip("._") or "report"
+    return name if name.lower().endswith(".pdf") else f"{name}.pdf"
+
+
+def _prepare(index: int, report: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """Split a report into its file name and the generate_analysis_pdf() arguments sent to a worker."""
+    name = _file_name(report.get("name") or f"report_{index:05d}")
+    args = {arg: report[arg] for arg in REPORT_ARGS if arg in report}
+    args["jobs"] = [_report_job(job) for job in (args.get("jobs") or [])[:10]]
+    return name, args
+
+
+def _init_worker() -> None:
+    get_report_template()
+
+
+def _render(item: Tuple[str, Dict[str, Any]]) -> Tuple[str, Optional[bytes], float, Optional[str]]:
+    """Render one report; errors are returned rather than raised so one bad report does not stop a run."""
+    name, args = item
+    started = time.perf_counter()
+    try:
+        pdf, error = generate_analysis_pdf(**args).getvalue(), None
+    except Exception as e:
+        pdf, error = None, str(e)
+    return name, pdf, time.perf_counter() - started, error
+
+
+def _rendered(items: Iterator[Tuple[str, Dict[str, Any]]], workers: int,
+              max_pending: int) -> Iterator[Tuple[str, Optional[bytes], float, Optional[str]]]:
+    """Render reports on a process pool, yielding them as they finish with at most `max_pending` in flight."""
+    if workers <= 1:
+        _init_worker()
+        for item in items:
+            yield _render(item)
+        return
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+        pending = set()
+        for item in items:
+            pending.add(pool.submit(_render, item))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def generate_reports(reports: Iterable[Dict[str, Any]], output: str, workers: Optional[int] = None,
+                     max_pending: Optional[int] = None,
+                     progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Render a PDF report per analysis on a process pool and stream them into a ZIP file or directory.
+
+    Reports are taken from `reports` lazily and each PDF is written as soon
+    as it is rendered, so memory holds at most `max_pending` PDFs however
+    many reports there are. Reports that fail are skipped and counted.
+
+    Args:
+        reports: generate_analysis_pdf() keyword arguments per report, plus an
+                 optional "name" for its file; jobs may be Job records or
+                 dictionaries with title, company and location
+        output: A path ending in .zip, or a directory
+        workers: Worker processes (default REPORT_WORKERS, the CPU count); 1 renders in this process
+        max_pending: Reports queued or rendering at once (default 2 per worker)
+        progress: Called with the running stats after every report
+
+    Returns:
+        Dictionary with output, reports, failed, bytes, seconds, reports_per_second
+        and render_ms (mean, p50, p95 and max per-report render time)
+    """
+    workers = workers or REPORT_WORKERS
+    max_pending = max_pending or 2 * workers
+    items = (_prepare(index, report) for index, report in enumerate(reports, 1))
+
+    if output.lower().endswith(".zip"):
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        archive = zipfile.ZipFile(output, "w", zipfile.ZIP_STORED)  # PDF streams are already compressed
+    else:
+        os.makedirs(output, exist_ok=True)
+        archive = None
+
+    started = time.perf_counter()
+    stats: Dict[str, Any] = {"output": output, "reports": 0, "failed": 0, "bytes": 0}
+    render_times = []
+    used_names = set()
+    try:
+        for name, pdf, seconds, error in _rendered(items, workers, max_pending):
+            if pdf is None:
+                print(f"Error generating report {name}: {error}")
+                stats["failed"] += 1
+            else:
+                stem, count = name[:-4], 1
+                while name in used_names:
+                    count += 1
+                    name = f"{stem}_{count}.pdf"
+                used_names.add(name)
+                if archive is not None:
+                    archive.writestr(name, pdf)
+                else:
+                    with open(os.path.join(output, name), "wb") as f:
+                        f.write(pdf)
+                stats["reports"] += 1
+                stats["bytes"] += len(pdf)
+                render_times.append(seconds)
+            if progress:
+                progress(stats)
+    finally:
+        if archive is not None:
+            archive.close()
+
+    elapsed = time.perf_counter() - started
+    render_times.sort()
+    stats["seconds"] = round(elapsed, 2)
+    stats["reports_per_second"] = round(stats["reports"] / elapsed, 1) if elapsed else 0.0
+    stats["render_ms"] = {
+        "mean": round(sum(render_times) / len(render_times) * 1000, 1),
+        "p50": round(render_times[len(render_times) // 2] * 1000, 1),
+        "p95": round(render_times[min(len(render_times) - 1, int(len(render_times) * 0.95))] * 1000, 1),
+        "max": round(render_times[-1] * 1000, 1),
+    } if render_times else {}
+    return stats
+
+
+def _read_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render a PDF report per analysis into a ZIP file or directory.")
+    parser.add_argument("analyses", help="JSON Lines file, one object of generate_analysis_pdf() arguments per line")
+    parser.add_argument("output", help="output .zip file or directory")
+    parser.add_argument("--workers", type=int, default=REPORT_WORKERS)
+    args = parser.parse_args()
+
+    print(json.dumps(generate_reports(_read_jsonl(args.analyses), args.output, args.workers), indent=2))
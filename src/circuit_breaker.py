@@ -0,0 +1,140 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Dict
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class SourceUnavailableError(Exception):
+    """Raised instead of calling a source whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker with a rolling window of call outcomes and latencies.
+
+    The breaker opens when, within the window, the error rate or the share of
+    slow calls reaches the threshold. While open, calls fail fast. After the
+    cooldown one trial call is let through (half-open): success closes the
+    breaker, failure opens it again.
+    """
+
+    def __init__(self, name: str, window_seconds: float = 120, min_calls: int = 4,
+                 failure_threshold: float = 0.5, slow_call_seconds: float = 10,
+                 cooldown_seconds: float = 30):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self.state = CLOSED
+        self._calls = deque()  # (timestamp, succeeded, latency)
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    def _trim(self, now: float) -> None:
+        """Drop outcomes older than the window. Caller must hold the lock."""
+        while self._calls and now - self._calls[0][0] > self.window_seconds:
+            self._calls.popleft()
+
+    def allow_request(self) -> bool:
+        """Check whether a call may go out now; counts a rejection if not."""
+        with self._lock:
+            if self.state == OPEN and time.time() - self._opened_at >= self.cooldown_seconds:
+                self.state = HALF_OPEN
+                self._trial_in_flight = False
+
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+
+            self._rejected += 1
+            return False
+
+    def release(self) -> None:
+        """
+        Give back a half-open trial slot without recording an outcome, for a
+        call that was allowed but never made or whose response says nothing
+        about the source's health.
+        """
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._trial_in_flight = False
+
+    def record_success(self, latency: float) -> None:
+        """Record a successful call and its latency in seconds."""
+        self._record(True, latency)
+
+    def record_failure(self, latency: float) -> None:
+        """Record a failed call and its latency in seconds."""
+        self._record(False, latency)
+
+    def _record(self, succeeded: bool, latency: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._calls.append((now, succeeded, latency))
+            self._trim(now)
+
+            if self.state == HALF_OPEN:
+                self._trial_in_flight = False
+                if succeeded and latency < self.slow_call_seconds:
+                    self.state = CLOSED
+                    self._calls.clear()
+                else:
+                    self._open(now)
+                return
+
+            if self.state == CLOSED and len(self._calls) >= self.min_calls:
+                failures = sum(1 for _, ok, _ in self._calls if not ok)
+                slow = sum(1 for _, _, seconds in self._calls if seconds >= self.slow_call_seconds)
+                if (failures / len(self._calls) >= self.failure_threshold
+                        or slow / len(self._calls) >= self.failure_threshold):
+                    self._open(now)
+
+    def _open(self, now: float) -> None:
+        """Trip the breaker. Caller must hold the lock."""
+        self.state = OPEN
+        self._opened_at = now
+        print(f" Circuit breaker '{self.name}' opened")
+
+    def health(self) -> Dict[str, Any]:
+        """
+        Get the breaker state and rolling-window statistics.
+
+        Returns:
+            Dictionary with state, calls, error_rate, slow_rate, avg/p95 latency
+            (seconds), rejected count and seconds until the next trial call
+        """
+        now = time.time()
+        with self._lock:
+            self._trim(now)
+            calls = list(self._calls)
+            state = self.state
+            retry_in = max(self.cooldown_seconds - (now - self._opened_at), 0) if state == OPEN else 0
+            rejected = self._rejected
+
+        # Past the cooldown the next call is a trial call, so report the breaker as half-open
+        if state == OPEN and retry_in == 0:
+            state = HALF_OPEN
+
+        latencies = sorted(seconds for _, _, seconds in calls)
+        count = len(calls)
+        return {
+            "state": state,
+            "calls": count,
+            "error_rate": round(sum(1 for _, ok, _ in calls if not ok) / count, 3) if count else 0.0,
+            "slow_rate": round(sum(1 for s in latencies if s >= self.slow_call_seconds) / count, 3) if count else 0.0,
+            "avg_latency": round(sum(latencies) / count, 3) if count else 0.0,
+            "p95_latency": round(latencies[min(int(count * 0.95), count - 1)], 3) if count else 0.0,
+            "rejected": rejected,
+            "retry_in": round(retry_in, 1)
+        }
@@ -1,8 +1,9 @@
 import fitz # PyMuPDF
 import os 
 from dotenv import load_dotenv
+import httpx
 from openai import OpenAI
-from apify_client import ApifyClient
+from src.http_client import HTTP_CONNECT_TIMEOUT, get_http_client
 
 
 
@@ -10,11 +11,12 @@ load_dotenv()
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 os.environ["OPENAI_API_KEY"] = OPENAI_API_KEY
+# Long analyses can take minutes; the shared pool's HTTP_TIMEOUT is meant for job APIs
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", 600))
 
 
-client = OpenAI(api_key=OPENAI_API_KEY)
-
-apify_client = ApifyClient(os.getenv("APIFY_API_TOKEN"))
+client = OpenAI(api_key=OPENAI_API_KEY, http_client=get_http_client(),
+                timeout=httpx.Timeout(OPENAI_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT))
 
 # Function to extract text from PDF
 def extract_text_from_pdf(uploaded_file):
@@ -0,0 +1,128 @@
+import os
+import threading
+from typing import Any, Dict, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+# Pool and timeout settings shared by every outbound HTTP caller
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", 20))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", 10))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", 60))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", 30))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() in ("1", "true", "yes")
+
+_lock = threading.Lock()
+_client: Optional[httpx.Client] = None
+_apify_clients: Dict[str, Any] = {}
+_metrics: Dict[str, Dict[str, int]] = {}
+
+
+def _host_metrics(host: str) -> Dict[str, int]:
+    """Get (creating if needed) the counters for one host. Caller must hold the lock."""
+    if host not in _metrics:
+        _metrics[host] = {"requests": 0, "connections_opened": 0, "tls_handshakes": 0}
+    return _metrics[host]
+
+
+def _on_request(request: httpx.Request) -> None:
+    """Count the request and attach a trace hook that records new connections."""
+    host = request.url.host
+
+    def trace(event_name: str, info: Dict[str, Any]) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            with _lock:
+                _host_metrics(host)["connections_opened"] += 1
+        elif event_name == "connection.start_tls.complete":
+            with _lock:
+                _host_metrics(host)["tls_handshakes"] += 1
+
+    request.extensions["trace"] = trace
+    with _lock:
+        _host_metrics(host)["requests"] += 1
+
+
+def _http2_available() -> bool:
+    """Check whether the optional `h2` package needed for HTTP/2 is installed."""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        print("HTTP2_ENABLED is set but the 'h2' package is not installed; using HTTP/1.1")
+        return False
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Get the process-wide pooled HTTP client.
+
+    The client keeps connections alive between calls, so repeated requests to
+    the same host skip the TCP and TLS handshake.
+
+    Returns:
+        Shared httpx.Client instance
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = httpx.Client(
+                    http2=HTTP2_ENABLED and _http2_available(),
+                    limits=httpx.Limits(
+                        max_connections=HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+                    ),
+                    timeout=httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+                    event_hooks={"request": [_on_request]}
+                )
+    return _client
+
+
+def get_apify_client(token: str):
+    """
+    Get a cached ApifyClient for the given token.
+
+    ApifyClient manages its own HTTP session, so reusing one instance keeps its
+    connections alive across calls.
+
+    Args:
+        token: Apify API token
+
+    Returns:
+        ApifyClient instance
+    """
+    with _lock:
+        if token not in _apify_clients:
+            from apify_client import ApifyClient
+            _apify_clients[token] = ApifyClient(token)
+        return _apify_clients[token]
+
+
+def get_connection_metrics() -> Dict[str, Dict[str, Any]]:
+    """
+    Get per-host request and connection counters for the shared client.
+
+    Returns:
+        Dictionary keyed by host with requests, connections_opened,
+        tls_handshakes and reuse_rate (share of requests on an existing connection)
+    """
+    with _lock:
+        snapshot = {host: dict(counts) for host, counts in _metrics.items()}
+    for counts in snapshot.values():
+        reused = counts["requests"] - counts["connections_opened"]
+        counts["reuse_rate"] = round(max(reused, 0) / counts["requests"], 3) if counts["requests"] else 0.0
+    return snapshot
+
+
+def close_http_client() -> None:
+    """Close the shared client and drop its pooled connections."""
+    global _client
+    with _lock:
+        if _client is not None:
+            _client.close()
+            _client = None
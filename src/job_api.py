@@ -1,25 +1,362 @@
-import requests
+import json
 import os
+import time
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import partial
+from itertools import chain
+from typing import Any, Dict, List, Optional
 from dotenv import load_dotenv
+from src.job_cache import cached_fetch, cache_lookup, cache_store, make_cache_key
+from src.http_client import get_http_client, get_apify_client
+from src.job_corpus import recommend_jobs
+from src.job_index import INDEX_MAX_AGE_DAYS, index_jobs_async, job_key, search_index
+from src.job_ranking import jobs_term_counts
+from src.circuit_breaker import CircuitBreaker, SourceUnavailableError, OPEN
 
 load_dotenv()
 
-def fetch_linkedin_jobs(search_query, location="Saudi Arabia", rows=10):
-    """Fetches jobs from LinkedIn using Apify"""
+# Hard caps for streamed results; memory is measured on the compressed raw payloads held
+STREAM_MAX_ITEMS = int(os.getenv("JOB_STREAM_MAX_ITEMS", 200))
+STREAM_MAX_BYTES = int(os.getenv("JOB_STREAM_MAX_BYTES", 4 * 1024 * 1024))
+RAPIDAPI_MAX_PAGES = 10
+LINKEDIN_PAGE_SIZE = 25
+# Harvested postings that best fit the resume, yielded before keyword matches
+CORPUS_MAX_ITEMS = int(os.getenv("JOB_CORPUS_MAX_ITEMS", 10))
+
+# LinkedIn actor runs are polled with backoff and aborted after the time budget
+LINKEDIN_TIME_BUDGET = float(os.getenv("LINKEDIN_TIME_BUDGET", 90))
+LINKEDIN_POLL_INITIAL = 1.0
+LINKEDIN_POLL_MAX = 8.0
+LINKEDIN_TERMINAL_STATUSES = ("SUCCEEDED", "FAILED", "TIMED-OUT", "TIMED_OUT", "ABORTED")
+
+# One circuit breaker per job source; an open breaker fails fast instead of waiting on timeouts
+_breakers = {
+    "rapidapi": CircuitBreaker("rapidapi", slow_call_seconds=8),
+    "linkedin": CircuitBreaker("linkedin", min_calls=2, slow_call_seconds=LINKEDIN_TIME_BUDGET)
+}
+
+
+def get_source_health():
+    """
+    Gets circuit breaker state and rolling error/latency stats for each job source.
+
+    Returns:
+        Dictionary keyed by source name (see CircuitBreaker.health())
+    """
+    return {source: breaker.health() for source, breaker in _breakers.items()}
+
+
+def is_source_available(source):
+    """Returns False while the source's circuit breaker is open."""
+    return _breakers[source].health()["state"] != OPEN
+
+
+@dataclass(slots=True)
+class Job:
+    """
+    Normalized job posting from any source.
+
+    The original API payload is kept zlib-compressed and only decoded when
+    `raw` (or `description`) is accessed.
+    """
+    source: str
+    job_id: str
+    title: str
+    company: str
+    city: str
+    location: str
+    apply_link: str
+    posted_at: str = ""
+    _raw_blob: bytes = field(default=b"", repr=False, compare=False)
+
+    @property
+    def raw(self) -> Dict[str, Any]:
+        """Original API payload for this job."""
+        if not self._raw_blob:
+            return {}
+        return json.loads(zlib.decompress(self._raw_blob))
+
+    @property
+    def description(self) -> str:
+        """Full job description text."""
+        raw = self.raw
+        return raw.get("job_description") or raw.get("description") or ""
+
+    def to_dict(self) -> Dict[str, str]:
+        """Compact dictionary form (without the raw payload), e.g. for MCP responses."""
+        return {
+            "source": self.source,
+            "job_id": self.job_id,
+            "title": self.title,
+            "company": self.company,
+            "city": self.city,
+            "location": self.location,
+            "apply_link": self.apply_link,
+            "posted_at": self.posted_at
+        }
+
+    @classmethod
+    def from_rapidapi(cls, data: Dict[str, Any]) -> "Job":
+        """Build a Job from a JSearch result."""
+        city = data.get('job_city') or ''
+        timestamp = data.get('job_posted_at_timestamp')
+        posted_at = (datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+                     if timestamp else data.get('job_posted_at_datetime_utc') or '')
+        return cls(
+            source="rapidapi",
+            job_id=str(data.get('job_id') or ''),
+            title=data.get('job_title') or 'No Title',
+            company=data.get('employer_name') or 'Unknown Company',
+            city=city,
+            location=f"{city}, {data.get('job_country') or ''}".strip(', ') or "Location not specified",
+            apply_link=data.get('job_apply_link') or '#',
+            posted_at=posted_at,
+            _raw_blob=_compress(data)
+        )
+
+    @classmethod
+    def from_linkedin(cls, data: Dict[str, Any]) -> "Job":
+        """Build a Job from an Apify LinkedIn scraper item."""
+        location = data.get('location') or ''
+
+        # Ensure a full LinkedIn URL
+        link = (data.get('link') or '').strip()
+        if link.startswith("/"):
+            link = f"https://www.linkedin.com{link}"
+        elif link and not link.startswith("http"):
+            link = f"https://{link}"
+
+        return cls(
+            source="linkedin",
+            job_id=str(data.get('id') or ''),
+            title=data.get('title') or 'No Title',
+            company=data.get('companyName') or 'Unknown Company',
+            city=location.split(',')[0].strip(),
+            location=location or "Location not specified",
+            apply_link=link or '#',
+            posted_at=data.get('publishedAt') or data.get('postedTime') or '',
+            _raw_blob=_compress(data)
+        )
+
+
+def _compress(data: Dict[str, Any]) -> bytes:
+    """Serialize and compress a raw API payload."""
+    return zlib.compress(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+
+def _record_response(breaker: CircuitBreaker, status_code: int, latency: float) -> None:
+    """
+    Record an HTTP outcome on a source's breaker.
+
+    Rate limiting and server errors count against the source's health.
+    Other client errors (bad request, bad key) are neither a success nor a
+    failure; a half-open trial slot is just given back.
+    """
+    if status_code == 429 or status_code >= 500:
+        breaker.record_failure(latency)
+    elif status_code >= 400:
+        breaker.release()
+    else:
+        breaker.record_success(latency)
+
+
+def _within_limits(count: int, size: int, max_items: int, max_bytes: int) -> bool:
+    """Check whether another job may be yielded under the item and memory caps."""
+    return count < max_items and size < max_bytes
+
+
+class LinkedInRun:
+    """
+    Handle for a LinkedIn scraper run that was started without waiting for it.
+
+    Dataset items are read while the actor is still running. A run created
+    from cached items makes no API calls.
+
+    A live run holds the LinkedIn breaker's permission until iter_jobs()
+    records its outcome. A run that is aborted, left as a context manager
+    or garbage-collected first gives a half-open trial slot back instead.
+    """
+
+    def __init__(self, client=None, run=None, cache_key=None, cached_items=None, breaker=None, search_location=""):
+        self.client = client
+        self.search_location = search_location
+        self.breaker = breaker
+        self.started = time.monotonic()
+        self.run_id = run["id"] if run else None
+        self.dataset_id = run["defaultDatasetId"] if run else None
+        self.status = run.get("status", "READY") if run else "CACHED"
+        self.cache_key = cache_key
+        self.items = list(cached_items or [])
+        self._offset = 0
+        self._breaker_pending = breaker is not None
+
+    def __enter__(self) -> "LinkedInRun":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.abort()
+
+    def __del__(self):
+        self._settle_breaker(None)
+
+    def _settle_breaker(self, succeeded: Optional[bool]) -> None:
+        """Record the run's outcome on its breaker once; None releases the permission instead."""
+        if not getattr(self, "_breaker_pending", False):
+            return
+        self._breaker_pending = False
+        latency = time.monotonic() - self.started
+        if succeeded is None:
+            self.breaker.release()
+        elif succeeded:
+            self.breaker.record_success(latency)
+        else:
+            self.breaker.record_failure(latency)
+
+    @property
+    def finished(self) -> bool:
+        """True once the actor run has reached a terminal status."""
+        return self.status in LINKEDIN_TERMINAL_STATUSES
+
+    def poll(self) -> str:
+        """Refresh and return the run status."""
+        if self.run_id:
+            run = self.client.run(self.run_id).get() or {}
+            self.status = run.get("status", self.status)
+        return self.status
+
+    def fetch_new_items(self) -> List[Dict[str, Any]]:
+        """Read dataset items added since the last call."""
+        if not self.dataset_id:
+            return []
+        new_items = []
+        while True:
+            page = self.client.dataset(self.dataset_id).list_items(
+                offset=self._offset + len(new_items), limit=LINKEDIN_PAGE_SIZE
+            ).items
+            new_items.extend(page)
+            if len(page) < LINKEDIN_PAGE_SIZE:
+                break
+        self._offset += len(new_items)
+        self.items.extend(new_items)
+        return new_items
+
+    def abort(self) -> None:
+        """Abort the actor run if it is still in progress, releasing its breaker permission if unused."""
+        if self.run_id and not self.finished:
+            try:
+                self.client.run(self.run_id).abort()
+                self.status = "ABORTED"
+                print(f" LinkedIn: run {self.run_id} aborted")
+            except Exception as e:
+                print(f" LinkedIn abort error: {str(e)}")
+        self._settle_breaker(None)
+
+    def iter_jobs(self, time_budget=LINKEDIN_TIME_BUDGET, max_items=STREAM_MAX_ITEMS, max_bytes=STREAM_MAX_BYTES):
+        """
+        Yields Job records as the run produces them.
+
+        Polls with exponential backoff (reset whenever new items arrive) and
+        aborts the run once the time budget runs out, the caps are reached or
+        the caller stops iterating.
+
+        Args:
+            time_budget: Seconds to wait for the run before aborting it
+            max_items: Hard cap on jobs yielded
+            max_bytes: Hard cap on compressed payload bytes yielded
+
+        Yields:
+            Job records
+        """
+        count = size = 0
+        
+        if self.status == "CACHED":
+            for item in self.items:
+                if not _within_limits(count, size, max_items, max_bytes):
+                    return
+                job = Job.from_linkedin(item)
+                count += 1
+                size += len(job._raw_blob)
+                yield job
+            return
+        
+        deadline = time.monotonic() + time_budget
+        delay = LINKEDIN_POLL_INITIAL
+        succeeded = errored = False
+        try:
+            while True:
+                finished = self.finished or self.poll() in LINKEDIN_TERMINAL_STATUSES
+                new_items = self.fetch_new_items()
+                new_jobs = [Job.from_linkedin(item) for item in new_items]
+                # Live run items are always new; cached runs take the branch above and are not re-indexed.
+                # They are tokenized for ranking on the index thread while the next poll waits
+                index_jobs_async(new_jobs, search_location=self.search_location, after_index=jobs_term_counts)
+                for job in new_jobs:
+                    if not _within_limits(count, size, max_items, max_bytes):
+                        return
+                    count += 1
+                    size += len(job._raw_blob)
+                    yield job
+                
+                if finished:
+                    succeeded = self.status == "SUCCEEDED"
+                    # Only complete result sets are cached
+                    if succeeded:
+                        cache_store(self.cache_key, self.items)
+                    return
+                
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    print(f" LinkedIn: time budget of {time_budget}s exhausted")
+                    return
+                
+                delay = LINKEDIN_POLL_INITIAL if new_items else min(delay * 1.5, LINKEDIN_POLL_MAX)
+                time.sleep(min(delay, remaining))
+        except Exception:
+            errored = True
+            raise
+        finally:
+            # A run stopped early because the caller had enough jobs is not a source failure
+            stopped_early = not errored and not self.finished and time.monotonic() < deadline
+            self._settle_breaker(succeeded or stopped_early)
+            self.abort()
+
+
+def start_linkedin_run(search_query, location="Saudi Arabia", rows=10):
+    """
+    Starts a LinkedIn scrape on Apify and returns immediately.
+
+    Args:
+        search_query: Comma-separated keywords (only the first one is used)
+        location: Job location
+        rows: Number of jobs the scraper is asked for
+
+    Returns:
+        LinkedInRun handle (served from cache when possible), or None on error
+    """
     apify_token = os.getenv("APIFY_API_TOKEN")
     
     if not apify_token:
         print(" APIFY_API_TOKEN not found")
-        return []
+        return None
+    
+    # Use only first keyword
+    main_keyword = search_query.split(',')[0].strip()
+    cache_key = make_cache_key("linkedin", main_keyword, location, page=1, size=rows)
     
     try:
-        from apify_client import ApifyClient
-        client = ApifyClient(apify_token)
+        print(f" LinkedIn: '{main_keyword}' in '{location}'")
         
-        # Use only first keyword
-        main_keyword = search_query.split(',')[0].strip()
+        cached = cache_lookup(cache_key)
+        if cached is not None:
+            return LinkedInRun(cache_key=cache_key, cached_items=cached)
         
-        print(f" LinkedIn: '{main_keyword}' in '{location}'")
+        client = get_apify_client(apify_token)
+        
+        breaker = _breakers["linkedin"]
+        if not breaker.allow_request():
+            raise SourceUnavailableError("LinkedIn circuit breaker is open")
         
         run_input = {
             "title": main_keyword,
@@ -31,27 +368,58 @@ def fetch_linkedin_jobs(search_query, location="Saudi Arabia", rows=10):
             }
         }
         
-        run = client.actor("BHzefUZlZRKWxkTck").call(run_input=run_input)
-        jobs = list(client.dataset(run["defaultDatasetId"]).iterate_items())
-        
-        print(f" LinkedIn: {len(jobs)} jobs found")
-        return jobs
+        started = time.monotonic()
+        try:
+            run = client.actor("BHzefUZlZRKWxkTck").start(run_input=run_input)
+        except Exception as e:
+            status_code = getattr(e, "status_code", None)
+            if isinstance(status_code, int):
+                _record_response(breaker, status_code, time.monotonic() - started)
+            else:
+                breaker.record_failure(time.monotonic() - started)
+            raise
+        return LinkedInRun(client=client, run=run, cache_key=cache_key, breaker=breaker,
+                           search_location=location)
     
     except Exception as e:
         print(f" LinkedIn error: {str(e)}")
-        return []
+        return None
 
-def fetch_rapidapi_jobs(search_query, location="Saudi Arabia", rows=10):
-    """Fetches jobs from RapidAPI JSearch"""
-    rapidapi_key = os.getenv("RAPIDAPI_KEY")
-    
-    if not rapidapi_key:
-        print(" RAPIDAPI_KEY not found")
-        return []
-    
-    # Use only first keyword
-    main_keyword = search_query.split(',')[0].strip()
+
+def iter_linkedin_jobs(search_query, location="Saudi Arabia", rows=10, time_budget=LINKEDIN_TIME_BUDGET,
+                       max_items=STREAM_MAX_ITEMS, max_bytes=STREAM_MAX_BYTES):
+    """
+    Lazily yields Job records from LinkedIn using Apify.
+
+    The actor run is started without blocking and dataset items are yielded
+    as they appear; the run is aborted when the time budget runs out.
+
+    Args:
+        search_query: Comma-separated keywords (only the first one is used)
+        location: Job location
+        rows: Number of jobs the scraper is asked for
+        time_budget: Seconds to wait for the run before aborting it
+        max_items: Hard cap on jobs yielded
+        max_bytes: Hard cap on compressed payload bytes yielded
+
+    Yields:
+        Job records
+    """
+    run = start_linkedin_run(search_query, location=location, rows=rows)
+    if run is None:
+        return
     
+    try:
+        yield from run.iter_jobs(time_budget=time_budget, max_items=max_items, max_bytes=max_bytes)
+    except Exception as e:
+        print(f" LinkedIn error: {str(e)}")
+
+
+def fetch_rapidapi_page(rapidapi_key, main_keyword, location, page, date_posted="all"):
+    """Requests one page of JSearch results; raises on HTTP errors.
+
+    `date_posted` narrows results to "today", "3days", "week" or "month".
+    """
     url = "https://jsearch.p.rapidapi.com/search"
     
     headers = {
@@ -61,25 +429,156 @@ def fetch_rapidapi_jobs(search_query, location="Saudi Arabia", rows=10):
     
     querystring = {
         "query": f"{main_keyword} in {location}",
-        "page": "1",
+        "page": str(page),
         "num_pages": "1"
     }
+    if date_posted != "all":
+        querystring["date_posted"] = date_posted
+    
+    breaker = _breakers["rapidapi"]
+    if not breaker.allow_request():
+        raise SourceUnavailableError("RapidAPI circuit breaker is open")
+    
+    started = time.monotonic()
+    try:
+        response = get_http_client().get(url, headers=headers, params=querystring, timeout=15)
+    except Exception:
+        breaker.record_failure(time.monotonic() - started)
+        raise
+    
+    _record_response(breaker, response.status_code, time.monotonic() - started)
+    response.raise_for_status()
+    
+    data = response.json()
+    return data.get("data", [])
+
+
+def _fetch_and_index_rapidapi_page(rapidapi_key, main_keyword, location, page):
+    """
+    Fetch a result page and queue its jobs for the local index (cache hits are not re-indexed).
+
+    The index thread also computes the jobs' ranking term counts while the
+    caller waits on its next page, so ranking the results finds them cached.
+    """
+    items = fetch_rapidapi_page(rapidapi_key, main_keyword, location, page)
+    index_jobs_async([Job.from_rapidapi(item) for item in items], search_location=location,
+                     after_index=jobs_term_counts)
+    return items
+
+
+def iter_rapidapi_jobs(search_query, location="Saudi Arabia",
+                       max_items=STREAM_MAX_ITEMS, max_bytes=STREAM_MAX_BYTES, max_pages=RAPIDAPI_MAX_PAGES):
+    """
+    Lazily yields Job records from RapidAPI JSearch.
+
+    Result pages are requested one at a time, only when the caller has
+    consumed the previous page.
+
+    Args:
+        search_query: Comma-separated keywords (only the first one is used)
+        location: Job location
+        max_items: Hard cap on jobs yielded
+        max_bytes: Hard cap on compressed payload bytes yielded
+        max_pages: Maximum number of result pages requested
+
+    Yields:
+        Job records
+    """
+    rapidapi_key = os.getenv("RAPIDAPI_KEY")
+    
+    if not rapidapi_key:
+        print(" RAPIDAPI_KEY not found")
+        return
+    
+    # Use only first keyword
+    main_keyword = search_query.split(',')[0].strip()
+    
+    count = size = 0
     
     try:
         print(f" RapidAPI: '{main_keyword}' in '{location}'" )
         
-        response = requests.get(url, headers=headers, params=querystring, timeout=15)
-        response.raise_for_status()
-        
-        data = response.json()
-        jobs = data.get("data", [])
-        
-        print(f" RapidAPI: {len(jobs)} jobs found")
-        return jobs
+        for page in range(1, max_pages + 1):
+            fetch = partial(_fetch_and_index_rapidapi_page, rapidapi_key, main_keyword, location, page)
+            items = cached_fetch(make_cache_key("rapidapi", main_keyword, location, page=page), fetch)
+            jobs = [Job.from_rapidapi(item) for item in items]
+            for job in jobs:
+                if not _within_limits(count, size, max_items, max_bytes):
+                    return
+                count += 1
+                size += len(job._raw_blob)
+                yield job
+            
+            if not items:
+                break
     
     except Exception as e:
         print(f" RapidAPI error: {str(e)}")
-        return []
 
 
+def iter_recommended_jobs(search_query, location="Saudi Arabia", max_age_days=INDEX_MAX_AGE_DAYS,
+                          max_items=STREAM_MAX_ITEMS, max_bytes=STREAM_MAX_BYTES, resume_text=""):
+    """
+    Yields jobs from the local corpus and index first, then from RapidAPI to fill the gap.
 
+    With a resume, the harvested postings that fit it best come first
+    (see recommend_jobs()), followed by keyword matches from the index.
+    The live API is only queried if the caller keeps iterating past the
+    local matches. A posting is yielded once, whichever sources return it.
+
+    Args:
+        search_query: Comma-separated keywords (only the first one is used)
+        location: Job location
+        max_age_days: Only use indexed jobs posted within this many days
+        max_items: Hard cap on jobs yielded, all sources together
+        max_bytes: Hard cap on compressed payload bytes yielded, all sources together
+        resume_text: Resume text used to pick harvested postings (optional)
+
+    Yields:
+        Job records
+    """
+    main_keyword = search_query.split(',')[0].strip()
+    if max_items <= 0:
+        return
+    
+    local = []
+    if resume_text:
+        local = recommend_jobs(resume_text, location=location, max_age_days=max_age_days,
+                               top_n=min(CORPUS_MAX_ITEMS, max_items))
+        if local:
+            print(f" Corpus: {len(local)} jobs fitting the resume in '{location}'")
+    indexed = search_index(main_keyword, location=location, max_age_days=max_age_days,
+                           limit=max_items - len(local))
+    if indexed:
+        print(f" Index: {len(indexed)} jobs for '{main_keyword}' in '{location}'")
+    
+    # Lazy: RapidAPI is only queried once the local jobs are used up; its cap leaves room for skipped duplicates
+    live = iter_rapidapi_jobs(search_query, location=location, max_items=max_items + len(local) + len(indexed),
+                              max_bytes=max_bytes)
+    count = size = 0
+    seen = set()
+    for job in chain(local, indexed, live):
+        key = job_key(job)
+        if key in seen:
+            continue
+        seen.add(key)
+        yield job
+        count += 1
+        size += len(job._raw_blob)
+        # Checked before the next job is pulled, so no page is requested past the caps
+        if not _within_limits(count, size, max_items, max_bytes):
+            return
+
+
+def fetch_linkedin_jobs(search_query, location="Saudi Arabia", rows=10, time_budget=LINKEDIN_TIME_BUDGET):
+    """Fetches jobs from LinkedIn using Apify, as a list of Job records"""
+    jobs = list(iter_linkedin_jobs(search_query, location=location, rows=rows,
+                                   time_budget=time_budget, max_items=rows))
+    print(f" LinkedIn: {len(jobs)} jobs found")
+    return jobs
+
+def fetch_rapidapi_jobs(search_query, location="Saudi Arabia", rows=10):
+    """Fetches jobs from RapidAPI JSearch, as a list of Job records"""
+    jobs = list(iter_rapidapi_jobs(search_query, location=location, max_items=rows))
+    print(f" RapidAPI: {len(jobs)} jobs found")
+    return jobs
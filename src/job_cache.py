@@ -0,0 +1,261 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+CACHE_DB = os.path.join(os.path.dirname(__file__), "..", "data", "job_cache.db")
+
+# Fresh entries are served as-is; entries older than the TTL but still inside the
+# stale window are served immediately and refreshed in the background.
+CACHE_TTL_SECONDS = int(os.getenv("JOB_CACHE_TTL", 6 * 60 * 60))
+CACHE_STALE_SECONDS = int(os.getenv("JOB_CACHE_STALE_TTL", 24 * 60 * 60))
+CACHE_MAX_ENTRIES = int(os.getenv("JOB_CACHE_MAX_ENTRIES", 500))
+
+
+def normalize_query(text: str) -> str:
+    """Normalize a search query or location for use in a cache key."""
+    return " ".join(str(text or "").lower().split())
+
+
+def make_cache_key(source: str, query: str, location: str, page: int = 1, size: Optional[int] = None) -> str:
+    """
+    Build the cache key for one page of job results.
+
+    Args:
+        source: Job source name (e.g. "rapidapi", "linkedin")
+        query: Search keyword
+        location: Job location
+        page: Result page number
+        size: Requested result count, for sources where it changes the response
+
+    Returns:
+        Cache key string
+    """
+    parts = [source, normalize_query(query), normalize_query(location), str(page)]
+    if size is not None:
+        parts.append(str(size))
+    return "|".join(parts)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS job_cache (
+    key TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    used_at REAL NOT NULL,
+    jobs TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_job_cache_used_at ON job_cache(used_at);
+"""
+
+
+class JobCache:
+    """
+    Persistent TTL cache for job search results with stale-while-revalidate.
+
+    Entries are rows of a SQLite table, so storing one search writes only
+    that entry and the cache is shared by every process using the file.
+    """
+
+    def __init__(self, path: str = CACHE_DB, ttl: int = CACHE_TTL_SECONDS,
+                 stale_ttl: int = CACHE_STALE_SECONDS, max_entries: int = CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "evictions": 0}
+        self._schema_ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the cache database, creating it on first use."""
+        conn = sqlite3.connect(self.path, timeout=10)
+        if not self._schema_ready:
+            with self._lock:
+                if not self._schema_ready:
+                    os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(_SCHEMA)
+                    self._schema_ready = True
+        return conn
+
+    def _read(self, key: str) -> Optional[Tuple[float, List[Dict[str, Any]]]]:
+        """Fetch time and jobs of an entry, marking it as recently used."""
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute("SELECT fetched_at, jobs FROM job_cache WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                with conn:
+                    conn.execute("UPDATE job_cache SET used_at = ? WHERE key = ?", (time.time(), key))
+                return row[0], json.loads(row[1])
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"Error reading job cache: {e}")
+            return None
+
+    def _store(self, key: str, jobs: List[Dict[str, Any]]) -> None:
+        """Insert or replace an entry, evicting least recently used entries over the limit."""
+        data = json.dumps(jobs, ensure_ascii=False)
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute("INSERT OR REPLACE INTO job_cache (key, fetched_at, used_at, jobs) VALUES (?, ?, ?, ?)",
+                                 (key, now, now, data))
+                    excess = conn.execute("SELECT COUNT(*) FROM job_cache").fetchone()[0] - self.max_entries
+                    if excess > 0:
+                        conn.execute("""DELETE FROM job_cache WHERE key IN
+                                        (SELECT key FROM job_cache ORDER BY used_at LIMIT ?)""", (excess,))
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"Error saving job cache: {e}")
+            return
+        if excess > 0:
+            with self._lock:
+                self._stats["evictions"] += excess
+
+    def _refresh(self, key: str, fetch: Callable[[], List[Dict[str, Any]]]) -> None:
+        """Re-fetch a stale entry; on failure the stale entry is kept."""
+        try:
+            self._store(key, fetch())
+            with self._lock:
+                self._stats["refreshes"] += 1
+        except Exception as e:
+            print(f"Job cache refresh failed for '{key}': {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Return cached jobs for a key, calling `fetch` on a miss.
+
+        Stale entries are returned immediately while a background thread
+        refreshes them. Exceptions raised by `fetch` on a miss propagate to the
+        caller and nothing is cached.
+
+        Args:
+            key: Cache key from make_cache_key()
+            fetch: Zero-argument callable returning the list of jobs
+
+        Returns:
+            List of job dictionaries
+        """
+        entry = self._read(key)
+        age = time.time() - entry[0] if entry else None
+
+        with self._lock:
+            if entry and age < self.ttl:
+                self._stats["hits"] += 1
+                return entry[1]
+
+            if entry and age < self.ttl + self.stale_ttl:
+                self._stats["stale_hits"] += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    threading.Thread(target=self._refresh, args=(key, fetch), daemon=True).start()
+                return entry[1]
+
+            self._stats["misses"] += 1
+
+        jobs = fetch()
+        self._store(key, jobs)
+        return jobs
+
+    def get_fresh(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return the cached jobs for a key if the entry is still fresh.
+
+        Used by streaming callers that fetch incrementally and store the
+        result themselves with put().
+
+        Args:
+            key: Cache key from make_cache_key()
+
+        Returns:
+            List of job dictionaries, or None on a miss or stale entry
+        """
+        entry = self._read(key)
+        with self._lock:
+            if entry and time.time() - entry[0] < self.ttl:
+                self._stats["hits"] += 1
+                return entry[1]
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: str, jobs: List[Dict[str, Any]]) -> None:
+        """Store jobs under a key, replacing any existing entry."""
+        self._store(key, jobs)
+
+    def _count(self) -> int:
+        try:
+            conn = self._connect()
+            try:
+                return conn.execute("SELECT COUNT(*) FROM job_cache").fetchone()[0]
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"Error reading job cache: {e}")
+            return 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and the current hit rate."""
+        entries = self._count()
+        with self._lock:
+            stats = dict(self._stats)
+        stats["entries"] = entries
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["hits"] + stats["stale_hits"]) / lookups, 3) if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute("DELETE FROM job_cache")
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"Error clearing job cache: {e}")
+
+
+_cache = JobCache()
+
+
+def cached_fetch(key: str, fetch: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Look up `key` in the shared job cache, fetching on a miss."""
+    return _cache.get_or_fetch(key, fetch)
+
+
+def cache_lookup(key: str) -> Optional[List[Dict[str, Any]]]:
+    """Get fresh jobs for `key` from the shared job cache, or None."""
+    return _cache.get_fresh(key)
+
+
+def cache_store(key: str, jobs: List[Dict[str, Any]]) -> None:
+    """Store jobs for `key` in the shared job cache."""
+    _cache.put(key, jobs)
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Get statistics for the shared job cache."""
+    return _cache.stats()
+
+
+def clear_cache() -> None:
+    """Clear the shared job cache."""
+    _cache.clear()
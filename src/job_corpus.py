@@ -0,0 +1,554 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.job_cache import normalize_query
+from src.job_index import (INDEX_FILE, INDEX_MAX_AGE_DAYS, get_indexed_jobs, iter_index_rows, job_key,
+                           posted_timestamp)
+from src.job_ranking import (N_FEATURES, batch_term_counts, feature_id, gather_rows, inverse_document_frequency,
+                             score_matrix, tfidf_weights, tokenize)
+
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "job_corpus")
+# Names the build directory readers use; builds are never renamed once they may be memory-mapped
+CURRENT_FILE = "CURRENT"
+
+# Text columns, each stored as concatenated UTF-8 bytes plus int64 row offsets
+STRING_COLUMNS = ("key", "source", "job_id", "title", "company", "location", "search_location", "apply_link")
+CORPUS_VERSION = 1
+_TERM_BATCH_ROWS = 1000  # rows tokenized together in the first build pass
+_WEIGHT_CHUNK_ROWS = 10000  # rows weighted per step in the second build pass
+_SCAN_CHUNK_BYTES = 1 << 22  # text column bytes searched per step by filter()
+_REWEIGHT_GROWTH = 0.25  # appended rows, relative to the rows the IDF was computed from, before it is recomputed
+
+_WEIGHT_FILE = re.compile(r"idf\.\d+\.data|terms\.\d+\.weights")
+
+_write_lock = threading.RLock()
+
+
+def _open_array(path: str, dtype: str, count: int) -> np.ndarray:
+    """Memory-map the first `count` items of a raw array file read-only."""
+    if count == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+
+def _key_hash(key: str) -> bytes:
+    """64-bit hash of a posting key, used to find postings already in the corpus."""
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+
+
+def _weight_files(generation: int) -> Tuple[str, str]:
+    """File names of the IDF vector and term weights of a weight generation."""
+    return f"idf.{generation}.data", f"terms.{generation}.weights"
+
+
+def _current_build(path: str) -> Optional[str]:
+    """Name of the build directory CURRENT_FILE points to, or None before the first build."""
+    try:
+        with open(os.path.join(path, CURRENT_FILE), "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def _remove_stale(path: str, build: str, generation: int) -> None:
+    """
+    Delete builds and weight generations other than the current ones.
+
+    Files a reader still has memory-mapped cannot be deleted on Windows;
+    they are left in place and removed by a later build or append.
+    """
+    for name in os.listdir(path):
+        if name.startswith("build-") and name != build:
+            shutil.rmtree(os.path.join(path, name), ignore_errors=True)
+    current = _weight_files(generation)
+    for name in os.listdir(os.path.join(path, build)):
+        if _WEIGHT_FILE.fullmatch(name) and name not in current:
+            try:
+                os.remove(os.path.join(path, build, name))
+            except OSError:
+                pass
+
+
+class _OffsetsWriter:
+    """Appends variable-length rows to a data file and tracks their end offsets (in items)."""
+
+    def __init__(self, path: str, itemsize: int = 1):
+        self.path = path
+        self.itemsize = itemsize
+        self._file = open(path, "wb")
+        self._offsets = [0]
+
+    def append(self, data: bytes) -> None:
+        self._file.write(data)
+        self._offsets.append(self._offsets[-1] + len(data) // self.itemsize)
+
+    def close(self) -> None:
+        self._file.close()
+        np.asarray(self._offsets, dtype=np.int64).tofile(f"{self.path}.offsets")
+
+
+def build_corpus(index_path: str = INDEX_FILE, path: str = CORPUS_DIR) -> int:
+    """
+    Build the columnar job corpus from the local job index.
+
+    Postings are streamed from the index, so memory stays bounded by the
+    row offsets. Descriptions are tokenized into hashed feature ids once,
+    and TF-IDF weights (corpus-wide IDF) are precomputed in a second pass
+    over the memory-mapped term arrays. Each build is written to a new
+    directory, and CURRENT_FILE is switched to it once it is complete, so
+    no file a reader may have memory-mapped is replaced.
+
+    Args:
+        index_path: Job index database to read
+        path: Corpus directory to write
+
+    Returns:
+        Number of postings in the corpus
+    """
+    from src.job_api import Job
+
+    with _write_lock:
+        current = _current_build(path)
+        build = f"build-{int(current.split('-')[1]) + 1 if current else 1:06d}"
+        tmp_path = os.path.join(path, f"{build}.tmp")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+
+        strings = {name: _OffsetsWriter(os.path.join(tmp_path, f"{name}.data")) for name in STRING_COLUMNS}
+        terms = _OffsetsWriter(os.path.join(tmp_path, "terms.data"), itemsize=4)
+        counts_file = open(os.path.join(tmp_path, "terms.counts"), "wb")
+        posted = []
+        key_hashes = []
+        texts = []  # (title, description) of rows whose terms are not written yet
+
+        rows = 0
+        for row in iter_index_rows(path=index_path):
+            job = Job(source=row["source"], job_id=row["job_id"] or "", title=row["title"] or "",
+                      company=row["company"] or "", city=row["city"] or "", location=row["location"] or "",
+                      apply_link=row["apply_link"] or "", posted_at=row["posted_at"] or "",
+                      _raw_blob=row["raw"] or b"")
+            for name in STRING_COLUMNS:
+                strings[name].append(str(row[name] or "").encode("utf-8"))
+            posted.append(row["posted_ts"] or 0.0)
+            key_hashes.append(_key_hash(row["key"]))
+
+            texts.append((job.title, job.description))
+            if len(texts) >= _TERM_BATCH_ROWS:
+                _write_terms(texts, terms, counts_file)
+                texts = []
+            rows += 1
+
+        if texts:
+            _write_terms(texts, terms, counts_file)
+        for writer in strings.values():
+            writer.close()
+        terms.close()
+        counts_file.close()
+        np.asarray(posted, dtype=np.float64).tofile(os.path.join(tmp_path, "posted_ts.data"))
+        with open(os.path.join(tmp_path, "key_hash.data"), "wb") as f:
+            f.write(b"".join(key_hashes))
+
+        _write_weights(tmp_path, rows, generation=0)
+        _write_meta(tmp_path, {"version": CORPUS_VERSION, "rows": rows, "n_features": N_FEATURES,
+                               "built_at": datetime.now().isoformat(), "weighted_rows": rows, "generation": 0})
+
+        # Left over from an interrupted build; never current, so nothing has it mapped
+        shutil.rmtree(os.path.join(path, build), ignore_errors=True)
+        os.replace(tmp_path, os.path.join(path, build))
+        _write_file(os.path.join(path, CURRENT_FILE), build)
+        _remove_stale(path, build, generation=0)
+        return rows
+
+
+def append_corpus(jobs: Iterable, search_location: str = "", index_path: str = INDEX_FILE,
+                  path: str = CORPUS_DIR) -> int:
+    """
+    Append new postings to the corpus without rebuilding it.
+
+    Only the new postings are tokenized and written; postings already in
+    the corpus (same key as in the job index) are skipped. New rows are
+    weighted with the current IDF until the corpus has grown by
+    _REWEIGHT_GROWTH since it was computed; then the IDF and all weights
+    are recomputed from the stored term arrays into new weight files.
+    Readers keep seeing the previous rows until the new ones are complete.
+    Files are only ever extended, never truncated or replaced, so
+    appending works while readers have them memory-mapped. A missing or
+    outdated corpus is built from the job index instead.
+
+    Args:
+        jobs: Job records (already written to the job index)
+        search_location: Location the jobs were searched for
+        index_path: Job index database, for a first build
+        path: Corpus directory
+
+    Returns:
+        Number of postings in the corpus
+    """
+    with _write_lock:
+        build = _current_build(path)
+        meta = _read_meta(os.path.join(path, build)) if build else None
+        if meta is None or meta.get("version") != CORPUS_VERSION:
+            return build_corpus(index_path, path)
+
+        rows = meta["rows"]
+        file = partial(os.path.join, path, build)
+        offsets = {name: np.fromfile(file(f"{name}.data.offsets"), dtype=np.int64, count=rows + 1)
+                   for name in STRING_COLUMNS + ("terms",)}
+
+        new_jobs = {}
+        for job in jobs:
+            new_jobs.setdefault(job_key(job), job)
+        if new_jobs:
+            # Hash matches are confirmed against the stored keys
+            key_data = _open_array(file("key.data"), "uint8", int(offsets["key"][-1]))
+            new_hashes = np.frombuffer(b"".join(_key_hash(key) for key in new_jobs), dtype=np.uint64)
+            key_hashes = _open_array(file("key_hash.data"), "uint64", rows)
+            for row in np.flatnonzero(np.isin(key_hashes, new_hashes)).tolist():
+                new_jobs.pop(bytes(key_data[offsets["key"][row]:offsets["key"][row + 1]]).decode("utf-8"), None)
+        if not new_jobs:
+            return rows
+
+        # New rows are written right after the last complete row, over anything an interrupted append left
+        generation = meta["generation"]
+        idf_file, weights_file = _weight_files(generation)
+        nnz = int(offsets["terms"][-1])
+        now = time.time()
+        columns = {name: [] for name in STRING_COLUMNS}
+        for key, job in new_jobs.items():
+            values = {"key": key, "source": job.source, "job_id": job.job_id, "title": job.title,
+                      "company": job.company, "location": job.location,
+                      "search_location": normalize_query(search_location), "apply_link": job.apply_link}
+            for name in STRING_COLUMNS:
+                columns[name].append(str(values[name] or "").encode("utf-8"))
+        for name, values in columns.items():
+            _append_rows(file(f"{name}.data"), values, rows, int(offsets[name][-1]))
+        _write_at(file("posted_ts.data"), 8 * rows,
+                  np.asarray([posted_timestamp(job.posted_at, now) for job in new_jobs.values()],
+                             dtype=np.float64).tobytes())
+        _write_at(file("key_hash.data"), 8 * rows, b"".join(_key_hash(key) for key in new_jobs))
+
+        counted = batch_term_counts([(job.title, job.description) for job in new_jobs.values()])
+        ids = np.concatenate([features for features, _ in counted])
+        counts = np.concatenate([term_counts for _, term_counts in counted])
+        _append_rows(file("terms.data"), [features.tobytes() for features, _ in counted], rows, nnz, itemsize=4)
+        _write_at(file("terms.counts"), 4 * nnz, counts.tobytes())
+
+        rows += len(new_jobs)
+        meta["rows"] = rows
+        meta["updated_at"] = datetime.now().isoformat()
+        if rows >= meta["weighted_rows"] * (1 + _REWEIGHT_GROWTH):
+            meta["generation"] = generation + 1
+            meta["weighted_rows"] = rows
+            _write_weights(file(), rows, meta["generation"])
+        else:
+            indptr = np.concatenate(([0], np.cumsum([features.size for features, _ in counted])))
+            idf = np.fromfile(file(idf_file), dtype=np.float32)
+            data, _ = tfidf_weights(ids, counts, indptr, idf=idf)
+            _write_at(file(weights_file), 4 * nnz, data.tobytes())
+        _write_meta(file(), meta)
+        _remove_stale(path, build, meta["generation"])
+        return rows
+
+
+def _write_at(path: str, position: int, data: bytes) -> None:
+    """
+    Write bytes at a position of an existing file.
+
+    Files are never truncated: Windows refuses to shrink a file another
+    process has memory-mapped, and readers ignore bytes past their rows.
+    """
+    with open(path, "r+b") as f:
+        f.seek(position)
+        f.write(data)
+
+
+def _append_rows(path: str, rows: List[bytes], row_count: int, end: int, itemsize: int = 1) -> None:
+    """
+    Write variable-length rows after the first `row_count` rows of a data
+    file (ending at item `end`) and their end offsets to its offsets file.
+    """
+    _write_at(path, end * itemsize, b"".join(rows))
+    _write_at(f"{path}.offsets", 8 * (row_count + 1),
+              (end + np.cumsum([len(row) // itemsize for row in rows], dtype=np.int64)).tobytes())
+
+
+def _read_meta(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_file(path: str, text: str) -> None:
+    """Replace a small file atomically (it is read, never memory-mapped)."""
+    tmp_file = f"{path}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_file, path)
+
+
+def _write_meta(path: str, meta: Dict[str, Any]) -> None:
+    """Replace meta.json atomically; its row count is what readers see."""
+    _write_file(os.path.join(path, "meta.json"), json.dumps(meta))
+
+
+def _write_terms(texts: List[Tuple[str, str]], terms: _OffsetsWriter, counts_file) -> None:
+    """Tokenize a batch of (title, description) pairs and append their term rows."""
+    for features, counts in batch_term_counts(texts):
+        terms.append(features.tobytes())
+        counts_file.write(counts.tobytes())
+
+
+def _write_weights(path: str, rows: int, generation: int) -> None:
+    """Compute the IDF of the first `rows` rows and write it with their L2-normalized TF-IDF weights."""
+    offsets = np.fromfile(os.path.join(path, "terms.data.offsets"), dtype=np.int64, count=rows + 1)
+    ids = _open_array(os.path.join(path, "terms.data"), "int32", int(offsets[-1]))
+    counts = _open_array(os.path.join(path, "terms.counts"), "int32", int(offsets[-1]))
+
+    # Feature ids are unique within a row, so their counts are document frequencies
+    df = np.zeros(N_FEATURES, dtype=np.int64)
+    for first in range(0, rows, _WEIGHT_CHUNK_ROWS):
+        df += np.bincount(ids[offsets[first]:offsets[min(first + _WEIGHT_CHUNK_ROWS, rows)]], minlength=N_FEATURES)
+    idf = inverse_document_frequency(df, rows)
+
+    idf_file, weights_file = _weight_files(generation)
+    with open(os.path.join(path, weights_file), "wb") as f:
+        for first in range(0, rows, _WEIGHT_CHUNK_ROWS):
+            bounds = offsets[first:first + _WEIGHT_CHUNK_ROWS + 1]
+            start, end = bounds[0], bounds[-1]
+            data, _ = tfidf_weights(ids[start:end], counts[start:end], bounds - start, idf=idf)
+            f.write(data.tobytes())
+    idf.tofile(os.path.join(path, idf_file))
+
+
+class JobCorpus:
+    """
+    Read-only, memory-mapped columnar view of the job corpus.
+
+    Columns are only paged in when touched, so opening the corpus is cheap
+    and single fields can be read without deserializing whole postings.
+    The build CURRENT_FILE names is opened, and only the rows recorded in
+    its meta.json are mapped, so rows being appended stay invisible until
+    they are complete.
+    """
+
+    def __init__(self, path: str = CORPUS_DIR):
+        self.path = path
+        self.build = _current_build(path)
+        if self.build is None:
+            raise FileNotFoundError(f"no job corpus in {path}")
+        with open(self._file("meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") != CORPUS_VERSION:
+            raise ValueError(f"job corpus version {self.meta.get('version')} is outdated; rebuild it")
+        self.rows = self.meta["rows"]
+
+        self._strings = {}
+        for name in STRING_COLUMNS:
+            offsets = np.fromfile(self._file(f"{name}.data.offsets"), dtype=np.int64, count=self.rows + 1)
+            self._strings[name] = (_open_array(self._file(f"{name}.data"), "uint8", int(offsets[-1])), offsets)
+        self.posted_ts = _open_array(self._file("posted_ts.data"), "float64", self.rows)
+        self.term_offsets = np.fromfile(self._file("terms.data.offsets"), dtype=np.int64, count=self.rows + 1)
+        nnz = int(self.term_offsets[-1])
+        idf_file, weights_file = _weight_files(self.meta["generation"])
+        self.term_ids = _open_array(self._file("terms.data"), "int32", nnz)
+        self.term_counts = _open_array(self._file("terms.counts"), "int32", nnz)
+        self.term_weights = _open_array(self._file(weights_file), "float32", nnz)
+        self.idf = _open_array(self._file(idf_file), "float32", N_FEATURES)
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, self.build, name)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def value(self, column: str, row: int) -> str:
+        """Decode one text field of one posting."""
+        data, offsets = self._strings[column]
+        return bytes(data[offsets[row]:offsets[row + 1]]).decode("utf-8")
+
+    def values(self, column: str, rows) -> List[str]:
+        """Decode one text field for several postings."""
+        return [self.value(column, row) for row in np.asarray(rows).tolist()]
+
+    def _rows_containing(self, column: str, needle: str) -> np.ndarray:
+        """
+        Rows whose text field contains `needle` (ASCII case-insensitive).
+
+        The memory-mapped bytes are searched a chunk of whole rows at a
+        time, so at most _SCAN_CHUNK_BYTES of the column are held at once.
+        """
+        data, offsets = self._strings[column]
+        target = needle.lower().encode("utf-8")
+        found = []
+        first = 0
+        while first < self.rows:
+            last = int(np.searchsorted(offsets, offsets[first] + _SCAN_CHUNK_BYTES, side="right")) - 1
+            last = min(max(last, first + 1), self.rows)
+            base = offsets[first]
+            haystack = data[base:offsets[last]].tobytes().lower()
+
+            positions = []
+            start = haystack.find(target)
+            while start != -1:
+                positions.append(start)
+                start = haystack.find(target, start + 1)
+            if positions:
+                starts = np.asarray(positions, dtype=np.int64) + base
+                rows = np.searchsorted(offsets, starts, side="right") - 1
+                # Drop matches that straddle two rows
+                found.append(rows[starts + len(target) <= offsets[rows + 1]])
+            first = last
+
+        if not found:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate(found))
+
+    def filter(self, keywords: str = "", location: Optional[str] = None,
+               posted_after: Optional[float] = None) -> np.ndarray:
+        """
+        Select postings with array operations over the memory-mapped columns.
+
+        Args:
+            keywords: Every (non-stopword) word must appear in the title or description
+            location: Substring of the job location or the location it was searched for
+            posted_after: Only postings with a posting timestamp after this
+
+        Returns:
+            Sorted array of matching row numbers
+        """
+        mask = np.ones(self.rows, dtype=bool)
+        if posted_after is not None:
+            mask &= self.posted_ts > posted_after
+        if location:
+            located = np.zeros(self.rows, dtype=bool)
+            located[self._rows_containing("location", location.strip())] = True
+            located[self._rows_containing("search_location", normalize_query(location))] = True
+            mask &= located
+        if keywords:
+            features = np.unique([feature_id(token) for token in tokenize(keywords)])
+            if features.size:
+                hits = np.flatnonzero(np.isin(self.term_ids, features))
+                hit_rows = np.searchsorted(self.term_offsets, hits, side="right") - 1
+                # Feature ids are unique within a row, so a full match hits every feature once
+                mask &= np.bincount(hit_rows, minlength=self.rows) == features.size
+        return np.flatnonzero(mask)
+
+    def rank(self, resume_text: str, rows: Optional[np.ndarray] = None, top_n: int = 10,
+             top_terms: int = 3) -> List[Tuple[int, float, List[str]]]:
+        """
+        Rank postings by TF-IDF cosine similarity to a resume.
+
+        Args:
+            resume_text: Resume text
+            rows: Candidate rows, e.g. from filter() (default: the whole corpus)
+            top_n: Number of postings returned
+            top_terms: Number of matching terms reported per posting
+
+        Returns:
+            List of (row, score 0-1, top matching terms), best fit first
+        """
+        if rows is None:
+            rows = np.arange(self.rows)
+            data, indices, indptr = self.term_weights, self.term_ids, self.term_offsets
+        else:
+            rows = np.asarray(rows, dtype=np.int64)
+            positions, indptr = gather_rows(self.term_offsets, rows)
+            data, indices = self.term_weights[positions], self.term_ids[positions]
+        if not rows.size:
+            return []
+
+        scores, best, top = score_matrix(resume_text, data, indices, indptr, self.idf,
+                                         top_terms=top_terms, top_n=top_n)
+        return [(int(rows[i]), round(float(scores[i]), 4), terms) for i, terms in zip(best.tolist(), top)]
+
+    def records(self, rows) -> List[Dict[str, Any]]:
+        """Compact dictionaries (as in Job.to_dict()) for the given rows."""
+        records = []
+        for row in np.asarray(rows).tolist():
+            record = {name: self.value(name, row) for name in STRING_COLUMNS if name not in ("key", "search_location")}
+            record["city"] = record["location"].split(",")[0].strip()
+            posted = float(self.posted_ts[row])
+            record["posted_at"] = datetime.fromtimestamp(posted, tz=timezone.utc).isoformat() if posted else ""
+            records.append(record)
+        return records
+
+
+_corpus: Optional[JobCorpus] = None
+_corpus_version: Tuple[Optional[str], float] = (None, 0.0)
+_corpus_lock = threading.Lock()
+
+
+def get_corpus(path: str = CORPUS_DIR) -> Optional[JobCorpus]:
+    """
+    Get the shared corpus, reopening it after a rebuild or append.
+
+    Returns:
+        JobCorpus, or None if no corpus has been built yet
+    """
+    global _corpus, _corpus_version
+    build = _current_build(path)
+    if build is None:
+        return None
+    try:
+        version = (build, os.path.getmtime(os.path.join(path, build, "meta.json")))
+    except OSError:
+        return None
+
+    with _corpus_lock:
+        if _corpus is None or _corpus.path != path or version != _corpus_version:
+            # Drop the old mappings first, so a stale build can be deleted on Windows
+            _corpus = None
+            try:
+                _corpus = JobCorpus(path)
+                _corpus_version = version
+            except Exception as e:
+                print(f"Error opening job corpus: {e}")
+                return None
+        return _corpus
+
+
+def recommend_jobs(resume_text: str, location: Optional[str] = None,
+                   max_age_days: Optional[float] = INDEX_MAX_AGE_DAYS, top_n: int = 10,
+                   path: str = CORPUS_DIR, index_path: str = INDEX_FILE) -> List:
+    """
+    Find the harvested postings that best fit a resume.
+
+    The whole corpus is ranked with its precomputed weights; only the
+    best postings are then loaded from the job index.
+
+    Args:
+        resume_text: Resume text
+        location: Job location (optional)
+        max_age_days: Only use postings posted within this many days (None for any age)
+        top_n: Maximum number of jobs returned
+        path: Corpus directory
+        index_path: Job index database
+
+    Returns:
+        List of Job records, best fit first (empty without a corpus)
+    """
+    corpus = get_corpus(path)
+    if corpus is None or not resume_text:
+        return []
+    try:
+        posted_after = time.time() - max_age_days * 86400 if max_age_days is not None else None
+        rows = corpus.filter(location=location, posted_after=posted_after)
+        ranked = corpus.rank(resume_text, rows=rows, top_n=top_n, top_terms=0)
+        keys = corpus.values("key", [row for row, score, _ in ranked if score > 0])
+    except Exception as e:
+        print(f"Error ranking job corpus: {e}")
+        return []
+    return get_indexed_jobs(keys, path=index_path)
@@ -0,0 +1,151 @@
+import re
+import zlib
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from src.job_api import Job
+
+
+# MinHash / LSH settings: 32 hash functions split into 8 bands of 4 rows.
+# Pairs with shingle Jaccard similarity >= 0.8 land in a shared band ~98% of the time.
+NUM_PERMUTATIONS = 32
+BAND_ROWS = 4
+SHINGLE_SIZE = 3
+SIMILARITY_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_PERMUTATIONS = [
+    (1 + (i * 0x9E3779B1) % (_MERSENNE_PRIME - 1), (i * 0x85EBCA77 + 0xC2B2AE3D) % _MERSENNE_PRIME)
+    for i in range(1, NUM_PERMUTATIONS + 1)
+]
+
+_COMPANY_SUFFIXES = re.compile(
+    r"\b(inc|llc|ltd|limited|co|corp|corporation|company|plc|gmbh|group|holding|holdings)\b"
+)
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def _normalize(text: Any) -> str:
+    """Lowercase and collapse everything except letters and digits to single spaces."""
+    return _NON_ALNUM.sub(" ", str(text or "").lower()).strip()
+
+
+def _url_host(url: str) -> str:
+    """Get the host of an apply URL without a leading 'www.'."""
+    host = urlsplit(url if "//" in url else f"//{url}").hostname or ""
+    return host[4:] if host.startswith("www.") else host
+
+
+def job_fingerprint(job: "Job") -> Tuple[str, str, str, str]:
+    """
+    Build the normalized (title, company, city, apply host) fingerprint of a job.
+
+    Args:
+        job: Job record
+
+    Returns:
+        Tuple of normalized fields
+    """
+    title = _normalize(job.title)
+    company = _COMPANY_SUFFIXES.sub(" ", _normalize(job.company))
+    city = _normalize(job.city)
+    host = _url_host(job.apply_link)
+    return title, " ".join(company.split()), city, host
+
+
+def _minhash(text: str) -> List[int]:
+    """Compute the MinHash signature of the character shingles of `text`."""
+    padded = f" {text} "
+    shingles = {zlib.crc32(padded[i:i + SHINGLE_SIZE].encode("utf-8"))
+                for i in range(max(len(padded) - SHINGLE_SIZE + 1, 1))}
+    return [
+        min(((a * s + b) % _MERSENNE_PRIME) & _MAX_HASH for s in shingles)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def _similarity(sig_a: List[int], sig_b: List[int]) -> float:
+    """Estimate Jaccard similarity from two MinHash signatures."""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERMUTATIONS
+
+
+def _is_near_duplicate(candidate: Tuple[List[int], List[int], str], other: Tuple[List[int], List[int], str],
+                       threshold: float) -> bool:
+    """Check whether two (title signature, company signature, city) entries describe the same posting."""
+    title_sig, company_sig, city = candidate
+    other_title_sig, other_company_sig, other_city = other
+    if city and other_city and city != other_city:
+        return False
+    return (_similarity(title_sig, other_title_sig) >= threshold
+            and _similarity(company_sig, other_company_sig) >= threshold)
+
+
+class JobDeduper:
+    """
+    Incremental de-duplicator for a stream of jobs.
+
+    Jobs with identical fingerprints are rejected directly. Otherwise jobs are
+    bucketed with MinHash LSH over title shingles, and only jobs sharing a
+    bucket are compared (title and company similarity, same city), so each
+    add() costs roughly constant time.
+    """
+
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self.collapsed = 0
+        self._fingerprints = set()
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[Tuple[List[int], List[int], str]]] = {}
+
+    def add(self, job: "Job") -> bool:
+        """
+        Register a job.
+
+        Args:
+            job: Job record
+
+        Returns:
+            True if the job is new, False if it duplicates an earlier one
+        """
+        fingerprint = job_fingerprint(job)
+        if fingerprint in self._fingerprints:
+            self.collapsed += 1
+            return False
+
+        title, company, city, _ = fingerprint
+        entry = (_minhash(title), _minhash(company), city)
+        bands = [
+            (band, tuple(entry[0][band * BAND_ROWS:(band + 1) * BAND_ROWS]))
+            for band in range(NUM_PERMUTATIONS // BAND_ROWS)
+        ]
+
+        is_duplicate = any(
+            _is_near_duplicate(entry, other, self.threshold)
+            for key in bands
+            for other in self._buckets.get(key, [])
+        )
+        if is_duplicate:
+            self.collapsed += 1
+            return False
+
+        self._fingerprints.add(fingerprint)
+        for key in bands:
+            self._buckets.setdefault(key, []).append(entry)
+        return True
+
+
+def dedupe_jobs(jobs: List["Job"], threshold: float = SIMILARITY_THRESHOLD) -> Tuple[List["Job"], int]:
+    """
+    Remove exact and near-duplicate job postings, keeping the first occurrence.
+
+    Args:
+        jobs: Job records, in priority order
+        threshold: Minimum estimated similarity to treat two jobs as duplicates
+
+    Returns:
+        Tuple of (unique jobs, number of jobs collapsed)
+    """
+    deduper = JobDeduper(threshold)
+    unique = [job for job in jobs if deduper.add(job)]
+    return unique, deduper.collapsed
@@ -0,0 +1,258 @@
+import argparse
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from src.analytics_manager import get_top_keywords
+from src.job_api import Job, fetch_rapidapi_page, is_source_available
+from src.job_cache import normalize_query
+from src.job_corpus import append_corpus
+from src.job_index import INDEX_MAX_AGE_DAYS, index_jobs, posted_timestamp
+
+load_dotenv()
+
+
+STATE_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "harvest_state.json")
+
+HARVEST_TOP_K = int(os.getenv("HARVEST_TOP_K", 5))
+HARVEST_LOCATIONS = [loc.strip() for loc in os.getenv("HARVEST_LOCATIONS", "Saudi Arabia").split(",") if loc.strip()]
+HARVEST_INTERVAL = int(os.getenv("HARVEST_INTERVAL", 60 * 60))
+HARVEST_MAX_PAGES = int(os.getenv("HARVEST_MAX_PAGES", 3))
+HARVEST_RUN_HISTORY = 20  # run stats kept in the state file
+
+# JSearch posting-date windows, narrowest first, with their length in days
+_DATE_WINDOWS = [("today", 1), ("3days", 3), ("week", 7), ("month", 30)]
+
+_state_lock = threading.Lock()
+
+
+def _load_state() -> Dict[str, Any]:
+    """Load sync cursors and run history from disk."""
+    try:
+        if os.path.exists(STATE_FILE):
+            with open(STATE_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    except Exception as e:
+        print(f"Error loading harvest state: {e}")
+    return {"cursors": {}, "runs": []}
+
+
+def _save_state(state: Dict[str, Any]) -> None:
+    """Write sync cursors and run history to disk atomically."""
+    try:
+        os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+        tmp_path = f"{STATE_FILE}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, STATE_FILE)
+    except Exception as e:
+        print(f"Error saving harvest state: {e}")
+
+
+def _query_key(keyword: str, location: str) -> str:
+    """Cursor key for a keyword/location pair."""
+    return f"{normalize_query(keyword)}|{normalize_query(location)}"
+
+
+def _date_window(cursor: Optional[float], now: float) -> str:
+    """Narrowest JSearch date window that still covers everything newer than the cursor."""
+    if cursor is None:
+        cursor = now - INDEX_MAX_AGE_DAYS * 86400
+    age_days = (now - cursor) / 86400
+    for window, days in _DATE_WINDOWS:
+        if age_days <= days:
+            return window
+    return "all"
+
+
+def harvest_query(keyword: str, location: str, cursor: Optional[float] = None,
+                  max_pages: int = HARVEST_MAX_PAGES, start_page: int = 1) -> Dict[str, Any]:
+    """
+    Fetch postings newer than the cursor for one keyword/location and index them.
+
+    Pages are requested until one contains no posting newer than the cursor.
+    Postings without a usable posting date are indexed too, but they
+    neither advance the cursor nor keep the paging going. If `max_pages`
+    runs out first, older new postings may still be on later pages, so the
+    cursor is kept and the next page is returned as `resume_page`.
+
+    Args:
+        keyword: Search keyword
+        location: Job location
+        cursor: Posting timestamp of the newest job already harvested (None for a first sync)
+        max_pages: Maximum number of result pages requested
+        start_page: First result page requested (a previous run's resume_page)
+
+    Returns:
+        Dictionary with pages, fetched, new_jobs, undated, written, the new
+        cursor (unchanged unless paging completed), newest (latest posting
+        timestamp seen, or None), resume_page (None when paging completed)
+        and jobs (the Job records written)
+    """
+    rapidapi_key = os.getenv("RAPIDAPI_KEY")
+    if not rapidapi_key:
+        raise RuntimeError("RAPIDAPI_KEY not found")
+
+    now = time.time()
+    window = _date_window(cursor, now)
+    result = {"pages": 0, "fetched": 0, "new_jobs": 0, "undated": 0, "written": 0, "cursor": cursor,
+              "newest": None, "resume_page": start_page + max_pages, "jobs": []}
+
+    for page in range(start_page, start_page + max_pages):
+        items = fetch_rapidapi_page(rapidapi_key, keyword, location, page, date_posted=window)
+        result["pages"] += 1
+        result["fetched"] += len(items)
+
+        new_jobs: List[Job] = []
+        undated: List[Job] = []
+        for item in items:
+            job = Job.from_rapidapi(item)
+            posted = posted_timestamp(job.posted_at, None)
+            if posted is None:
+                undated.append(job)
+            elif cursor is None or posted > cursor:
+                new_jobs.append(job)
+                result["newest"] = max(result["newest"] or 0.0, posted)
+
+        if new_jobs or undated:
+            result["new_jobs"] += len(new_jobs)
+            result["undated"] += len(undated)
+            result["written"] += index_jobs(new_jobs + undated, search_location=location)
+            result["jobs"] += new_jobs + undated
+        if not new_jobs:
+            result["resume_page"] = None
+            break
+
+    if result["resume_page"] is None and result["newest"] is not None:
+        result["cursor"] = max(cursor or 0.0, result["newest"])
+    return result
+
+
+def run_harvest(top_k: int = HARVEST_TOP_K, locations: Optional[List[str]] = None,
+                max_pages: int = HARVEST_MAX_PAGES, update_corpus: bool = True) -> Dict[str, Any]:
+    """
+    Harvest new postings for the most frequent analytics keywords.
+
+    Each keyword/location pair keeps its own sync cursor, so only postings
+    newer than the previous run are fetched. Cursors only advance for
+    queries that completed without errors and paged through every new
+    posting; a query cut short by `max_pages` resumes from its next page
+    on the following run.
+
+    Args:
+        top_k: Number of top keywords (from get_top_keywords) to harvest
+        locations: Locations searched for every keyword (default HARVEST_LOCATIONS)
+        max_pages: Maximum result pages per query
+        update_corpus: Append new postings to the columnar job corpus
+
+    Returns:
+        Run statistics: queries, pages, fetched, new_jobs, undated, written, errors,
+        skipped, seconds and jobs_per_second (plus corpus_rows and
+        corpus_seconds when the corpus was updated)
+    """
+    locations = locations or HARVEST_LOCATIONS
+    keywords = [keyword for keyword, _ in get_top_keywords(top_k)]
+    started = time.monotonic()
+    stats = {"started_at": datetime.now().isoformat(), "queries": 0, "pages": 0, "fetched": 0,
+             "new_jobs": 0, "undated": 0, "written": 0, "errors": 0, "skipped": 0}
+
+    with _state_lock:
+        state = _load_state()
+    cursors = state.get("cursors", {})
+    updated = {}
+
+    for keyword in keywords:
+        for location in locations:
+            if not is_source_available("rapidapi"):
+                stats["skipped"] += 1
+                continue
+
+            key = _query_key(keyword, location)
+            entry = cursors.get(key, {})
+            stats["queries"] += 1
+            try:
+                result = harvest_query(keyword, location, cursor=entry.get("cursor"), max_pages=max_pages,
+                                       start_page=entry.get("resume_page") or 1)
+            except Exception as e:
+                print(f" Harvest error for '{keyword}' in '{location}': {e}")
+                stats["errors"] += 1
+                continue
+
+            for name in ("pages", "fetched", "new_jobs", "undated", "written"):
+                stats[name] += result[name]
+            if update_corpus and result["written"]:
+                corpus_started = time.monotonic()
+                try:
+                    stats["corpus_rows"] = append_corpus(result["jobs"], search_location=location)
+                except Exception as e:
+                    print(f"Error updating job corpus: {e}")
+                stats["corpus_seconds"] = round(stats.get("corpus_seconds", 0.0) + time.monotonic() - corpus_started, 2)
+            # A sync cut short by max_pages keeps its cursor and remembers the newest posting it saw,
+            # which becomes the cursor once a later run has paged through the rest
+            cursor = result["cursor"]
+            pending = max(entry.get("pending_cursor") or 0.0, result["newest"] or 0.0) or None
+            if result["resume_page"] is None and pending is not None:
+                cursor, pending = max(cursor or 0.0, pending), None
+            updated[key] = {
+                "cursor": cursor,
+                "pending_cursor": pending,
+                "resume_page": result["resume_page"],
+                "last_sync": time.time(),
+                "total_jobs": entry.get("total_jobs", 0) + result["written"]
+            }
+
+    seconds = time.monotonic() - started
+    stats["seconds"] = round(seconds, 2)
+    stats["jobs_per_second"] = round(stats["fetched"] / seconds, 2) if seconds else 0.0
+
+    with _state_lock:
+        # Merge into the latest state so cursors written by a concurrent run are kept
+        latest = _load_state()
+        latest.setdefault("cursors", {}).update(updated)
+        latest["runs"] = (latest.get("runs", []) + [stats])[-HARVEST_RUN_HISTORY:]
+        _save_state(latest)
+
+    print(f" Harvest: {stats['new_jobs']} new jobs from {stats['queries']} queries in {stats['seconds']}s")
+    return stats
+
+
+def get_harvest_stats() -> Dict[str, Any]:
+    """
+    Get the sync cursor of every harvested query and recent run statistics.
+
+    Returns:
+        Dictionary with "cursors" (keyed by "keyword|location") and "runs" (oldest first)
+    """
+    with _state_lock:
+        return _load_state()
+
+
+def run_forever(interval: int = HARVEST_INTERVAL, **kwargs) -> None:
+    """Run a harvest every `interval` seconds until interrupted."""
+    while True:
+        try:
+            run_harvest(**kwargs)
+        except Exception as e:
+            print(f"Error running harvest: {e}")
+        time.sleep(interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Harvest new job postings for the top analytics keywords.")
+    parser.add_argument("--once", action="store_true", help="run a single harvest and exit")
+    parser.add_argument("--top-k", type=int, default=HARVEST_TOP_K)
+    parser.add_argument("--interval", type=int, default=HARVEST_INTERVAL, help="seconds between runs")
+    parser.add_argument("--max-pages", type=int, default=HARVEST_MAX_PAGES)
+    parser.add_argument("--no-corpus", action="store_true", help="do not update the columnar job corpus")
+    args = parser.parse_args()
+
+    options = {"top_k": args.top_k, "max_pages": args.max_pages, "update_corpus": not args.no_corpus}
+    if args.once:
+        print(json.dumps(run_harvest(**options), indent=2))
+    else:
+        run_forever(args.interval, **options)
@@ -0,0 +1,314 @@
+import atexit
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence
+
+from src.job_cache import normalize_query
+
+
+INDEX_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "jobs_index.db")
+
+# Indexed postings older than this are not used for recommendations
+INDEX_MAX_AGE_DAYS = int(os.getenv("JOB_INDEX_MAX_AGE_DAYS", 30))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    job_id TEXT,
+    title TEXT,
+    company TEXT,
+    city TEXT,
+    location TEXT,
+    apply_link TEXT,
+    posted_at TEXT,
+    posted_ts REAL,
+    fetched_at REAL,
+    search_location TEXT,
+    raw BLOB
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_posted_ts ON jobs(posted_ts);
+CREATE INDEX IF NOT EXISTS idx_jobs_search_location ON jobs(search_location);
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(title, company, location, description);
+"""
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_schema_lock = threading.Lock()
+_schema_ready = set()
+
+
+def _connect(path: str = INDEX_FILE) -> sqlite3.Connection:
+    """Open a connection to the job index, creating the schema on first use."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10)
+    conn.row_factory = sqlite3.Row
+    if path not in _schema_ready:
+        with _schema_lock:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            _schema_ready.add(path)
+    return conn
+
+
+def job_key(job) -> str:
+    """Stable identity for a posting: source id when available, otherwise its visible fields."""
+    if job.job_id:
+        return f"{job.source}:{job.job_id}"
+    return f"{job.source}:{normalize_query(job.title)}|{normalize_query(job.company)}|{job.apply_link}"
+
+
+def posted_timestamp(posted_at: str, fallback: Optional[float]) -> Optional[float]:
+    """Parse an ISO posting date; return `fallback` (e.g. the fetch time) when missing or unparseable."""
+    try:
+        return datetime.fromisoformat(posted_at.replace("Z", "+00:00")).timestamp()
+    except (AttributeError, ValueError):
+        return fallback
+
+
+def index_jobs(jobs: Iterable, search_location: str = "", path: str = INDEX_FILE) -> int:
+    """
+    Add or update jobs in the local index.
+
+    Args:
+        jobs: Job records
+        search_location: Location the jobs were searched for (used for location queries)
+        path: Index database file
+
+    Returns:
+        Number of jobs written
+    """
+    now = time.time()
+    count = 0
+    try:
+        conn = _connect(path)
+    except Exception as e:
+        print(f"Error indexing jobs: {e}")
+        return count
+    try:
+        with conn:
+            for job in jobs:
+                # Undated postings are first indexed as fetched now; a later fetch without a date keeps that
+                posted_ts = posted_timestamp(job.posted_at, None)
+                conn.execute(
+                    """INSERT INTO jobs (key, source, job_id, title, company, city, location, apply_link,
+                                         posted_at, posted_ts, fetched_at, search_location, raw)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                       ON CONFLICT(key) DO UPDATE SET
+                           title=excluded.title, company=excluded.company, city=excluded.city,
+                           location=excluded.location, apply_link=excluded.apply_link,
+                           posted_at=CASE WHEN excluded.posted_at != '' THEN excluded.posted_at ELSE posted_at END,
+                           posted_ts=CASE WHEN ? IS NULL THEN posted_ts ELSE excluded.posted_ts END,
+                           fetched_at=excluded.fetched_at, search_location=excluded.search_location,
+                           raw=excluded.raw""",
+                    (job_key(job), job.source, job.job_id, job.title, job.company, job.city, job.location,
+                     job.apply_link, job.posted_at, now if posted_ts is None else posted_ts, now,
+                     normalize_query(search_location), job._raw_blob, posted_ts)
+                )
+                rowid = conn.execute("SELECT id FROM jobs WHERE key = ?", (job_key(job),)).fetchone()[0]
+                conn.execute("DELETE FROM jobs_fts WHERE rowid = ?", (rowid,))
+                conn.execute(
+                    "INSERT INTO jobs_fts (rowid, title, company, location, description) VALUES (?, ?, ?, ?, ?)",
+                    (rowid, job.title, job.company, job.location, job.description)
+                )
+                count += 1
+    except Exception as e:
+        print(f"Error indexing jobs: {e}")
+    finally:
+        conn.close()
+    return count
+
+
+_index_queue: queue.Queue = queue.Queue()
+_indexer: Optional[threading.Thread] = None
+_indexer_lock = threading.Lock()
+
+
+def _run_indexer() -> None:
+    while True:
+        jobs, search_location, path, after_index = _index_queue.get()
+        try:
+            index_jobs(jobs, search_location, path)
+            if after_index is not None:
+                after_index(jobs)
+        except Exception as e:
+            print(f"Error processing indexed jobs: {e}")
+        finally:
+            _index_queue.task_done()
+
+
+def index_jobs_async(jobs: Iterable, search_location: str = "", path: str = INDEX_FILE,
+                     after_index: Optional[Callable[[List], object]] = None) -> None:
+    """
+    Queue freshly fetched jobs for index_jobs() on a background thread.
+
+    Searches hand their results over and return without waiting on the
+    index write; the queue is drained at exit.
+
+    Args:
+        jobs: Job records
+        search_location: Location the jobs were searched for
+        path: Index database file
+        after_index: Called with the jobs on the same thread once they are indexed
+    """
+    global _indexer
+    jobs = list(jobs)
+    if not jobs:
+        return
+    with _indexer_lock:
+        if _indexer is None:
+            atexit.register(flush_index_queue)
+        if _indexer is None or not _indexer.is_alive():
+            _indexer = threading.Thread(target=_run_indexer, name="job-indexer", daemon=True)
+            _indexer.start()
+    _index_queue.put((jobs, search_location, path, after_index))
+
+
+def flush_index_queue() -> None:
+    """Block until every job queued by index_jobs_async() has been indexed."""
+    _index_queue.join()
+
+
+def _fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query matching every word (as a prefix)."""
+    return " ".join(f'"{token}"*' for token in _TOKEN.findall(text.lower()))
+
+
+def search_index(query: str, location: Optional[str] = None, max_age_days: Optional[float] = INDEX_MAX_AGE_DAYS,
+                 limit: int = 10, path: str = INDEX_FILE) -> List:
+    """
+    Search the local job index.
+
+    Args:
+        query: Keywords; every word must appear in the title, company,
+            location or description
+        location: Search location or a substring of the job location (optional)
+        max_age_days: Only return jobs posted within this many days (None for any age)
+        limit: Maximum number of jobs returned
+
+    Returns:
+        List of Job records, best match first
+    """
+    fts_query = _fts_query(query)
+    if not fts_query:
+        return []
+
+    sql = """SELECT jobs.* FROM jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid
+             WHERE jobs_fts MATCH ?"""
+    params: list = [fts_query]
+    if location:
+        sql += " AND (jobs.search_location = ? OR jobs.location LIKE ?)"
+        params += [normalize_query(location), f"%{location.strip()}%"]
+    if max_age_days is not None:
+        sql += " AND jobs.posted_ts >= ?"
+        params.append(time.time() - max_age_days * 86400)
+    sql += " ORDER BY bm25(jobs_fts), jobs.posted_ts DESC LIMIT ?"
+    params.append(limit)
+
+    try:
+        conn = _connect(path)
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"Error searching job index: {e}")
+        return []
+
+    return [_row_job(row) for row in rows]
+
+
+def get_indexed_jobs(keys: Sequence[str], path: str = INDEX_FILE) -> List:
+    """
+    Load indexed postings by key.
+
+    Args:
+        keys: Posting keys (see job_key())
+        path: Index database file
+
+    Returns:
+        List of Job records in the order of `keys` (keys not in the index are skipped)
+    """
+    if not keys:
+        return []
+    try:
+        conn = _connect(path)
+        try:
+            rows = conn.execute(f"SELECT * FROM jobs WHERE key IN ({', '.join('?' * len(keys))})",
+                                list(keys)).fetchall()
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"Error reading job index: {e}")
+        return []
+
+    by_key = {row["key"]: row for row in rows}
+    return [_row_job(by_key[key]) for key in keys if key in by_key]
+
+
+def _row_job(row: sqlite3.Row):
+    """Job record for a row of the jobs table."""
+    from src.job_api import Job
+
+    return Job(source=row["source"], job_id=row["job_id"], title=row["title"], company=row["company"],
+               city=row["city"], location=row["location"], apply_link=row["apply_link"],
+               posted_at=row["posted_at"], _raw_blob=row["raw"] or b"")
+
+
+def get_index_size(path: str = INDEX_FILE) -> int:
+    """Get the number of postings in the local index."""
+    try:
+        conn = _connect(path)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"Error reading job index: {e}")
+        return 0
+
+
+def prune_index(max_age_days: float = 90, path: str = INDEX_FILE) -> int:
+    """
+    Delete postings older than `max_age_days` from the index.
+
+    Returns:
+        Number of postings removed
+    """
+    cutoff = time.time() - max_age_days * 86400
+    try:
+        conn = _connect(path)
+        try:
+            with conn:
+                conn.execute("DELETE FROM jobs_fts WHERE rowid IN (SELECT id FROM jobs WHERE posted_ts < ?)",
+                             (cutoff,))
+                return conn.execute("DELETE FROM jobs WHERE posted_ts < ?", (cutoff,)).rowcount
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"Error pruning job index: {e}")
+        return 0
+
+
+def iter_index_rows(batch_size: int = 1000, path: str = INDEX_FILE) -> Iterator[sqlite3.Row]:
+    """
+    Stream every indexed posting in insertion order without loading the table.
+
+    Yields:
+        Rows of the jobs table
+    """
+    conn = _connect(path)
+    try:
+        cursor = conn.execute("SELECT * FROM jobs ORDER BY id")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        conn.close()
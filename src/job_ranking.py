@@ -0,0 +1,297 @@
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Size of the hashed feature space (collisions are rare at this size for job text)
+N_FEATURES = 1 << 18
+TITLE_WEIGHT = 2  # title tokens are counted this many times
+MAX_DESCRIPTION_CHARS = 6000
+FEATURE_CACHE_SIZE = 20000  # jobs whose term counts are kept between ranking calls
+
+# Words of any script (Arabic, accented Latin, ...) at least two characters long, keeping
+# the '+', '#' and inner '.' of names like C++, C# and Node.js
+_TOKEN = re.compile(r"\w[\w+#]+(?:\.\w[\w+#]*)*")
+_STOPWORDS = frozenset("""
+an and are as at be by for from has have in is it its of on or our the to we will with you your
+this that these those their they them can all any more other such than into not but if also who
+في من على إلى عن مع هذا هذه التي الذي أو ثم كان لدى
+""".split())
+# Token -> hashed feature id; stopwords map to -1 so they can be dropped in bulk
+_feature_ids: Dict[str, int] = {word: -1 for word in _STOPWORDS}
+_job_features: "OrderedDict[tuple, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+_job_features_lock = threading.Lock()
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens, dropping stopwords and single characters."""
+    return [t for t in _TOKEN.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def feature_id(token: str) -> int:
+    """Map a token to its hashed feature index (memoized; -1 for stopwords)."""
+    fid = _feature_ids.get(token)
+    if fid is None:
+        fid = zlib.crc32(token.encode("utf-8")) % N_FEATURES
+        if len(_feature_ids) < 500_000:
+            _feature_ids[token] = fid
+    return fid
+
+
+def _token_ids(text: str) -> np.ndarray:
+    """Hashed feature ids of the tokens in `text`, stopwords included as -1."""
+    tokens = _TOKEN.findall(text.lower())
+    return np.fromiter(map(feature_id, tokens), dtype=np.int32, count=len(tokens))
+
+
+def batch_term_counts(texts: Sequence[Tuple[str, str]]) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Term counts of many (title, description) pairs (see text_term_counts()).
+
+    The (document, feature) pairs of all documents are counted with one
+    np.unique call.
+
+    Returns:
+        One (feature ids, counts) pair per text
+    """
+    ids = [np.concatenate([_token_ids(title)] * TITLE_WEIGHT + [_token_ids(description[:MAX_DESCRIPTION_CHARS])])
+           for title, description in texts]
+    docs = np.repeat(np.arange(len(ids), dtype=np.int64), [doc.size for doc in ids])
+    ids = np.concatenate(ids) if ids else np.zeros(0, dtype=np.int32)
+    words = ids >= 0
+    keys, counts = np.unique(docs[words] * N_FEATURES + ids[words], return_counts=True)
+    bounds = np.searchsorted(keys, np.arange(len(texts) + 1, dtype=np.int64) * N_FEATURES).tolist()
+    features = (keys % N_FEATURES).astype(np.int32)
+    counts = counts.astype(np.int32)
+    # Copies, so a cached job does not keep the whole batch's arrays alive
+    return [(features[a:b].copy(), counts[a:b].copy()) for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+def text_term_counts(title: str, description: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Sorted hashed feature ids of a title and description, with their counts (title weighted)."""
+    return batch_term_counts([(title, description)])[0]
+
+
+def _job_key(job) -> tuple:
+    return (job.source, job.job_id) if job.job_id else (job.source, job.title, job.company, job.apply_link)
+
+
+def jobs_term_counts(jobs: Sequence) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Get the sorted hashed feature ids and counts of each job.
+
+    Tokenizing descriptions is the expensive step, so results are kept in a
+    bounded LRU cache keyed by the job's identity, and the jobs missing from
+    it are tokenized together with batch_term_counts().
+
+    Returns:
+        One (feature ids, counts) pair per job
+    """
+    keys = [_job_key(job) for job in jobs]
+    results: List[Optional[Tuple[np.ndarray, np.ndarray]]] = [None] * len(jobs)
+    with _job_features_lock:
+        for i, key in enumerate(keys):
+            cached = _job_features.get(key)
+            if cached is not None:
+                _job_features.move_to_end(key)
+                results[i] = cached
+
+    misses = [i for i, result in enumerate(results) if result is None]
+    if misses:
+        counted = batch_term_counts([(jobs[i].title, jobs[i].description) for i in misses])
+        with _job_features_lock:
+            for i, result in zip(misses, counted):
+                results[i] = _job_features[keys[i]] = result
+            while len(_job_features) > FEATURE_CACHE_SIZE:
+                _job_features.popitem(last=False)
+    return results
+
+
+def job_term_counts(job) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the sorted hashed feature ids of a job and their counts (cached, see jobs_term_counts()).
+
+    Returns:
+        Tuple of (feature ids, counts) arrays
+    """
+    return jobs_term_counts([job])[0]
+
+
+def build_tfidf_matrix(term_counts: Sequence[Tuple[np.ndarray, np.ndarray]],
+                       idf: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build an L2-normalized TF-IDF matrix in CSR form from per-document term counts.
+
+    Args:
+        term_counts: One (feature ids, counts) pair per document
+        idf: Precomputed IDF vector (computed from these documents when omitted)
+
+    Returns:
+        Tuple of (data, indices, indptr, idf) where row i spans
+        data[indptr[i]:indptr[i + 1]]
+    """
+    n_docs = len(term_counts)
+    row_counts = np.fromiter((len(f) for f, _ in term_counts), dtype=np.int64, count=n_docs)
+    indptr = np.concatenate(([0], np.cumsum(row_counts)))
+    if indptr[-1]:
+        indices = np.concatenate([f for f, _ in term_counts])
+        counts = np.concatenate([c for _, c in term_counts])
+    else:
+        indices = np.zeros(0, dtype=np.int32)
+        counts = np.zeros(0, dtype=np.int32)
+
+    data, idf = tfidf_weights(indices, counts, indptr, idf=idf)
+    return data, indices, indptr, idf
+
+
+def tfidf_weights(indices: np.ndarray, counts: np.ndarray, indptr: np.ndarray,
+                  idf: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute L2-normalized TF-IDF weights for a term-count matrix in CSR form.
+
+    Args:
+        indices: Feature id of every stored entry
+        counts: Term count of every stored entry
+        indptr: Row boundaries (length n_docs + 1)
+        idf: Precomputed IDF vector (computed from this matrix when omitted)
+
+    Returns:
+        Tuple of (data aligned with `indices`, idf vector)
+    """
+    if idf is None:
+        idf = inverse_document_frequency(np.bincount(indices, minlength=N_FEATURES), len(indptr) - 1)
+
+    data = (np.log1p(counts) * idf[indices]).astype(np.float32)
+    norms = np.sqrt(segment_sum(data * data, indptr))
+    norms[norms == 0] = 1.0
+    data /= np.repeat(norms, np.diff(indptr)).astype(np.float32)
+    return data, idf
+
+
+def inverse_document_frequency(df: np.ndarray, n_docs: int) -> np.ndarray:
+    """Smoothed IDF vector from per-feature document frequencies."""
+    return (np.log((1 + n_docs) / (1 + df)) + 1).astype(np.float32)
+
+
+def segment_sum(values: np.ndarray, indptr: np.ndarray) -> np.ndarray:
+    """Sum `values` over each CSR row (empty rows sum to 0)."""
+    sums = np.zeros(len(indptr) - 1, dtype=np.float64)
+    nonempty = indptr[:-1] < indptr[1:]
+    if values.size:
+        sums[nonempty] = np.add.reduceat(values, indptr[:-1][nonempty])
+    return sums
+
+
+def resume_vector(resume_text: str, idf: np.ndarray) -> Tuple[np.ndarray, Dict[int, str]]:
+    """
+    Build the dense, L2-normalized TF-IDF vector of a resume.
+
+    Returns:
+        Tuple of (vector, feature id -> token map for explaining matches)
+    """
+    tokens = tokenize(resume_text)
+    vector = np.zeros(N_FEATURES, dtype=np.float32)
+    if not tokens:
+        return vector, {}
+
+    ids = np.array([feature_id(token) for token in tokens], dtype=np.int32)
+    unique, first, counts = np.unique(ids, return_index=True, return_counts=True)
+    terms = {fid: tokens[i] for fid, i in zip(unique.tolist(), first.tolist())}
+    vector[unique] = np.log1p(counts) * idf[unique]
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector /= norm
+    return vector, terms
+
+
+def rank_jobs(resume_text: str, jobs: Sequence, top_terms: int = 3,
+              idf: Optional[np.ndarray] = None) -> List[Tuple[object, float, List[str]]]:
+    """
+    Rank jobs by TF-IDF cosine similarity to a resume.
+
+    All jobs are scored with one sparse matrix-vector product over hashed
+    features (CSR arrays reduced with NumPy).
+
+    Without `idf`, document frequencies come from the candidates alone: with
+    only a page or two of jobs, a term common to all of them (e.g. the
+    searched job title) gets the lowest weight even if it is rare overall.
+
+    Args:
+        resume_text: Resume text
+        jobs: Job records
+        top_terms: Number of matching terms reported per job
+        idf: Corpus-wide IDF vector, e.g. JobCorpus.idf of the harvested corpus
+
+    Returns:
+        List of (job, score 0-1, top matching terms), best fit first
+    """
+    if not jobs:
+        return []
+
+    data, indices, indptr, idf = build_tfidf_matrix(jobs_term_counts(jobs), idf=idf)
+    scores, best, top = score_matrix(resume_text, data, indices, indptr, idf, top_terms=top_terms)
+    return [(jobs[i], round(float(scores[i]), 4), terms) for i, terms in zip(best.tolist(), top)]
+
+
+def score_matrix(resume_text: str, data: np.ndarray, indices: np.ndarray, indptr: np.ndarray,
+                 idf: np.ndarray, top_terms: int = 3,
+                 top_n: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, List[List[str]]]:
+    """
+    Score every row of a TF-IDF matrix against a resume.
+
+    Matching terms are only extracted for the best rows, so scoring a large
+    matrix for a short list stays a single pass over the stored entries.
+
+    Args:
+        resume_text: Resume text
+        data, indices, indptr: L2-normalized TF-IDF matrix in CSR form
+        idf: IDF vector the matrix was weighted with
+        top_terms: Number of matching terms reported per row
+        top_n: Number of best rows returned (default: all rows)
+
+    Returns:
+        Tuple of (cosine similarity per row, best row numbers first,
+        top matching terms for each of those rows)
+    """
+    vector, terms = resume_vector(resume_text, idf)
+    products = data * vector[indices]
+    scores = segment_sum(products, indptr)
+    best = np.argsort(-scores, kind="stable")[:top_n]
+
+    # For the best rows, the features contributing most to their score; only
+    # entries of resume features contribute, so just those are sorted
+    rank_of_row = np.full(len(indptr) - 1, best.size, dtype=np.int64)
+    rank_of_row[best] = np.arange(best.size)
+    positions = np.flatnonzero(products > 0)
+    rows = rank_of_row[np.searchsorted(indptr, positions, side="right") - 1]
+    positions, rows = positions[rows < best.size], rows[rows < best.size]
+    contributions = products[positions]
+    order = np.lexsort((-contributions, rows))
+    rows_sorted = rows[order]
+    rank_in_row = np.arange(order.size) - np.searchsorted(rows_sorted, rows_sorted)
+    keep = order[rank_in_row < top_terms]
+    features = indices[positions]
+    top: List[List[str]] = [[] for _ in range(best.size)]
+    for row, fid in zip(rows[keep].tolist(), features[keep].tolist()):
+        term = terms.get(fid)
+        if term:
+            top[row].append(term)
+    return scores, best, top
+
+
+def gather_rows(indptr: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Locate the stored entries of selected CSR rows.
+
+    Returns:
+        Tuple of (entry positions, indptr of the selected rows)
+    """
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    sub_indptr = np.concatenate(([0], np.cumsum(lengths)))
+    positions = np.repeat(starts - sub_indptr[:-1], lengths) + np.arange(sub_indptr[-1])
+    return positions, sub_indptr
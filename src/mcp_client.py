@@ -1,7 +1,8 @@
-import requests
+import httpx
 import json
 from datetime import datetime
 from typing import Dict, Any, Optional
+from src.http_client import get_http_client
 
 
 # MCP Server Configuration
@@ -40,7 +41,7 @@ def call_mcp_analyze_resume(resume_text: str) -> Dict[str, Any]:
     
     try:
         # Send HTTP POST request to MCP server
-        response = requests.post(
+        response = get_http_client().post(
             f"{MCP_SERVER_URL}/mcp/v1/messages",
             json=mcp_request,
             headers={"Content-Type": "application/json"},
@@ -68,7 +69,7 @@ def call_mcp_analyze_resume(resume_text: str) -> Dict[str, Any]:
             "success": response.status_code == 200 and "error" not in mcp_response
         }
     
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         end_time = datetime.now()
         duration_ms = int((end_time - start_time).total_seconds() * 1000)
         
@@ -80,7 +81,7 @@ def call_mcp_analyze_resume(resume_text: str) -> Dict[str, Any]:
             "success": False
         }
     
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         end_time = datetime.now()
         duration_ms = int((end_time - start_time).total_seconds() * 1000)
         
@@ -136,7 +137,7 @@ def call_mcp_fetch_jobs(keywords: str, location: str = "Saudi Arabia") -> Dict[s
     start_time = datetime.now()
     
     try:
-        response = requests.post(
+        response = get_http_client().post(
             f"{MCP_SERVER_URL}/mcp/v1/messages",
             json=mcp_request,
             headers={"Content-Type": "application/json"},
@@ -1,11 +1,46 @@
 from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.platypus import SimpleDocTemplate, Paragraph, PageBreak, Table, Flowable
 from io import BytesIO
 from datetime import datetime
+import os
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Union
+
+from dotenv import load_dotenv
+
+from src.report_templates import get_report_template
+
+load_dotenv()
+
+
+# Flowables held at once while laying out a report; 0 builds the whole story up front
+REPORT_MAX_FLOWABLES = int(os.getenv("REPORT_MAX_FLOWABLES", 0))
+# In bounded-memory mode, long text sections become one paragraph per this many lines
+BOUNDED_PARAGRAPH_LINES = 20
+
+
+class _FlowableWindow(list):
+    """
+    Story list for ReportLab that holds at most `limit` flowables at a time.
+
+    ReportLab lays out a story by taking flowables off the front of the
+    list until it is empty; this list refills itself from an iterator
+    whenever its length is checked, so flowables are only created shortly
+    before layout and are released once drawn.
+    """
+
+    def __init__(self, flowables: Iterable[Flowable], limit: int):
+        super().__init__()
+        self._source = iter(flowables)
+        self._limit = max(2, limit)  # keep one flowable of lookahead (e.g. for keepWithNext)
+
+    def __len__(self) -> int:
+        while self._source is not None and list.__len__(self) < self._limit:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+        return list.__len__(self)
 
 
 def generate_analysis_pdf(
@@ -16,8 +51,11 @@ def generate_analysis_pdf(
     roadmap: str,
     keywords: str = "",
     jobs: list = None,
-    improvements: dict = None
-) -> BytesIO:
+    improvements: dict = None,
+    generated: Optional[str] = None,
+    output: Optional[Union[str, BinaryIO]] = None,
+    max_flowables: int = REPORT_MAX_FLOWABLES
+) -> Union[BytesIO, str, BinaryIO]:
     """
     Generate a professional PDF report of resume analysis.
     
@@ -28,142 +66,140 @@ def generate_analysis_pdf(
         gaps: Skills gaps analysis
         roadmap: Career roadmap
         keywords: Job keywords (optional)
-        jobs: List of job dictionaries (optional)
+        jobs: List of Job records (optional)
         improvements: Before/after improvements (optional)
+        generated: Text of the "Generated:" line (default: the current date and time)
+        output: File path or writable binary stream (temp file, HTTP response, ...)
+                to write the PDF to; only `write()` is called on a stream
+        max_flowables: Bounded-memory mode: create report elements as layout
+                       reaches them and hold at most this many at once, with long
+                       sections split into paragraphs of BOUNDED_PARAGRAPH_LINES
+                       lines (0: whole story up front, one paragraph per section)
         
     Returns:
-        BytesIO object containing the PDF
+        BytesIO object containing the PDF, or `output` when given
     """
     
-    buffer = BytesIO()
+    buffer = BytesIO() if output is None else output
     doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.75*inch, bottomMargin=0.75*inch)
-    
-    # Container for PDF elements
-    elements = []
-    
-    # Styles
-    styles = getSampleStyleSheet()
-    
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#6b7fd7'),
-        spaceAfter=12,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=16,
-        textColor=colors.HexColor('#2c3e50'),
-        spaceAfter=10,
-        spaceBefore=15,
-        fontName='Helvetica-Bold'
-    )
-    
-    body_style = ParagraphStyle(
-        'CustomBody',
-        parent=styles['BodyText'],
-        fontSize=11,
-        textColor=colors.HexColor('#2c3e50'),
-        spaceAfter=10,
-        leading=16
-    )
+    if max_flowables > 0:
+        doc.build(_FlowableWindow(_iter_story(summary, ats_score, ats_analysis, gaps, roadmap, keywords, jobs,
+                                              improvements, BOUNDED_PARAGRAPH_LINES, generated), max_flowables))
+    else:
+        doc.build(_build_story(summary, ats_score, ats_analysis, gaps, roadmap, keywords, jobs, improvements,
+                               generated=generated))
+    
+    if output is None:
+        buffer.seek(0)
+    return buffer
+
+
+def _build_story(*args, **kwargs) -> List[Flowable]:
+    """All flowables of the report (see _iter_story())."""
+    return list(_iter_story(*args, **kwargs))
+
+
+def _iter_story(
+    summary: str,
+    ats_score: str,
+    ats_analysis: str,
+    gaps: str,
+    roadmap: str,
+    keywords: str = "",
+    jobs: list = None,
+    improvements: dict = None,
+    paragraph_lines: int = 0,
+    generated: Optional[str] = None
+) -> Iterator[Flowable]:
+    """
+    Flowables of the report in order, each created only when it is consumed.
+
+    Styles and fixed text come from the shared report template. With
+    `paragraph_lines`, long text sections are split into paragraphs of that
+    many lines, so no single flowable holds a whole section.
+    """
+    template = get_report_template()
+    body_style = template.body_style
+
+    def section(text: str) -> Iterator[Flowable]:
+        if not paragraph_lines:
+            yield Paragraph(_clean_text(text), body_style)
+            return
+        lines = str(text or "").split('\n')
+        if len(lines) <= paragraph_lines:
+            yield Paragraph(_clean_text(text), body_style)
+            return
+        for start in range(0, len(lines), paragraph_lines):
+            style = (template.body_head_style if start == 0 else
+                     template.body_tail_style if start + paragraph_lines >= len(lines) else
+                     template.body_continued_style)
+            yield Paragraph(_clean_text('\n'.join(lines[start:start + paragraph_lines])), style)
     
     # Title
-    elements.append(Paragraph("🤖 AI Resume Analysis Report", title_style))
-    elements.append(Paragraph(f"Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", 
-                              ParagraphStyle('DateStyle', parent=body_style, alignment=TA_CENTER, fontSize=10)))
-    elements.append(Spacer(1, 0.3*inch))
+    yield template.flowable("title")
+    generated = generated or datetime.now().strftime('%B %d, %Y at %I:%M %p')
+    yield Paragraph(f"Generated: {generated}", template.date_style)
+    yield template.spacer(0.3)
     
     # ATS Score Section
-    elements.append(Paragraph("📈 ATS Compatibility Score", heading_style))
+    yield template.flowable("ats_heading")
     
     # Create ATS score table
     score_data = [[f"ATS SCORE: {ats_score}", "out of 100"]]
     score_table = Table(score_data, colWidths=[3*inch, 2*inch])
-    score_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, 0), colors.HexColor('#667eea')),
-        ('TEXTCOLOR', (0, 0), (0, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (0, 0), 18),
-        ('FONTSIZE', (1, 0), (1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('TOPPADDING', (0, 0), (-1, -1), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.grey)
-    ]))
-    elements.append(score_table)
-    elements.append(Spacer(1, 0.15*inch))
-    elements.append(Paragraph(_clean_text(ats_analysis), body_style))
-    elements.append(Spacer(1, 0.2*inch))
+    score_table.setStyle(template.score_table_style)
+    yield score_table
+    yield template.spacer(0.15)
+    yield from section(ats_analysis)
+    yield template.spacer(0.2)
     
     # Resume Summary
-    elements.append(Paragraph("📑 Resume Summary", heading_style))
-    elements.append(Paragraph(_clean_text(summary), body_style))
-    elements.append(Spacer(1, 0.2*inch))
+    yield template.flowable("summary_heading")
+    yield from section(summary)
+    yield template.spacer(0.2)
     
     # Skills Gaps
-    elements.append(Paragraph("🛠️ Skills Gaps & Missing Areas", heading_style))
-    elements.append(Paragraph(_clean_text(gaps), body_style))
-    elements.append(Spacer(1,0.2*inch))
+    yield template.flowable("gaps_heading")
+    yield from section(gaps)
+    yield template.spacer(0.2)
     
     # Career Roadmap
-    elements.append(Paragraph("🚀 Career Growth Plan", heading_style))
-    elements.append(Paragraph(_clean_text(roadmap), body_style))
+    yield template.flowable("roadmap_heading")
+    yield from section(roadmap)
     
     # Before/After Improvements (if provided)
     if improvements:
-        elements.append(PageBreak())
-        elements.append(Paragraph("💡 Resume Improvement Suggestions", heading_style))
+        yield PageBreak()
+        yield template.flowable("improvements_heading")
         
-        elements.append(Paragraph("❌ Current Issues:", 
-                                 ParagraphStyle('SubHeading', parent=heading_style, fontSize=13, textColor=colors.HexColor('#c62828'))))
-        elements.append(Paragraph(_clean_text(improvements.get('current_issues', '')), body_style))
-        elements.append(Spacer(1, 0.15*inch))
+        yield template.flowable("current_issues")
+        yield from section(improvements.get('current_issues', ''))
+        yield template.spacer(0.15)
         
-        elements.append(Paragraph("✅ Suggested Improvements:", 
-                                 ParagraphStyle('SubHeading', parent=heading_style, fontSize=13, textColor=colors.HexColor('#2e7d32'))))
-        elements.append(Paragraph(_clean_text(improvements.get('suggested_improvements', '')), body_style))
+        yield template.flowable("suggested_improvements")
+        yield from section(improvements.get('suggested_improvements', ''))
     
     # Job Keywords (if provided)
     if keywords:
-        elements.append(Spacer(1, 0.2*inch))
-        elements.append(Paragraph("🎯 Recommended Job Keywords", heading_style))
-        elements.append(Paragraph(_clean_text(keywords), body_style))
+        yield template.spacer(0.2)
+        yield template.flowable("keywords_heading")
+        yield from section(keywords)
     
     # Job Recommendations (if provided)
     if jobs and len(jobs) > 0:
-        elements.append(PageBreak())
-        elements.append(Paragraph("💼 Top Job Recommendations", heading_style))
+        yield PageBreak()
+        yield template.flowable("jobs_heading")
         
         for i, job in enumerate(jobs[:10], 1):  # Limit to top 10
-            job_title = job.get('job_title', job.get('title', 'No Title'))
-            job_company = job.get('employer_name', job.get('companyName', 'Unknown Company'))
-            job_location = job.get('job_city', job.get('location', ''))
-            
-            elements.append(Paragraph(f"<b>{i}. {_clean_text(job_title)}</b>", body_style))
-            elements.append(Paragraph(f"Company: {_clean_text(job_company)}", 
-                                    ParagraphStyle('JobDetail', parent=body_style, fontSize=10, leftIndent=15)))
-            elements.append(Paragraph(f"Location: {_clean_text(job_location)}", 
-                                    ParagraphStyle('JobDetail', parent=body_style, fontSize=10, leftIndent=15)))
-            elements.append(Spacer(1, 0.1*inch))
+            yield Paragraph(f"<b>{i}. {_clean_text(job.title)}</b>", body_style)
+            yield Paragraph(f"Company: {_clean_text(job.company)}", template.job_detail_style)
+            yield Paragraph(f"Location: {_clean_text(job.location)}", template.job_detail_style)
+            yield template.spacer(0.1)
     
     # Footer
-    elements.append(Spacer(1, 0.3*inch))
-    elements.append(Paragraph("_" * 80, body_style))
-    elements.append(Paragraph("Generated by AI Job Analyzer - Powered by OpenAI GPT-4o", 
-                             ParagraphStyle('Footer', parent=body_style, fontSize=9, alignment=TA_CENTER, textColor=colors.grey)))
-    
-    # Build PDF
-    doc.build(elements)
-    
-    buffer.seek(0)
-    return buffer
+    yield template.spacer(0.3)
+    yield template.flowable("footer_rule")
+    yield template.flowable("footer")
 
 
 def _clean_text(text: str) -> str:
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+
+from src.pdf_generator import generate_analysis_pdf
+
+load_dotenv()
+
+
+REPORT_CACHE_SIZE = int(os.getenv("REPORT_CACHE_SIZE", 32))  # rendered PDFs kept in memory
+REPORT_PRERENDER = os.getenv("REPORT_PRERENDER", "false").lower() in ("1", "true", "yes")
+
+
+def report_key(summary: str, ats_score: Any, ats_analysis: str, gaps: str, roadmap: str, keywords: str = "",
+               jobs: Optional[list] = None, improvements: Optional[dict] = None,
+               generated: Optional[str] = None) -> str:
+    """
+    Hash of everything that goes into a report (same arguments as generate_analysis_pdf).
+
+    Only the job fields the report shows are hashed, in report order. The
+    "Generated:" text is hashed too, so a cached report never shows another
+    render date.
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    inputs = {
+        "summary": summary, "ats_score": str(ats_score), "ats_analysis": ats_analysis, "gaps": gaps,
+        "roadmap": roadmap, "keywords": keywords or "",
+        "jobs": [[str(job.title), str(job.company), str(job.location)] for job in (jobs or [])[:10]],
+        "improvements": {name: improvements.get(name, "") for name in ("current_issues", "suggested_improvements")}
+                        if improvements else None,
+        "generated": generated,
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class ReportCache:
+    """
+    In-memory LRU cache of rendered PDF reports, keyed by report_key().
+
+    A report is rendered at most once at a time: concurrent requests for
+    a report that is being rendered (e.g. by a background pre-render) wait
+    for that render instead of starting their own.
+    """
+
+    def __init__(self, max_entries: int = REPORT_CACHE_SIZE):
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._rendering: Dict[str, threading.Event] = {}
+        self._stats = {"hits": 0, "misses": 0, "renders": 0, "prerenders": 0, "evictions": 0, "failures": 0}
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached PDF for a key, or None (does not wait for a render in progress)."""
+        with self._lock:
+            pdf = self._entries.get(key)
+            if pdf is not None:
+                self._entries.move_to_end(key)
+            return pdf
+
+    def render(self, report: Dict[str, Any], key: Optional[str] = None) -> bytes:
+        """
+        Return the PDF for a report, rendering it on a miss.
+
+        Args:
+            report: Keyword arguments of generate_analysis_pdf()
+            key: report_key() of `report`, if already computed
+
+        Returns:
+            PDF bytes
+        """
+        key = key or report_key(**report)
+        while True:
+            with self._lock:
+                pdf = self._entries.get(key)
+                if pdf is not None:
+                    self._stats["hits"] += 1
+                    self._entries.move_to_end(key)
+                    return pdf
+                pending = self._rendering.get(key)
+                if pending is None:
+                    self._stats["misses"] += 1
+                    self._rendering[key] = threading.Event()
+                    break
+            pending.wait()  # render elsewhere in progress; on failure, retry ourselves
+
+        try:
+            pdf = generate_analysis_pdf(**report).getvalue()
+            with self._lock:
+                self._stats["renders"] += 1
+                self._entries[key] = pdf
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._stats["evictions"] += 1
+            return pdf
+        except Exception:
+            with self._lock:
+                self._stats["failures"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._rendering.pop(key).set()
+
+    def _prerender(self, report: Dict[str, Any], key: str) -> None:
+        try:
+            self.render(report, key)
+        except Exception as e:
+            print(f"Error pre-rendering PDF report: {e}")
+
+    def prerender(self, report: Dict[str, Any], key: Optional[str] = None) -> bool:
+        """
+        Render a report in a background thread unless it is cached or already rendering.
+
+        Returns:
+            True if a render was started
+        """
+        key = key or report_key(**report)
+        with self._lock:
+            if key in self._entries or key in self._rendering:
+                return False
+            self._stats["prerenders"] += 1
+        threading.Thread(target=self._prerender, args=(report, key), daemon=True).start()
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss/render counters and the number of cached reports."""
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries), "rendering": len(self._rendering)}
+
+
+_cache = ReportCache()
+
+
+def _report(summary: str, ats_score: Any, ats_analysis: str, gaps: str, roadmap: str, keywords: str = "",
+            jobs: Optional[list] = None, improvements: Optional[dict] = None) -> Dict[str, Any]:
+    # Cached reports show the render date only, and the date is part of report_key(),
+    # so a report is rendered again on the next day instead of showing a stale time
+    return {"summary": summary, "ats_score": ats_score, "ats_analysis": ats_analysis, "gaps": gaps,
+            "roadmap": roadmap, "keywords": keywords, "jobs": list(jobs or []), "improvements": improvements,
+            "generated": date.today().strftime('%B %d, %Y')}
+
+
+def get_report_pdf(*args, **kwargs) -> bytes:
+    """
+    Get a PDF report from the shared cache, rendering it on a miss.
+
+    Takes the arguments of generate_analysis_pdf(). Cached reports are dated
+    by day, without the time of day, and are rendered again on a new day.
+    """
+    return _cache.render(_report(*args, **kwargs))
+
+
+def get_cached_report(*args, **kwargs) -> Optional[bytes]:
+    """Get a PDF report if it is already rendered, else None (arguments of generate_analysis_pdf())."""
+    return _cache.get(report_key(**_report(*args, **kwargs)))
+
+
+def prerender_report(*args, **kwargs) -> bool:
+    """Start rendering a PDF report in the background if it is not cached (arguments of generate_analysis_pdf())."""
+    return _cache.prerender(_report(*args, **kwargs))
+
+
+def get_report_cache_stats() -> Dict[str, Any]:
+    """Counters of the shared report cache."""
+    return _cache.stats()
@@ -0,0 +1,110 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import Paragraph, Spacer, TableStyle
+
+
+class ReportTemplate:
+    """
+    Styles, table styles and fixed text of the analysis report.
+
+    Building the stylesheet costs the same for every report, so it is done
+    once per process (see get_report_template()) and shared by all reports.
+    Flowables hold layout state and are built per report.
+    """
+
+    def __init__(self):
+        styles = getSampleStyleSheet()
+
+        self.title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor=colors.HexColor('#6b7fd7'),
+            spaceAfter=12,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold'
+        )
+        self.heading_style = ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=16,
+            textColor=colors.HexColor('#2c3e50'),
+            spaceAfter=10,
+            spaceBefore=15,
+            fontName='Helvetica-Bold'
+        )
+        self.body_style = ParagraphStyle(
+            'CustomBody',
+            parent=styles['BodyText'],
+            fontSize=11,
+            textColor=colors.HexColor('#2c3e50'),
+            spaceAfter=10,
+            leading=16
+        )
+        # Consecutive paragraphs of one long section (see pdf_generator); spaced like a single paragraph
+        self.body_head_style = ParagraphStyle('CustomBodyHead', parent=self.body_style, spaceAfter=0)
+        self.body_continued_style = ParagraphStyle('CustomBodyContinued', parent=self.body_style, spaceBefore=0,
+                                                   spaceAfter=0)
+        self.body_tail_style = ParagraphStyle('CustomBodyTail', parent=self.body_style, spaceBefore=0)
+        self.date_style = ParagraphStyle('DateStyle', parent=self.body_style, alignment=TA_CENTER, fontSize=10)
+        self.issues_style = ParagraphStyle('SubHeading', parent=self.heading_style, fontSize=13,
+                                           textColor=colors.HexColor('#c62828'))
+        self.improvements_style = ParagraphStyle('SubHeading', parent=self.heading_style, fontSize=13,
+                                                 textColor=colors.HexColor('#2e7d32'))
+        self.job_detail_style = ParagraphStyle('JobDetail', parent=self.body_style, fontSize=10, leftIndent=15)
+        self.footer_style = ParagraphStyle('Footer', parent=self.body_style, fontSize=9, alignment=TA_CENTER,
+                                           textColor=colors.grey)
+
+        self.score_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (0, 0), colors.HexColor('#667eea')),
+            ('TEXTCOLOR', (0, 0), (0, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (0, 0), 18),
+            ('FONTSIZE', (1, 0), (1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+            ('TOPPADDING', (0, 0), (-1, -1), 12),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey)
+        ])
+
+        self._texts: Dict[str, Tuple[str, ParagraphStyle]] = {
+            "title": ("🤖 AI Resume Analysis Report", self.title_style),
+            "ats_heading": ("📈 ATS Compatibility Score", self.heading_style),
+            "summary_heading": ("📑 Resume Summary", self.heading_style),
+            "gaps_heading": ("🛠️ Skills Gaps & Missing Areas", self.heading_style),
+            "roadmap_heading": ("🚀 Career Growth Plan", self.heading_style),
+            "improvements_heading": ("💡 Resume Improvement Suggestions", self.heading_style),
+            "current_issues": ("❌ Current Issues:", self.issues_style),
+            "suggested_improvements": ("✅ Suggested Improvements:", self.improvements_style),
+            "keywords_heading": ("🎯 Recommended Job Keywords", self.heading_style),
+            "jobs_heading": ("💼 Top Job Recommendations", self.heading_style),
+            "footer_rule": ("_" * 80, self.body_style),
+            "footer": ("Generated by AI Job Analyzer - Powered by OpenAI GPT-4o", self.footer_style),
+        }
+
+    def flowable(self, name: str) -> Paragraph:
+        """A new paragraph with the fixed text `name` of the report."""
+        text, style = self._texts[name]
+        return Paragraph(text, style)
+
+    def spacer(self, height: float) -> Spacer:
+        """A vertical spacer of `height` inches."""
+        return Spacer(1, height * inch)
+
+
+_template: Optional[ReportTemplate] = None
+_template_lock = threading.Lock()
+
+
+def get_report_template() -> ReportTemplate:
+    """Get the shared report template, built on first use."""
+    global _template
+    with _template_lock:
+        if _template is None:
+            _template = ReportTemplate()
+        return _template
@@ -0,0 +1,268 @@
+import json
+import os
+import re
+import threading
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+ALIASES_FILE = os.getenv(
+    "SKILL_ALIASES_FILE", os.path.join(os.path.dirname(__file__), "..", "data", "skill_aliases.json")
+)
+
+# Canonical skill -> aliases found in LLM gap text (matched case-insensitively on word boundaries).
+# Words with common meanings outside a skill ("lambda", "containers", "ui") only count with context.
+SKILL_ALIASES: Dict[str, List[str]] = {
+    "aws": ["amazon web services", "aws certified", "aws certification", "amazon aws", "ec2", "amazon s3", "aws s3",
+            "aws lambda"],
+    "azure": ["microsoft azure", "azure certification", "azure devops"],
+    "gcp": ["google cloud", "google cloud platform", "bigquery"],
+    "cloud computing": ["cloud", "cloud platforms", "cloud services", "cloud infrastructure", "cloud technologies"],
+    "docker": ["containerization", "docker compose"],
+    "kubernetes": ["k8s", "eks", "aks", "gke", "container orchestration"],
+    "terraform": ["infrastructure as code", "iac"],
+    "ci/cd": ["ci cd", "cicd", "continuous integration", "continuous delivery", "continuous deployment",
+              "jenkins", "github actions", "gitlab ci"],
+    "linux": ["unix", "bash", "shell scripting"],
+    "git": ["version control"],
+    "python": ["python3", "python programming"],
+    "java": ["java programming", "spring boot", "spring framework"],
+    "javascript": ["js", "ecmascript"],
+    "typescript": [],
+    "react": ["react.js", "reactjs"],
+    "angular": ["angularjs", "angular.js"],
+    "vue": ["vue.js", "vuejs"],
+    "node.js": ["nodejs", "express.js", "expressjs"],
+    "c++": ["cpp"],
+    "c#": [".net", "dotnet", "asp.net"],
+    "golang": ["go programming", "go language"],
+    "rust": [],
+    "php": ["laravel"],
+    "sql": ["mysql", "postgresql", "postgres", "sql server", "t-sql", "pl/sql", "relational databases"],
+    "nosql": ["mongodb", "cassandra", "dynamodb", "redis"],
+    "data analysis": ["data analytics", "analytical skills", "analyzing data"],
+    "data visualization": ["tableau", "power bi", "powerbi", "looker", "dashboard design"],
+    "excel": ["microsoft excel", "ms excel", "spreadsheets", "advanced excel"],
+    "statistics": ["statistical analysis", "statistical modeling", "hypothesis testing"],
+    "machine learning": ["ml models", "ml algorithms", "predictive modeling", "scikit-learn", "sklearn"],
+    "deep learning": ["neural networks", "tensorflow", "pytorch", "keras"],
+    "nlp": ["natural language processing", "llm", "llms", "large language models"],
+    "computer vision": ["image processing", "opencv"],
+    "data engineering": ["etl", "elt", "data pipelines", "airflow", "data warehousing"],
+    "big data": ["spark", "apache spark", "pyspark", "hadoop", "kafka"],
+    "rest apis": ["rest api", "restful apis", "restful", "api development", "web services", "graphql"],
+    "microservices": ["microservice architecture", "service-oriented architecture"],
+    "system design": ["software architecture", "scalable systems", "distributed systems"],
+    "testing": ["unit testing", "test automation", "automated testing", "qa", "quality assurance", "selenium"],
+    "agile": ["scrum", "kanban", "agile methodologies"],
+    "project management": ["pmp", "program management", "project planning"],
+    "leadership": ["team leadership", "people management", "team management", "mentoring"],
+    "communication": ["communication skills", "presentation skills", "stakeholder communication",
+                      "written communication"],
+    "stakeholder management": ["stakeholder engagement", "client management"],
+    "cybersecurity": ["cyber security", "information security", "network security", "cissp", "penetration testing"],
+    "networking": ["tcp/ip", "ccna", "network administration"],
+    "ui/ux design": ["ui/ux", "ux", "ui design", "user experience", "user interface design", "figma"],
+    "digital marketing": ["seo", "sem", "social media marketing", "google analytics"],
+    "sales": ["business development", "lead generation", "crm", "salesforce"],
+    "financial analysis": ["financial modeling", "budgeting", "forecasting"],
+    "arabic": ["arabic language", "arabic fluency"],
+    "english": ["english language", "english fluency", "ielts", "toefl"],
+}
+
+# Lead-in and trailing filler of gap bullets without a known skill ("Lack of ...", "... experience")
+_LEADING_FILLER = re.compile(
+    r"^(?:(?:a |an |the )?(?:lack|absence) of|no|missing|limited|insufficient|minimal|little|needs?|"
+    r"requires?|not enough|could improve|improve|gain|develop|(?:hands-on |practical |professional |"
+    r"relevant |direct )?(?:experience|knowledge|proficiency|familiarity|exposure|expertise|skills?)"
+    r" (?:with|in|of)|demonstrated|proven|certification in|certifications? for|formal)\b\s*",
+    re.IGNORECASE
+)
+_TRAILING_FILLER = re.compile(r"\s+(?:experience|knowledge|skills?|proficiency|expertise|certifications?)$",
+                              re.IGNORECASE)
+_STRIP_CHARS = " \t-•*·:;,.()[]\"'"
+MAX_FALLBACK_WORDS = 6  # unmatched bullets are cut to this many words after filler is removed
+# Markdown headings, bold-only lines and lines ending in a colon introduce gaps rather than name one
+_HEADER_LINE = re.compile(r"^\s*(?:#.*|[*_]{2}[^*_]+[*_]{2}:?|.*:\s*(?:[*_]{2})?)\s*$")
+# "Label: " prefix of a bullet ("Soft skills: negotiation")
+_LABEL_PREFIX = re.compile(r"^[^:]*:\s+")
+
+
+class AhoCorasick:
+    """
+    Multi-pattern matcher: finds every occurrence of a set of patterns in
+    one pass over the text, whatever the number of patterns.
+    """
+
+    def __init__(self, patterns: Dict[str, str]):
+        """
+        Args:
+            patterns: Pattern -> value reported when it matches
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, str]]] = [[]]
+        for pattern, value in patterns.items():
+            state = 0
+            for char in pattern:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._out[state].append((len(pattern), value))
+
+        # Breadth-first failure links: the longest proper suffix that is also a pattern prefix
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, child in self._goto[state].items():
+                pending.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._out[child].extend(self._out[self._fail[child]])
+
+    def find(self, text: str) -> Iterable[Tuple[int, int, str]]:
+        """Yield (start, end, value) for every pattern occurrence, overlapping ones included."""
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for length, value in self._out[state]:
+                yield i + 1 - length, i + 1, value
+
+
+def _normalize_text(text: str) -> str:
+    """Lowercase, treat hyphens/underscores as spaces and collapse whitespace."""
+    return " ".join(text.lower().replace("-", " ").replace("_", " ").split())
+
+
+def _is_boundary(text: str, index: int) -> bool:
+    """True if `index` is outside the text or not inside a word."""
+    return index < 0 or index >= len(text) or not text[index].isalnum()
+
+
+class SkillVocabulary:
+    """Maps free-text skill gaps to canonical skill names via an alias dictionary."""
+
+    def __init__(self, aliases: Dict[str, List[str]]):
+        patterns = {}
+        for canonical, names in aliases.items():
+            canonical = _normalize_text(canonical)
+            for name in [canonical] + list(names):
+                patterns.setdefault(_normalize_text(name), canonical)
+        self.skills = sorted(set(patterns.values()))
+        self._matcher = AhoCorasick(patterns)
+        self.canonicalize = lru_cache(maxsize=65536)(self._canonicalize)
+
+    def match(self, text: str) -> List[str]:
+        """
+        Canonical skills mentioned in a text.
+
+        Matches must start and end on word boundaries; overlapping matches
+        resolve to the leftmost, then longest one.
+
+        Returns:
+            Canonical skill names in order of appearance, without duplicates
+        """
+        text = _normalize_text(text)
+        matches = sorted(
+            (start, -end, value) for start, end, value in self._matcher.find(text)
+            if _is_boundary(text, start - 1) and _is_boundary(text, end)
+        )
+        skills, position = [], 0
+        for start, negative_end, value in matches:
+            if start < position:
+                continue
+            position = -negative_end
+            if value not in skills:
+                skills.append(value)
+        return skills
+
+    def _canonicalize(self, text: str) -> Tuple[str, ...]:
+        """
+        Canonical skills for one gap bullet.
+
+        A gap without a known skill falls back to the bullet without a
+        "Label:" prefix and filler, cut to MAX_FALLBACK_WORDS words, so no
+        gap goes uncounted; header lines yield nothing.
+        """
+        if _HEADER_LINE.match(text):
+            return ()
+        skills = self.match(text)
+        if skills:
+            return tuple(skills)
+        phrase = _LABEL_PREFIX.sub("", _normalize_text(text)).strip(_STRIP_CHARS)
+        previous = None
+        while phrase != previous:
+            previous = phrase
+            phrase = _TRAILING_FILLER.sub("", _LEADING_FILLER.sub("", phrase)).strip(_STRIP_CHARS)
+        if not phrase:
+            return ()
+        return (" ".join(phrase.split()[:MAX_FALLBACK_WORDS]),)
+
+    def canonicalize_gaps(self, gaps: Iterable[str], limit: Optional[int] = None) -> List[str]:
+        """
+        Canonical skill names for a list of gap bullets, without duplicates.
+
+        Args:
+            gaps: Free-text gaps, e.g. "- Lack of AWS certification"
+            limit: Maximum number of skills returned
+
+        Returns:
+            Canonical skill names in order of appearance
+        """
+        skills: List[str] = []
+        for gap in gaps:
+            if not gap or not gap.strip():
+                continue
+            for skill in self.canonicalize(gap):
+                if skill not in skills:
+                    skills.append(skill)
+        return skills[:limit] if limit is not None else skills
+
+
+def load_aliases(path: Optional[str] = None) -> Dict[str, List[str]]:
+    """
+    Built-in aliases merged with a JSON file of {canonical: [aliases]}, if it exists.
+
+    Args:
+        path: Alias file (default ALIASES_FILE)
+    """
+    aliases = {skill: list(names) for skill, names in SKILL_ALIASES.items()}
+    path = path or ALIASES_FILE
+    try:
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for skill, names in json.load(f).items():
+                    aliases.setdefault(skill.lower(), []).extend(names)
+    except Exception as e:
+        print(f"Error loading skill aliases: {e}")
+    return aliases
+
+
+_vocabulary: Optional[SkillVocabulary] = None
+_vocabulary_lock = threading.Lock()
+
+
+def get_vocabulary() -> SkillVocabulary:
+    """Get the shared skill vocabulary, built on first use."""
+    global _vocabulary
+    with _vocabulary_lock:
+        if _vocabulary is None:
+            _vocabulary = SkillVocabulary(load_aliases())
+        return _vocabulary
+
+
+def canonicalize_gaps(gaps: Iterable[str], limit: Optional[int] = None) -> List[str]:
+    """Canonical skill names for free-text gaps (see SkillVocabulary.canonicalize_gaps())."""
+    return get_vocabulary().canonicalize_gaps(gaps, limit)
@@ -0,0 +1,62 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from src import analytics_columns, analytics_manager
+
+
+@pytest.fixture
+def analytics_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics_manager, "ANALYTICS_DB", str(tmp_path / "analytics.db"))
+    return analytics_manager.ANALYTICS_DB
+
+
+def _save_history(count: int, days: int) -> None:
+    rng = random.Random(7)
+    now = datetime.now()
+    analytics_manager.save_analyses([
+        {"ats_score": rng.choice([0, rng.randint(1, 100)]), "skill_gaps": ["Docker"], "keywords": ["python"],
+         "job_count": rng.randint(0, 10),
+         "timestamp": (now - timedelta(minutes=rng.randint(0, days * 1440))).isoformat()}
+        for _ in range(count)
+    ])
+
+
+def test_trend_percentiles_and_totals_survive_retention(analytics_db):
+    _save_history(501, days=60)
+    trends = {period: analytics_columns.get_trend(period) for period in ("day", "week")}
+    percentiles = analytics_columns.get_score_percentiles()
+    summary = analytics_columns.get_range_summary()
+    histogram = analytics_columns.get_score_histogram()
+
+    assert analytics_manager.apply_retention(7) > 0
+    assert analytics_manager.get_raw_cutoff() is not None
+
+    assert analytics_manager.get_dashboard_snapshot().total_count == 501
+    assert analytics_columns.get_range_summary() == summary
+    assert analytics_columns.get_score_histogram() == histogram
+    assert analytics_columns.get_score_percentiles() == percentiles
+    for period, trend in trends.items():
+        assert analytics_columns.get_trend(period) == trend
+        assert sum(point["count"] for point in trend) == 501
+
+
+def test_range_queries_after_retention_use_whole_days(analytics_db):
+    _save_history(200, days=30)
+    start = (datetime.now() - timedelta(days=20)).date()
+    end = (datetime.now() - timedelta(days=10)).date()
+    trend = analytics_columns.get_trend("day", start, end)
+    summary = analytics_columns.get_range_summary(start, end)
+
+    analytics_manager.apply_retention(5)
+    assert analytics_columns.get_trend("day", start, end) == trend
+    assert analytics_columns.get_range_summary(start, end) == summary
+    assert summary["count"] == analytics_manager.get_range_stats(start, end)["count"]
+
+
+def test_clear_resets_raw_cutoff(analytics_db):
+    _save_history(50, days=30)
+    analytics_manager.apply_retention(3)
+    analytics_manager.clear_analytics()
+    assert analytics_manager.get_raw_cutoff() is None
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src import analytics_manager
+
+CAPACITY = 5
+
+
+@pytest.fixture
+def sketch_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics_manager, "ANALYTICS_DB", str(tmp_path / "analytics.db"))
+    monkeypatch.setattr(analytics_manager, "TOP_K_MODE", "space_saving")
+    monkeypatch.setattr(analytics_manager, "TOP_K_CAPACITY", CAPACITY)
+    return analytics_manager.ANALYTICS_DB
+
+
+def _save_long_tail(count: int, days: int = 0) -> None:
+    """Analyses sharing a few frequent terms plus one term seen only once each."""
+    now = datetime.now()
+    analytics_manager.save_analyses([
+        {"ats_score": 50, "skill_gaps": ["Docker", f"Quantum Widget {i}"], "keywords": ["python", f"rare{i}"],
+         "timestamp": (now - timedelta(days=days * i / count)).isoformat()}
+        for i in range(count)
+    ])
+
+
+def _query(sql: str):
+    conn = analytics_manager._connect()
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+def test_rollup_terms_only_hold_sketch_terms(sketch_db):
+    _save_long_tail(200)
+    for kind in ("gap", "keyword"):
+        rolled = {row[0] for row in _query(f"SELECT DISTINCT term FROM rollup_terms WHERE kind = '{kind}'")}
+        tracked = {row[0] for row in _query(f"SELECT term FROM term_sketch WHERE kind = '{kind}'")}
+        assert len(tracked) == CAPACITY
+        assert rolled <= tracked
+
+    assert analytics_manager.get_top_skill_gaps(1) == [("docker", 200)]
+    assert analytics_manager.get_range_stats()["top_keywords"][0] == ("python", 200)
+
+    analytics_manager.rebuild_aggregates()
+    assert len(_query("SELECT DISTINCT kind, term FROM rollup_terms")) <= 2 * CAPACITY
+    assert analytics_manager.get_top_keywords(1) == [("python", 200)]
+
+
+def test_retention_drops_unreferenced_skills(sketch_db):
+    _save_long_tail(100, days=30)
+    skills_before = len(_query("SELECT id FROM skills"))
+    assert analytics_manager.apply_retention(5) > 0
+    referenced = _query("SELECT DISTINCT skill_id FROM analysis_skills")
+    assert len(_query("SELECT id FROM skills")) == len(referenced) < skills_before
+    assert analytics_manager.get_top_skill_gaps(1) == [("docker", 100)]
@@ -0,0 +1,182 @@
+import gc
+
+import pytest
+
+from src import job_api
+from src.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def _half_open_breaker(name: str) -> CircuitBreaker:
+    breaker = CircuitBreaker(name, min_calls=1, cooldown_seconds=0)
+    breaker.record_failure(0.1)
+    assert breaker.state == OPEN
+    return breaker
+
+
+class _Response:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def json(self):
+        return {"data": [{"job_id": "1"}]}
+
+
+class _HttpClient:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+
+    def get(self, *args, **kwargs):
+        return _Response(self.status_code)
+
+
+@pytest.fixture
+def rapidapi_breaker(monkeypatch):
+    breaker = _half_open_breaker("rapidapi")
+    monkeypatch.setitem(job_api._breakers, "rapidapi", breaker)
+    return breaker
+
+
+@pytest.mark.parametrize("status_code, state", [(200, CLOSED), (429, OPEN), (503, OPEN), (404, HALF_OPEN)])
+def test_rapidapi_status_codes(rapidapi_breaker, monkeypatch, status_code, state):
+    monkeypatch.setattr(job_api, "get_http_client", lambda: _HttpClient(status_code))
+    try:
+        job_api.fetch_rapidapi_page("key", "python", "Riyadh", 1)
+    except RuntimeError:
+        assert status_code >= 400
+    assert rapidapi_breaker.state == state
+    if state == HALF_OPEN:
+        # A bad request gave the trial slot back instead of counting as a success
+        assert len(rapidapi_breaker._calls) == 1
+        assert rapidapi_breaker.allow_request()
+
+
+class _Run:
+    def __init__(self, status: str):
+        self.status = status
+        self.aborted = False
+
+    def get(self):
+        return {"status": self.status}
+
+    def abort(self):
+        self.aborted = True
+
+
+class _Dataset:
+    def list_items(self, offset, limit):
+        return type("Page", (), {"items": []})()
+
+
+class _ApifyClient:
+    def __init__(self, status: str = "RUNNING"):
+        self.runs = {"run": _Run(status)}
+
+    def actor(self, actor_id):
+        return type("Actor", (), {"start": lambda _, run_input: {"id": "run", "defaultDatasetId": "ds"}})()
+
+    def run(self, run_id):
+        return self.runs[run_id]
+
+    def dataset(self, dataset_id):
+        return _Dataset()
+
+
+@pytest.fixture
+def linkedin(monkeypatch):
+    breaker = _half_open_breaker("linkedin")
+    client = _ApifyClient()
+    monkeypatch.setitem(job_api._breakers, "linkedin", breaker)
+    monkeypatch.setenv("APIFY_API_TOKEN", "token")
+    monkeypatch.setattr(job_api, "get_apify_client", lambda token: client)
+    monkeypatch.setattr(job_api, "cache_lookup", lambda key: None)
+    monkeypatch.setattr(job_api, "index_jobs_async", lambda *args, **kwargs: None)
+    return breaker, client
+
+
+def test_linkedin_run_holds_trial_until_released(linkedin):
+    breaker, client = linkedin
+    run = job_api.start_linkedin_run("python", "Riyadh")
+    assert run is not None
+    assert not breaker.allow_request()
+
+    run.abort()
+    assert client.runs["run"].aborted
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+
+
+def test_dropped_linkedin_run_releases_trial(linkedin):
+    breaker, _ = linkedin
+    run = job_api.start_linkedin_run("python", "Riyadh")
+    del run
+    gc.collect()
+    assert breaker.allow_request()
+
+
+def test_linkedin_context_manager_aborts_and_releases(linkedin):
+    breaker, client = linkedin
+    with job_api.start_linkedin_run("python", "Riyadh"):
+        pass
+    assert client.runs["run"].aborted
+    assert breaker.allow_request()
+
+
+def test_finished_linkedin_run_records_outcome_once(linkedin, monkeypatch):
+    breaker, client = linkedin
+    monkeypatch.setattr(job_api, "cache_store", lambda key, items: None)
+    client.runs["run"].status = "SUCCEEDED"
+    run = job_api.start_linkedin_run("python", "Riyadh")
+    assert list(run.iter_jobs(time_budget=1)) == []
+    assert breaker.state == CLOSED
+    run.abort()
+    assert breaker.state == CLOSED and len(breaker._calls) == 0
+
+
+def _job(job_id: str, description: str = "") -> job_api.Job:
+    return job_api.Job.from_rapidapi({"job_id": job_id, "job_title": f"Job {job_id}", "employer_name": "Company",
+                                      "job_description": description})
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    """Fake corpus, index and RapidAPI results; records how many live jobs were pulled."""
+    results = {"corpus": [], "index": [], "live": []}
+    pulled = []
+
+    def live(*args, **kwargs):
+        for job in results["live"]:
+            pulled.append(job.job_id)
+            yield job
+
+    monkeypatch.setattr(job_api, "recommend_jobs", lambda *args, **kwargs: results["corpus"])
+    monkeypatch.setattr(job_api, "search_index", lambda *args, **kwargs: results["index"])
+    monkeypatch.setattr(job_api, "iter_rapidapi_jobs", live)
+    return results, pulled
+
+
+def _ids(jobs):
+    return [job.job_id for job in jobs]
+
+
+def test_recommended_jobs_are_deduplicated_across_sources(sources):
+    results, pulled = sources
+    results["corpus"] = [_job("1"), _job("2")]
+    results["index"] = [_job("2"), _job("3")]
+    results["live"] = [_job("3"), _job("4"), _job("4"), _job("5")]
+    jobs = list(job_api.iter_recommended_jobs("python", resume_text="resume", max_items=4))
+    assert _ids(jobs) == ["1", "2", "3", "4"]
+    assert pulled == ["3", "4"]
+
+
+def test_max_bytes_caps_local_results(sources):
+    results, pulled = sources
+    results["corpus"] = [_job(str(i), description=f"{i} " + "python sql " * 400) for i in range(5)]
+    results["live"] = [_job("9")]
+    size = len(results["corpus"][0]._raw_blob)
+    jobs = list(job_api.iter_recommended_jobs("python", resume_text="resume", max_bytes=2 * size + 1))
+    assert _ids(jobs) == ["0", "1", "2"]
+    assert pulled == []
@@ -0,0 +1,92 @@
+import os
+
+import numpy as np
+import pytest
+
+from src import job_corpus, job_index
+from src.job_api import Job
+
+RESUME = "Python developer with SQL and Tableau reporting"
+
+
+def _jobs(start: int, count: int):
+    topics = ["python sql reporting", "graphic design branding", "مطور بايثون وقواعد البيانات", "sales leads crm"]
+    return [Job.from_rapidapi({"job_id": str(i), "job_title": f"Job {i}", "employer_name": "Company",
+                               "job_description": topics[i % len(topics)],
+                               "job_posted_at_datetime_utc": "2026-06-01T00:00:00Z"})
+            for i in range(start, start + count)]
+
+
+@pytest.fixture
+def corpus_paths(tmp_path):
+    index_path = str(tmp_path / "jobs_index.db")
+    path = str(tmp_path / "job_corpus")
+    job_index.index_jobs(_jobs(0, 40), path=index_path)
+    assert job_corpus.build_corpus(index_path, path) == 40
+    return index_path, path
+
+
+def _sizes(corpus: job_corpus.JobCorpus):
+    directory = os.path.join(corpus.path, corpus.build)
+    return {name: os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)}
+
+
+def test_append_only_extends_files_of_an_open_corpus(corpus_paths):
+    index_path, path = corpus_paths
+    corpus = job_corpus.JobCorpus(path)
+    sizes = _sizes(corpus)
+    first = corpus.rank(RESUME, top_n=3)
+
+    assert job_corpus.append_corpus(_jobs(38, 6), index_path=index_path, path=path) == 44
+    assert all(_sizes(corpus)[name] >= size for name, size in sizes.items() if name != "meta.json")
+    assert len(corpus) == 40
+    assert corpus.rank(RESUME, top_n=3) == first
+
+    reopened = job_corpus.JobCorpus(path)
+    assert len(reopened) == 44
+    assert reopened.values("job_id", [40, 43]) == ["40", "43"]
+
+
+def test_append_overwrites_an_interrupted_tail(corpus_paths):
+    index_path, path = corpus_paths
+    directory = os.path.join(path, job_corpus._current_build(path))
+    for name in ("title.data", "title.data.offsets", "terms.data", "terms.data.offsets", "posted_ts.data"):
+        with open(os.path.join(directory, name), "ab") as f:
+            f.write(b"\xff" * 37)
+
+    job_corpus.append_corpus(_jobs(40, 2), index_path=index_path, path=path)
+    corpus = job_corpus.JobCorpus(path)
+    assert corpus.values("title", [39, 40, 41]) == ["Job 39", "Job 40", "Job 41"]
+    assert corpus.posted_ts[41] == corpus.posted_ts[0]
+    assert corpus.filter(keywords="python sql").tolist() == [row for row in range(42) if row % 4 == 0]
+
+
+def test_reweighting_writes_a_new_generation(corpus_paths):
+    index_path, path = corpus_paths
+    corpus = job_corpus.get_corpus(path)
+    job_corpus.append_corpus(_jobs(40, 12), index_path=index_path, path=path)
+
+    reopened = job_corpus.get_corpus(path)
+    assert reopened is not corpus
+    assert reopened.meta["generation"] == 1
+    assert np.isclose(reopened.idf, job_corpus.JobCorpus(path).idf).all()
+    assert sorted(name for name in os.listdir(os.path.join(path, reopened.build)) if name.startswith("idf.")) \
+        == ["idf.1.data"]
+    assert reopened.rank(RESUME, top_n=1)[0][0] % 4 == 0
+
+
+def test_rebuild_switches_build_and_removes_stale_ones_later(corpus_paths, monkeypatch):
+    index_path, path = corpus_paths
+    old = job_corpus.JobCorpus(path)
+    # As on Windows, a build that is still mapped cannot be deleted
+    monkeypatch.setattr(job_corpus.shutil, "rmtree", lambda *args, **kwargs: None)
+    job_index.index_jobs(_jobs(40, 4), path=index_path)
+    assert job_corpus.build_corpus(index_path, path) == 44
+    assert job_corpus._current_build(path) == "build-000002"
+    assert old.build in os.listdir(path)
+    assert len(old) == 40 and old.value("title", 0) == "Job 0"
+
+    monkeypatch.undo()
+    job_corpus.append_corpus(_jobs(44, 1), index_path=index_path, path=path)
+    assert sorted(name for name in os.listdir(path) if name.startswith("build-")) == ["build-000002"]
+    assert len(job_corpus.JobCorpus(path)) == 45
@@ -0,0 +1,86 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from src import job_harvester
+
+DAY = 86400
+NOW = datetime(2026, 6, 1, tzinfo=timezone.utc).timestamp()
+
+
+def _posting(job_id: str, days_old: float = None) -> dict:
+    posted = "" if days_old is None else datetime.fromtimestamp(NOW - days_old * DAY, timezone.utc).isoformat()
+    return {"job_id": job_id, "job_title": "Data Analyst", "employer_name": "Company",
+            "job_posted_at_datetime_utc": posted}
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    """Fake RapidAPI result pages (page number -> postings); indexed job ids are recorded."""
+    pages = {}
+    fetched, indexed = [], []
+
+    def fetch_page(key, keyword, location, page, date_posted=None):
+        fetched.append(page)
+        return pages.get(page, [])
+
+    def index_jobs(jobs, search_location=""):
+        indexed.extend(job.job_id for job in jobs)
+        return len(jobs)
+
+    monkeypatch.setenv("RAPIDAPI_KEY", "test")
+    monkeypatch.setattr(job_harvester, "fetch_rapidapi_page", fetch_page)
+    monkeypatch.setattr(job_harvester, "index_jobs", index_jobs)
+    monkeypatch.setattr(job_harvester, "STATE_FILE", str(tmp_path / "harvest_state.json"))
+    monkeypatch.setattr(job_harvester, "get_top_keywords", lambda top_k: [("python", 3)])
+    monkeypatch.setattr(job_harvester, "is_source_available", lambda source: True)
+    return pages, fetched, indexed
+
+
+def test_cursor_advances_when_paging_completes(api):
+    pages, fetched, indexed = api
+    pages[1] = [_posting("a", 1), _posting("b", 2), _posting("u")]
+    pages[2] = [_posting("c", 9)]
+    result = job_harvester.harvest_query("python", "Riyadh", cursor=NOW - 5 * DAY, max_pages=3)
+    assert fetched == [1, 2]
+    assert indexed == ["a", "b", "u"]
+    assert result["resume_page"] is None
+    assert result["cursor"] == NOW - DAY
+
+
+def test_truncated_paging_keeps_cursor_and_resumes(api):
+    pages, fetched, indexed = api
+    cursor = NOW - 10 * DAY
+    pages[1] = [_posting("a", 1)]
+    pages[2] = [_posting("b", 3)]
+    result = job_harvester.harvest_query("python", "Riyadh", cursor=cursor, max_pages=2)
+    assert result["cursor"] == cursor
+    assert result["newest"] == NOW - DAY
+    assert result["resume_page"] == 3
+
+    pages[3] = [_posting("c", 6)]
+    result = job_harvester.harvest_query("python", "Riyadh", cursor=cursor, max_pages=2, start_page=3)
+    assert fetched == [1, 2, 3, 4]
+    assert indexed == ["a", "b", "c"]
+    assert result["resume_page"] is None
+    assert result["cursor"] == NOW - 6 * DAY
+
+
+def test_run_harvest_resumes_before_moving_the_cursor(api):
+    pages, fetched, indexed = api
+    pages[1] = [_posting("a", 1)]
+    pages[2] = [_posting("b", 3)]
+    job_harvester.run_harvest(locations=["Riyadh"], max_pages=1, update_corpus=False)
+    entry = job_harvester.get_harvest_stats()["cursors"]["python|riyadh"]
+    assert entry["cursor"] is None
+    assert entry["resume_page"] == 2
+    assert entry["pending_cursor"] == NOW - DAY
+
+    job_harvester.run_harvest(locations=["Riyadh"], max_pages=1, update_corpus=False)
+    job_harvester.run_harvest(locations=["Riyadh"], max_pages=1, update_corpus=False)
+    entry = job_harvester.get_harvest_stats()["cursors"]["python|riyadh"]
+    assert fetched == [1, 2, 3]
+    assert indexed == ["a", "b"]
+    assert entry["cursor"] == NOW - DAY
+    assert entry["resume_page"] is None
+    assert entry["pending_cursor"] is None
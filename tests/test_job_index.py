@@ -0,0 +1,48 @@
+from src import job_index
+from src.job_api import Job
+
+
+def _job(posted_at: str = "", title: str = "Data Analyst") -> Job:
+    return Job.from_rapidapi({"job_id": "1", "job_title": title, "employer_name": "Company",
+                              "job_description": "python sql", "job_posted_at_datetime_utc": posted_at})
+
+
+def _posted(path: str):
+    """(posted_at, posted_ts) of the indexed job."""
+    conn = job_index._connect(path)
+    try:
+        return tuple(conn.execute("SELECT posted_at, posted_ts FROM jobs").fetchone())
+    finally:
+        conn.close()
+
+
+def test_undated_refetch_keeps_posting_date(tmp_path):
+    path = str(tmp_path / "jobs_index.db")
+    assert job_index.index_jobs([_job("2026-06-01T00:00:00Z")], path=path) == 1
+    dated = _posted(path)
+    assert dated[0] == "2026-06-01T00:00:00Z"
+
+    job_index.index_jobs([_job("", title="Senior Data Analyst")], path=path)
+    assert _posted(path) == dated
+    assert job_index.search_index("senior", max_age_days=None, path=path)[0].title == "Senior Data Analyst"
+
+    job_index.index_jobs([_job("2026-06-03T00:00:00Z")], path=path)
+    assert _posted(path)[0] == "2026-06-03T00:00:00Z"
+    assert _posted(path)[1] > dated[1]
+
+
+def test_undated_posting_is_indexed_as_fetched(tmp_path):
+    path = str(tmp_path / "jobs_index.db")
+    job_index.index_jobs([_job("")], path=path)
+    assert job_index.search_index("analyst", max_age_days=1, path=path)
+    assert job_index.get_index_size(path=path) == 1
+    assert job_index.prune_index(max_age_days=1, path=path) == 0
+
+
+def test_async_index_runs_callback_after_indexing(tmp_path):
+    path = str(tmp_path / "jobs_index.db")
+    seen = []
+    job_index.index_jobs_async([_job("2026-06-01T00:00:00Z")], path=path,
+                               after_index=lambda jobs: seen.append(job_index.get_index_size(path=path)))
+    job_index.flush_index_queue()
+    assert seen == [1]
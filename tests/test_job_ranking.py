@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from src import job_ranking
+from src.job_api import Job
+
+
+@pytest.fixture(autouse=True)
+def clear_feature_cache():
+    # Term counts are cached by job id, and the tests reuse ids
+    job_ranking._job_features.clear()
+
+
+def _job(job_id: str, title: str, description: str) -> Job:
+    return Job.from_rapidapi({"job_id": job_id, "job_title": title, "employer_name": "Company",
+                              "job_description": description})
+
+
+def test_tokenize_keeps_tech_names_and_drops_punctuation():
+    tokens = job_ranking.tokenize("Senior C++ and C# developer. Node.js, Python; the SQL.")
+    assert tokens == ["senior", "c++", "c#", "developer", "node.js", "python", "sql"]
+
+
+def test_tokenize_non_latin_scripts():
+    assert job_ranking.tokenize("مهندس بيانات في الرياض") == ["مهندس", "بيانات", "الرياض"]
+    assert job_ranking.tokenize("Ingénieur données à Montréal") == ["ingénieur", "données", "montréal"]
+
+
+def test_arabic_postings_get_features_and_rank():
+    counts = job_ranking.text_term_counts("محلل بيانات", "خبرة في تحليل البيانات واستخدام بايثون")
+    assert counts[0].size > 0
+    assert (counts[0] >= 0).all()
+
+    jobs = [_job("1", "مصمم جرافيك", "تصميم الشعارات والهوية البصرية"),
+            _job("2", "محلل بيانات", "تحليل البيانات باستخدام بايثون وإعداد التقارير")]
+    ranked = job_ranking.rank_jobs("محلل بيانات لدي خبرة في بايثون وتحليل البيانات", jobs, top_terms=5)
+    assert ranked[0][0].job_id == "2"
+    assert ranked[0][1] > 0
+    assert ranked[1][1] == 0
+    assert "بايثون" in ranked[0][2]
+
+
+def test_batch_matches_single_text_counts():
+    texts = [("Data Analyst", "SQL and Python, the usual."), ("", ""), ("مطور", "تطوير الويب")]
+    for (title, description), (features, counts) in zip(texts, job_ranking.batch_term_counts(texts)):
+        single = job_ranking.text_term_counts(title, description)
+        assert np.array_equal(features, single[0])
+        assert np.array_equal(counts, single[1])
+    assert job_ranking.batch_term_counts(texts)[1][0].size == 0
+
+
+def test_rank_jobs_with_corpus_idf():
+    jobs = [_job("1", "Data Analyst", "python sql reporting"), _job("2", "Data Analyst", "excel reporting")]
+    idf = np.ones(job_ranking.N_FEATURES, dtype=np.float32)
+    idf[job_ranking.feature_id("python")] = 5.0
+    ranked = job_ranking.rank_jobs("python developer", jobs, idf=idf)
+    assert [job.job_id for job, _, _ in ranked] == ["1", "2"]
+    assert ranked[0][2] == ["python"]
@@ -0,0 +1,44 @@
+from datetime import date
+from io import BytesIO
+
+import pytest
+
+from src import report_cache
+
+REPORT = {"summary": "Data analyst", "ats_score": "72", "ats_analysis": "Good structure", "gaps": "- Spark",
+          "roadmap": "1. Learn Spark"}
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    rendered = []
+
+    def fake_pdf(**report):
+        rendered.append(report["generated"])
+        return BytesIO(f"Generated: {report['generated']}".encode())
+
+    monkeypatch.setattr(report_cache, "generate_analysis_pdf", fake_pdf)
+    monkeypatch.setattr(report_cache, "_cache", report_cache.ReportCache())
+    return rendered
+
+
+def _set_today(monkeypatch, today: date) -> None:
+    monkeypatch.setattr(report_cache, "date", type("FakeDate", (), {"today": staticmethod(lambda: today)}))
+
+
+def test_cached_report_shows_render_date_only(monkeypatch, renders):
+    _set_today(monkeypatch, date(2026, 3, 1))
+    pdf = report_cache.get_report_pdf(**REPORT)
+    assert pdf == b"Generated: March 01, 2026"
+    assert report_cache.get_report_pdf(**REPORT) is pdf
+    assert report_cache.get_cached_report(**REPORT) is pdf
+    assert renders == ["March 01, 2026"]
+
+
+def test_cached_report_is_rendered_again_on_a_new_day(monkeypatch, renders):
+    _set_today(monkeypatch, date(2026, 3, 1))
+    report_cache.get_report_pdf(**REPORT)
+    _set_today(monkeypatch, date(2026, 3, 2))
+    assert report_cache.get_cached_report(**REPORT) is None
+    assert report_cache.get_report_pdf(**REPORT) == b"Generated: March 02, 2026"
+    assert renders == ["March 01, 2026", "March 02, 2026"]
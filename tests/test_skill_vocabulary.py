@@ -0,0 +1,46 @@
+import pytest
+
+from src.skill_vocabulary import SKILL_ALIASES, SkillVocabulary
+
+
+@pytest.fixture(scope="module")
+def vocabulary():
+    return SkillVocabulary(SKILL_ALIASES)
+
+
+@pytest.mark.parametrize("text, skills", [
+    ("- Lack of AWS certification", ("aws",)),
+    ("Experience with AWS Lambda and S3", ("aws",)),
+    ("Key gaps include: cloud, docker", ("cloud computing", "docker")),
+    ("Google Cloud certification", ("gcp",)),
+    ("GitHub Actions pipelines", ("ci/cd",)),
+    ("Limited UI design experience", ("ui/ux design",)),
+    ("Building ML models", ("machine learning",)),
+])
+def test_known_skills(vocabulary, text, skills):
+    assert vocabulary.canonicalize(text) == skills
+
+
+@pytest.mark.parametrize("text, fallback", [
+    ("Experience with Lambda calculus", "lambda calculus"),
+    ("Accounting standards", "accounting standards"),
+    ("Jira administration", "jira administration"),
+    ("Soft skills: negotiation", "negotiation"),
+])
+def test_ambiguous_words_fall_back_to_the_bullet(vocabulary, text, fallback):
+    assert vocabulary.canonicalize(text) == (fallback,)
+
+
+@pytest.mark.parametrize("text", [
+    "Experience: less than 2 years in management roles:",
+    "Technical skills:",
+    "### Skills Gap Analysis",
+    "**Cloud:**",
+])
+def test_header_lines_are_skipped(vocabulary, text):
+    assert vocabulary.canonicalize(text) == ()
+
+
+def test_canonicalize_gaps_dedupes_in_order(vocabulary):
+    gaps = ["Missing skills:", "- No Docker experience", "- Kubernetes (k8s)", "- Containerization"]
+    assert vocabulary.canonicalize_gaps(gaps) == ["docker", "kubernetes"]